@@ -387,7 +387,7 @@ class EvolutionAgent:
             duration_ms=duration_ms,
             error_message=error_message
         )
-        self.logger.debug(f"Recorded activity: {agent_id}.{action} = {status}")
+        self.logger.debug("Recorded activity: %s.%s = %s", agent_id, action, status)
     
     # ------------------------------------------------------------------
     # Autonomy Hooks (EXPLICITLY GATED)
@@ -13,8 +13,10 @@ It is not a chat agent and does not make decisions.
 from .knowledge_engine import KnowledgeEngine
 from .memory_store import MemoryStore
 from .retriever import Retriever
-from .embedder import Embedder
+from .embedder import Embedder, PackedEmbedding
 from .provenance import Provenance
 
-__all__ = ['KnowledgeEngine', 'MemoryStore', 'Retriever', 'Embedder', 'Provenance']
+__all__ = [
+    'KnowledgeEngine', 'MemoryStore', 'Retriever', 'Embedder', 'PackedEmbedding', 'Provenance'
+]
 
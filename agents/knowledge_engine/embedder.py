@@ -4,8 +4,56 @@ Embedder module for Knowledge Engine.
 Uses LLM Gateway for real embedding generation.
 """
 
-from typing import List, Dict, Any, Optional
+from array import array
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence
 import math
+import struct
+
+
+# Storage precisions supported by PackedEmbedding
+PRECISIONS = ("fp32", "fp16", "int8")
+
+
+@dataclass(frozen=True)
+class PackedEmbedding:
+    """
+    Compact in-memory form of an embedding vector.
+    
+    A 768-dim vector held as a Python list costs ~30 KB (a pointer plus a
+    float object per element). Packed, it is 3 KB (fp32), 1.5 KB (fp16)
+    or 768 bytes (int8, with one scale per vector). int8 keeps cosine
+    similarity within about 1% of fp32; use fp16 or fp32 where ranking
+    of near-ties matters.
+    """
+    precision: str
+    data: bytes
+    dimension: int
+    scale: float = 1.0
+    
+    @classmethod
+    def pack(cls, vector: Sequence[float], precision: str = "int8") -> "PackedEmbedding":
+        """Quantize a vector to the given precision."""
+        n = len(vector)
+        if precision == "fp32":
+            return cls(precision, array("f", vector).tobytes(), n)
+        if precision == "fp16":
+            return cls(precision, struct.pack(f"<{n}e", *vector), n)
+        if precision == "int8":
+            peak = max(map(abs, vector), default=0.0)
+            scale = peak / 127.0 if peak else 1.0
+            data = array("b", [round(v / scale) for v in vector]).tobytes()
+            return cls(precision, data, n, scale)
+        raise ValueError(f"Unknown embedding precision: {precision!r}")
+    
+    def unpack(self) -> List[float]:
+        """Dequantize back to a list of floats."""
+        if self.precision == "fp32":
+            return array("f", self.data).tolist()
+        if self.precision == "fp16":
+            return list(struct.unpack(f"<{self.dimension}e", self.data))
+        scale = self.scale
+        return [q * scale for q in array("b", self.data)]
 
 
 class Embedder:
@@ -10,7 +10,7 @@ Supports both keyword-based and semantic (embedding) search.
 from typing import Dict, Any, List, Optional
 from .memory_store import MemoryStore
 from .retriever import Retriever
-from .embedder import Embedder
+from .embedder import PRECISIONS, Embedder, PackedEmbedding
 from .provenance import Provenance
 from core.logger import Logger
 from core.context_manager import ContextManager
@@ -43,7 +43,13 @@ class KnowledgeEngine:
         >>> results = engine.query("memory system")
     """
 
-    def __init__(self, agent_id: str = "knowledge_engine", log_level: int = 20, db_path: Optional[str] = None):
+    def __init__(
+        self,
+        agent_id: str = "knowledge_engine",
+        log_level: int = 20,
+        db_path: Optional[str] = None,
+        embedding_precision: str = "int8"
+    ):
         """
         Initialize the Knowledge Engine.
 
@@ -51,7 +57,15 @@ class KnowledgeEngine:
             agent_id: Unique identifier for this agent instance
             log_level: Logging level (default: 20 = INFO)
             db_path: Optional path to knowledge database
+            embedding_precision: Storage precision for the in-memory vector
+                index ("fp32", "fp16" or "int8"; see PackedEmbedding)
         """
+        if embedding_precision not in PRECISIONS:
+            raise ValueError(
+                f"Unknown embedding precision: {embedding_precision!r} "
+                f"(expected one of {', '.join(PRECISIONS)})"
+            )
+
         self.agent_id = agent_id
         self.logger = Logger(f"KnowledgeEngine-{agent_id}", log_level=log_level)
         self.context = ContextManager(agent_id)
@@ -62,8 +76,9 @@ class KnowledgeEngine:
         self.retriever = Retriever(self.memory_store)
         self.embedder = Embedder()
 
-        # In-memory vector index: record_id -> embedding vector
-        self._embedding_index: Dict[str, List[float]] = {}
+        # In-memory vector index: record_id -> packed embedding vector
+        self._embedding_precision = embedding_precision
+        self._embedding_index: Dict[str, PackedEmbedding] = {}
         # Reverse lookup: record_id -> {namespace, key, content_preview}
         self._embedding_metadata: Dict[str, Dict[str, Any]] = {}
 
@@ -194,7 +209,9 @@ class KnowledgeEngine:
             embedding = self.embedder.embed(embed_text, task_id="ingest_embed")
 
             if embedding and any(v != 0.0 for v in embedding):
-                self._embedding_index[record_id] = embedding
+                self._embedding_index[record_id] = PackedEmbedding.pack(
+                    embedding, self._embedding_precision
+                )
                 self._embedding_metadata[record_id] = {
                     "namespace": source.get("namespace"),
                     "key": source.get("key"),
@@ -334,7 +351,11 @@ class KnowledgeEngine:
 
             # Score all indexed embeddings
             candidates = list(self._embedding_index.keys())
-            embeddings = [self._embedding_index[rid] for rid in candidates]
+            # Entries are PackedEmbedding; plain lists are accepted as-is
+            embeddings = [
+                v.unpack() if isinstance(v, PackedEmbedding) else v
+                for v in map(self._embedding_index.__getitem__, candidates)
+            ]
 
             similarities = self.embedder.search_similar(
                 query_embedding=query_embedding,
@@ -26,7 +26,7 @@ Usage:
     )
 """
 
-from .gateway import LLMGateway, request, request_structured, request_embedding
+from .gateway import LLMGateway, request, arequest, request_structured, request_embedding
 from .policy import PolicyEngine, Policy
 from .rate_limiter import RateLimiter
 from .cost_tracker import CostTracker
@@ -35,6 +35,7 @@ from .logger import GatewayLogger
 __all__ = [
     'LLMGateway',
     'request',
+    'arequest',
     'request_structured',
     'request_embedding',
     'PolicyEngine',
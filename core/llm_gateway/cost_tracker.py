@@ -270,7 +270,20 @@ class CostTracker:
                 },
                 "within_budget": remaining_usd > 0 and remaining_tokens > 0
             }
-    
+
+    def is_within_budget(self) -> bool:
+        """
+        Check whether the session still has budget left.
+
+        Same verdict as check_budget()["within_budget"], without building
+        the full status report. Used on the gateway's per-request path.
+        """
+        with self._lock:
+            return (
+                self._session_total.estimated_cost_usd < self.session_budget_usd
+                and self._session_total.total_tokens < self.session_token_budget
+            )
+
     def get_session_summary(self) -> Dict[str, Any]:
         """Get summary for current session."""
         with self._lock:
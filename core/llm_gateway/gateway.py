@@ -28,23 +28,21 @@ Usage:
     )
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import os
+import time
 import uuid
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, fields, replace as dc_replace
 from datetime import datetime
 from threading import Lock
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-except ImportError:
-    pass
-
 from .providers import (
     BaseProvider,
     ProviderResponse,
@@ -55,17 +53,54 @@ from .providers import (
 )
 from .policy import PolicyEngine, Policy, PolicyResult, PolicyDecision
 from .rate_limiter import RateLimiter, RateLimitConfig
-from .cost_tracker import CostTracker
+from .cost_tracker import CostTracker, MODEL_COSTS
 from .logger import GatewayLogger
 
 
-@dataclass
+_REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+@functools.cache
+def _load_env_once():
+    """Load the repo's .env file (if any) the first time a gateway is created."""
+    try:
+        from dotenv import load_dotenv
+        env_path = _REPO_ROOT / '.env'
+        if env_path.exists():
+            load_dotenv(env_path)
+    except ImportError:
+        pass
+
+
+# Last formatted timestamp as (100ms bucket, ISO string); swapped atomically
+_iso_cache: Tuple[int, str] = (-1, "")
+
+
+def _iso_from_epoch(epoch: float) -> str:
+    """
+    Format an epoch time as ISO 8601, reusing the last result for times in
+    the same 100 ms bucket. Timestamps may therefore lag by up to 100 ms.
+    """
+    global _iso_cache
+    bucket = int(epoch * 10)
+    cached = _iso_cache
+    if cached[0] == bucket:
+        return cached[1]
+    text = datetime.fromtimestamp(epoch).isoformat()
+    _iso_cache = (bucket, text)
+    return text
+
+
+@dataclass(slots=True)
 class GatewayResponse:
     """
     Standardized response from the LLM Gateway.
     
     All gateway responses use this format, regardless of provider.
     Agents receive this - never raw provider responses.
+    
+    The creation time is captured as an epoch float; the ISO `timestamp`
+    string is only formatted when something reads it.
     """
     success: bool
     content: str
@@ -83,7 +118,22 @@ class GatewayResponse:
     error_code: Optional[str] = None
     warnings: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    _created_at: float = field(default_factory=time.time, repr=False)
+    _timestamp: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO creation time (formatted on first access)."""
+        if self._timestamp is None:
+            self._timestamp = _iso_from_epoch(self._created_at)
+        return self._timestamp
+    
+    def __iter__(self):
+        """Yield (name, value) pairs, so dict(response) gives a flat view."""
+        for f in fields(self):
+            if not f.name.startswith("_"):
+                yield f.name, getattr(self, f.name)
+        yield "timestamp", self.timestamp
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -114,6 +164,29 @@ class GatewayResponse:
         return self.metadata.get("parsed_json")
 
 
+# Logged config for single-text embedding requests (read-only)
+_SINGLE_EMBED_CONFIG: Dict[str, Any] = {"type": "embedding", "count": 1}
+
+# Pre-initialized hasher for request fingerprints; copied per request
+_FINGERPRINT_BASE = hashlib.blake2b(b"arcyn-llm-gateway\x00", digest_size=16)
+
+
+def _as_follower(response: ProviderResponse) -> ProviderResponse:
+    """
+    Copy of a coalesced provider response for a waiting caller.
+    
+    Token counts are zeroed so usage and cost are only recorded once, by
+    the request that actually reached the provider.
+    """
+    return dc_replace(
+        response,
+        tokens_input=0,
+        tokens_output=0,
+        tokens_total=0,
+        metadata={**response.metadata, "coalesced": True}
+    )
+
+
 class LLMGateway:
     """
     Central LLM Gateway for Arcyn OS.
@@ -141,6 +214,9 @@ class LLMGateway:
     _instance: Optional['LLMGateway'] = None
     _instance_lock = Lock()
     
+    # Max distinct ProviderConfig objects kept for reuse
+    _CFG_POOL_SIZE = 64
+    
     def __new__(cls, *args, **kwargs):
         """Ensure singleton pattern."""
         with cls._instance_lock:
@@ -176,6 +252,7 @@ class LLMGateway:
             return
         
         # Get API key from environment
+        _load_env_once()
         self._api_key = api_key or os.environ.get("GEMINI_API_KEY")
         if not self._api_key:
             raise ValueError(
@@ -198,13 +275,35 @@ class LLMGateway:
             log_to_console=log_to_console
         )
         
+        # Per-token USD prices (input, output), precomputed from MODEL_COSTS
+        self._price_cache: Dict[str, Tuple[float, float]] = {
+            model: (costs["input"] / 1_000_000, costs["output"] / 1_000_000)
+            for model, costs in MODEL_COSTS.items()
+        }
+        
         # Initialize provider
         self._provider: Optional[BaseProvider] = None
         self._init_provider()
         
-        # Task request counters (for per-task limits)
-        self._task_request_counts: Dict[str, int] = {}
-        self._lock = Lock()
+        # Task request counters (for per-task limits). Not locked: these
+        # feed a soft per-task cap, and each task is normally driven by a
+        # single agent thread.
+        self._task_counts: Dict[str, int] = defaultdict(int)
+        
+        # Per-agent pre-flight gates (see _compile_gate)
+        self._gate_cache: Dict[str, Callable[..., Tuple]] = {}
+        
+        # Error response constructors with the fixed fields pre-bound, per
+        # error code (see _create_error_response)
+        self._error_factories: Dict[str, Callable[..., GatewayResponse]] = {}
+        
+        # Shared immutable provider configs (see _get_provider_config)
+        self._cfg_pool: "OrderedDict[Tuple, ProviderConfig]" = OrderedDict()
+        self._cfg_lock = Lock()
+        
+        # Identical deterministic requests currently in flight (single-flight)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = Lock()
         
         self._initialized = True
         
@@ -330,6 +429,90 @@ class LLMGateway:
                 error_code="GATEWAY_ERROR"
             )
     
+    async def arequest(
+        self,
+        agent: str,
+        task_id: str,
+        prompt: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> GatewayResponse:
+        """
+        Async variant of request().
+        
+        Runs the same policy, rate-limit and accounting pipeline, but awaits
+        the provider call so one event loop can keep many requests in flight.
+        
+        Args:
+            agent: Agent name
+            task_id: Task identifier
+            prompt: The prompt text
+            config: Optional configuration (same keys as request())
+            
+        Returns:
+            GatewayResponse with result or error
+        """
+        return await self._arun(agent, task_id, prompt, config or {}, structured=False)
+    
+    async def arequest_structured(
+        self,
+        agent: str,
+        task_id: str,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None
+    ) -> GatewayResponse:
+        """
+        Async variant of request_structured().
+        
+        Args:
+            agent: Agent name
+            task_id: Task identifier
+            prompt: The prompt text
+            schema: Expected JSON schema
+            config: Optional configuration
+            
+        Returns:
+            GatewayResponse with JSON content
+        """
+        config = config or {}
+        config["_schema"] = schema
+        return await self._arun(agent, task_id, prompt, config, structured=True)
+    
+    async def _arun(
+        self,
+        agent: str,
+        task_id: str,
+        prompt: str,
+        config: Dict[str, Any],
+        structured: bool
+    ) -> GatewayResponse:
+        """Shared body of arequest() and arequest_structured()."""
+        request_id = self._logger.log_request_start(
+            agent=agent,
+            task_id=task_id,
+            session_id=self._session_id,
+            prompt_length=len(prompt),
+            config=config
+        )
+        
+        try:
+            return await self._aexecute_request(
+                request_id=request_id,
+                agent=agent,
+                task_id=task_id,
+                prompt=prompt,
+                config=config,
+                structured=structured
+            )
+        except Exception as e:
+            return self._create_error_response(
+                request_id=request_id,
+                agent=agent,
+                task_id=task_id,
+                error=str(e),
+                error_code="GATEWAY_ERROR"
+            )
+    
     def request_embedding(
         self,
         agent: str,
@@ -348,16 +531,39 @@ class LLMGateway:
             GatewayResponse with embeddings in metadata
         """
         if isinstance(texts, str):
-            texts = [texts]
-        
+            return self._embed_one(agent, task_id, texts)
+        return self._embed_many(agent, task_id, texts)
+    
+    def _embed_one(self, agent: str, task_id: str, text: str) -> GatewayResponse:
+        """Single-text embedding: no per-call config dict or length scan."""
+        request_id = self._logger.log_request_start(
+            agent=agent,
+            task_id=task_id,
+            session_id=self._session_id,
+            prompt_length=len(text),
+            config=_SINGLE_EMBED_CONFIG
+        )
+        return self._execute_embedding(request_id, agent, task_id, [text])
+    
+    def _embed_many(self, agent: str, task_id: str, texts: List[str]) -> GatewayResponse:
+        """Batch embedding."""
         request_id = self._logger.log_request_start(
             agent=agent,
             task_id=task_id,
             session_id=self._session_id,
-            prompt_length=sum(len(t) for t in texts),
+            prompt_length=sum(map(len, texts)),
             config={"type": "embedding", "count": len(texts)}
         )
-        
+        return self._execute_embedding(request_id, agent, task_id, texts)
+    
+    def _execute_embedding(
+        self,
+        request_id: str,
+        agent: str,
+        task_id: str,
+        texts: List[str]
+    ) -> GatewayResponse:
+        """Run an embedding request through policy, rate limiting and the provider."""
         try:
             # Policy check (minimal for embeddings)
             policy_result = self._policy_engine.evaluate(
@@ -366,7 +572,7 @@ class LLMGateway:
                 prompt=texts[0],  # Just check first for authorization
                 config={},
                 session_tokens_used=self._cost_tracker.get_session_tokens_used(),
-                task_request_count=self._get_task_request_count(task_id)
+                task_request_count=self._task_counts.get(task_id, 0)
             )
             
             if not policy_result.allowed:
@@ -379,7 +585,7 @@ class LLMGateway:
                 )
             
             # Rate limit check
-            rate_result = self._rate_limiter.check_limit(agent, task_id)
+            rate_result = self._rate_limiter.try_acquire(agent, task_id, need_stats=False)
             if not rate_result.allowed:
                 self._logger.log_rate_limit(agent, task_id, rate_result.reason or "", rate_result.wait_seconds)
                 return self._create_error_response(
@@ -393,9 +599,8 @@ class LLMGateway:
             # Execute embedding request
             response = self._provider.generate_embedding(texts)
             
-            # Record usage
-            self._rate_limiter.record_request(agent, task_id, 0)
-            self._increment_task_request_count(task_id)
+            # Record usage (the rate limiter counted it in try_acquire)
+            self._task_counts[task_id] += 1
             
             # Log completion
             self._logger.log_request_complete(
@@ -456,89 +661,213 @@ class LLMGateway:
         structured: bool
     ) -> GatewayResponse:
         """Execute a request through the full pipeline."""
+        prepared = self._prepare_request(request_id, agent, task_id, prompt, config)
+        if isinstance(prepared, GatewayResponse):
+            return prepared
+        provider_config, policy_result, rate_result = prepared
+        schema = config.get("_schema") if structured else None
         
-        warnings = []
+        # 5. Execute request (or wait for an identical one already in flight)
+        fingerprint = self._fingerprint(prompt, provider_config, schema, structured)
+        future, leader = self._join_inflight(fingerprint)
+        if leader:
+            try:
+                if structured:
+                    response = self._provider.generate_structured(prompt, provider_config, schema)
+                else:
+                    response = self._provider.generate(prompt, provider_config)
+            except BaseException as e:
+                self._leave_inflight(fingerprint, future, error=e)
+                raise
+            self._leave_inflight(fingerprint, future, response=response)
+        else:
+            response = _as_follower(future.result())
         
-        # 1. Policy check
-        policy_result = self._policy_engine.evaluate(
-            agent=agent,
-            task_id=task_id,
-            prompt=prompt,
-            config=config,
-            session_tokens_used=self._cost_tracker.get_session_tokens_used(),
-            task_request_count=self._get_task_request_count(task_id)
+        return self._finish_request(
+            request_id, agent, task_id, response, policy_result, rate_result
         )
+    
+    async def _aexecute_request(
+        self,
+        request_id: str,
+        agent: str,
+        task_id: str,
+        prompt: str,
+        config: Dict[str, Any],
+        structured: bool
+    ) -> GatewayResponse:
+        """Async counterpart of _execute_request; only the provider call awaits."""
+        prepared = self._prepare_request(request_id, agent, task_id, prompt, config)
+        if isinstance(prepared, GatewayResponse):
+            return prepared
+        provider_config, policy_result, rate_result = prepared
+        schema = config.get("_schema") if structured else None
         
-        if not policy_result.allowed:
-            # Log violation
-            if policy_result.violations:
-                for v in policy_result.violations:
-                    self._logger.log_policy_violation(
-                        agent, task_id, v.violation_type.value, v.message, v.severity
+        # 5. Execute request (or wait for an identical one already in flight)
+        fingerprint = self._fingerprint(prompt, provider_config, schema, structured)
+        future, leader = self._join_inflight(fingerprint)
+        if leader:
+            try:
+                if structured:
+                    response = await self._provider.agenerate_structured(
+                        prompt, provider_config, schema
                     )
-            
-            return self._create_error_response(
-                request_id=request_id,
-                agent=agent,
-                task_id=task_id,
-                error=policy_result.violations[0].message if policy_result.violations else "Policy denied",
-                error_code="POLICY_DENIED"
-            )
+                else:
+                    response = await self._provider.agenerate(prompt, provider_config)
+            except BaseException as e:
+                self._leave_inflight(fingerprint, future, error=e)
+                raise
+            self._leave_inflight(fingerprint, future, response=response)
+        else:
+            response = _as_follower(await asyncio.wrap_future(future))
         
-        # Apply any policy modifications
-        if policy_result.modified_config:
-            config.update(policy_result.modified_config)
+        return self._finish_request(
+            request_id, agent, task_id, response, policy_result, rate_result
+        )
+    
+    def _fingerprint(
+        self,
+        prompt: str,
+        provider_config: ProviderConfig,
+        schema: Optional[Dict[str, Any]],
+        structured: bool
+    ) -> Optional[str]:
+        """
+        Identify a request for in-flight coalescing.
         
-        warnings.extend(policy_result.warnings)
+        Only deterministic (temperature 0) requests are coalesced; sampled
+        requests return None so callers keep independent outputs.
+        """
+        if provider_config.temperature != 0:
+            return None
+        h = _FINGERPRINT_BASE.copy()
+        for part in (
+            self._provider.model,
+            "structured" if structured else "text",
+            repr((
+                provider_config.max_tokens,
+                provider_config.top_p,
+                provider_config.top_k,
+            )),
+            provider_config.system_instruction or "",
+            json.dumps(schema, sort_keys=True) if schema else "",
+            prompt,
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+    
+    def _join_inflight(self, fingerprint: Optional[str]) -> Tuple[Optional[Future], bool]:
+        """
+        Register interest in a request.
         
-        # 2. Rate limit check
-        rate_result = self._rate_limiter.check_limit(
-            agent, task_id, config.get("max_tokens", 8192)
-        )
+        Returns:
+            (future, leader). The leader makes the provider call and must
+            call _leave_inflight; followers wait on the future instead.
+        """
+        if fingerprint is None:
+            return None, True
+        with self._inflight_lock:
+            future = self._inflight.get(fingerprint)
+            if future is not None:
+                return future, False
+            future = self._inflight[fingerprint] = Future()
+            return future, True
+    
+    def _leave_inflight(
+        self,
+        fingerprint: Optional[str],
+        future: Optional[Future],
+        response: Optional[ProviderResponse] = None,
+        error: Optional[BaseException] = None
+    ):
+        """Publish the leader's outcome to any followers."""
+        if future is None:
+            return
+        with self._inflight_lock:
+            self._inflight.pop(fingerprint, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(response)
+    
+    def _prepare_request(
+        self,
+        request_id: str,
+        agent: str,
+        task_id: str,
+        prompt: str,
+        config: Dict[str, Any]
+    ) -> Union[GatewayResponse, Tuple[ProviderConfig, PolicyResult, Any]]:
+        """
+        Run pre-flight checks and build the provider config.
         
-        if not rate_result.allowed:
-            self._logger.log_rate_limit(
-                agent, task_id, rate_result.reason or "", rate_result.wait_seconds
-            )
-            return self._create_error_response(
-                request_id=request_id,
-                agent=agent,
-                task_id=task_id,
-                error=rate_result.reason or "Rate limit exceeded",
-                error_code="RATE_LIMIT"
-            )
+        Returns:
+            An error GatewayResponse if the request is denied, otherwise
+            (provider_config, policy_result, rate_result).
+        """
+        # 1-3. Policy, rate limit and budget checks
+        gate = self._gate_cache.get(agent) or self._compile_gate(agent)
+        error_code, error, policy_result, rate_result = gate(task_id, prompt, config)
         
-        # 3. Budget check
-        budget_status = self._cost_tracker.check_budget()
-        if not budget_status["within_budget"]:
+        if error_code is not None:
             return self._create_error_response(
                 request_id=request_id,
                 agent=agent,
                 task_id=task_id,
-                error="Session budget exhausted",
-                error_code="BUDGET_EXHAUSTED"
+                error=error,
+                error_code=error_code
             )
         
         # 4. Build provider config
-        provider_config = ProviderConfig(
-            max_tokens=config.get("max_tokens", 8192),
-            temperature=config.get("temperature", 0.7),
-            top_p=config.get("top_p", 1.0),
-            top_k=config.get("top_k", 40),
-            timeout_seconds=config.get("timeout_seconds", 60),
-            system_instruction=config.get("system")
-        )
+        provider_config = self._get_provider_config(config)
         
-        # 5. Execute request
-        if structured:
-            schema = config.get("_schema")
-            response = self._provider.generate_structured(prompt, provider_config, schema)
-        else:
-            response = self._provider.generate(prompt, provider_config)
+        return provider_config, policy_result, rate_result
+    
+    def _get_provider_config(self, config: Dict[str, Any]) -> ProviderConfig:
+        """
+        Return a shared ProviderConfig for the given request config.
         
+        Most requests use one of a handful of settings, so configs are
+        interned by value. The pool keeps at most _CFG_POOL_SIZE entries
+        and evicts the oldest first.
+        """
+        key = (
+            config.get("max_tokens", 8192),
+            config.get("temperature", 0.7),
+            config.get("top_p", 1.0),
+            config.get("top_k", 40),
+            config.get("timeout_seconds", 60),
+            config.get("system")
+        )
+        try:
+            provider_config = self._cfg_pool.get(key)
+        except TypeError:
+            # Unhashable value (e.g. a list) - don't pool it
+            return ProviderConfig(*key)
+        if provider_config is not None:
+            return provider_config
+        
+        provider_config = ProviderConfig(*key)
+        with self._cfg_lock:
+            self._cfg_pool[key] = provider_config
+            if len(self._cfg_pool) > self._CFG_POOL_SIZE:
+                self._cfg_pool.popitem(last=False)
+        return provider_config
+    
+    def _finish_request(
+        self,
+        request_id: str,
+        agent: str,
+        task_id: str,
+        response: ProviderResponse,
+        policy_result: PolicyResult,
+        rate_result: Any
+    ) -> GatewayResponse:
+        """Record usage, log completion and build the gateway response."""
         # 6. Record usage
-        self._rate_limiter.record_request(agent, task_id, response.tokens_total)
-        self._increment_task_request_count(task_id)
+        self._rate_limiter.record_tokens(agent, task_id, response.tokens_total)
+        self._task_counts[task_id] += 1
         
         self._cost_tracker.record_usage(
             agent=agent,
@@ -565,15 +894,21 @@ class LLMGateway:
             success=response.success,
             error=response.error,
             error_code=response.error_code,
-            policy_decision=policy_result.decision.value,
+            policy_decision=policy_result.decision,
             rate_limit_remaining=rate_result.remaining_requests
         )
         
         # 8. Build response
         if response.success:
-            estimated_cost = self._cost_tracker.estimate_cost(
-                response.model, response.tokens_input, response.tokens_output
-            )
+            prices = self._price_cache.get(response.model)
+            if prices is not None:
+                estimated_cost = (
+                    prices[0] * response.tokens_input + prices[1] * response.tokens_output
+                )
+            else:
+                estimated_cost = self._cost_tracker.estimate_cost(
+                    response.model, response.tokens_input, response.tokens_output
+                )
             
             return GatewayResponse(
                 success=True,
@@ -588,7 +923,7 @@ class LLMGateway:
                 tokens_total=response.tokens_total,
                 latency_ms=response.latency_ms,
                 estimated_cost_usd=estimated_cost,
-                warnings=warnings,
+                warnings=list(policy_result.warnings),
                 metadata=response.metadata
             )
         else:
@@ -600,6 +935,72 @@ class LLMGateway:
                 error_code=response.error_code or "PROVIDER_ERROR"
             )
     
+    def _compile_gate(self, agent: str) -> Callable[..., Tuple]:
+        """
+        Build the pre-flight gate for an agent.
+        
+        Policy, rate-limit and budget checks all reduce to "allow, or deny
+        with a reason", so they run as a single closure. Collaborator methods
+        are bound once here rather than looked up on every request.
+        
+        Args:
+            agent: Agent the gate is specialized for
+            
+        Returns:
+            gate(task_id, prompt, config) -> (error_code, error, policy_result,
+            rate_result). error_code is None when the request may proceed.
+            Policy modifications are applied to config in place.
+        """
+        evaluate = self._policy_engine.evaluate
+        try_acquire = self._rate_limiter.try_acquire
+        within_budget = self._cost_tracker.is_within_budget
+        session_tokens_used = self._cost_tracker.get_session_tokens_used
+        task_counts = self._task_counts
+        log_policy_violation = self._logger.log_policy_violation
+        log_rate_limit = self._logger.log_rate_limit
+        
+        def gate(task_id: str, prompt: str, config: Dict[str, Any]) -> Tuple:
+            policy_result = evaluate(
+                agent=agent,
+                task_id=task_id,
+                prompt=prompt,
+                config=config,
+                session_tokens_used=session_tokens_used(),
+                task_request_count=task_counts.get(task_id, 0)
+            )
+            if not policy_result.allowed:
+                for v in policy_result.violations:
+                    log_policy_violation(
+                        agent, task_id, v.violation_type, v.message, v.severity
+                    )
+                error = (
+                    policy_result.violations[0].message
+                    if policy_result.violations else "Policy denied"
+                )
+                return "POLICY_DENIED", error, policy_result, None
+            
+            if policy_result.modified_config:
+                config.update(policy_result.modified_config)
+            
+            # Budget first: try_acquire consumes a rate-limit permit
+            if not within_budget():
+                return "BUDGET_EXHAUSTED", "Session budget exhausted", policy_result, None
+            
+            rate_result = try_acquire(agent, task_id, config.get("max_tokens", 8192))
+            if not rate_result.allowed:
+                log_rate_limit(agent, task_id, rate_result.reason or "", rate_result.wait_seconds)
+                return (
+                    "RATE_LIMIT",
+                    rate_result.reason or "Rate limit exceeded",
+                    policy_result,
+                    rate_result,
+                )
+            
+            return None, None, policy_result, rate_result
+        
+        self._gate_cache[agent] = gate
+        return gate
+    
     def _create_error_response(
         self,
         request_id: str,
@@ -609,27 +1010,17 @@ class LLMGateway:
         error_code: str
     ) -> GatewayResponse:
         """Create a standardized error response."""
-        return GatewayResponse(
-            success=False,
-            content="",
-            request_id=request_id,
-            agent=agent,
-            task_id=task_id,
-            model=self._default_model,
-            provider=self._provider.name if self._provider else "unknown",
-            error=error,
-            error_code=error_code
-        )
-    
-    def _get_task_request_count(self, task_id: str) -> int:
-        """Get request count for a task."""
-        with self._lock:
-            return self._task_request_counts.get(task_id, 0)
-    
-    def _increment_task_request_count(self, task_id: str):
-        """Increment request count for a task."""
-        with self._lock:
-            self._task_request_counts[task_id] = self._task_request_counts.get(task_id, 0) + 1
+        factory = self._error_factories.get(error_code)
+        if factory is None:
+            factory = self._error_factories[error_code] = functools.partial(
+                GatewayResponse,
+                success=False,
+                content="",
+                model=self._default_model,
+                provider=self._provider.name if self._provider else "unknown",
+                error_code=error_code
+            )
+        return factory(request_id=request_id, agent=agent, task_id=task_id, error=error)
     
     # =========================================================================
     # Observability Methods
@@ -694,6 +1085,7 @@ def _get_gateway() -> LLMGateway:
     """Get or create the gateway instance."""
     global _gateway
     if _gateway is None:
+        _load_env_once()
         _gateway = LLMGateway()
     return _gateway
 
@@ -736,6 +1128,24 @@ def request(
     return _get_gateway().request(agent, task_id, prompt, config)
 
 
+async def arequest(
+    agent: str,
+    task_id: str,
+    prompt: str,
+    config: Optional[Dict[str, Any]] = None
+) -> GatewayResponse:
+    """
+    Async variant of request().
+    
+    Example:
+        responses = await asyncio.gather(
+            arequest("Architect", "T5", "Design a REST API"),
+            arequest("Builder", "T6", "Write the handlers"),
+        )
+    """
+    return await _get_gateway().arequest(agent, task_id, prompt, config)
+
+
 def request_structured(
     agent: str,
     task_id: str,
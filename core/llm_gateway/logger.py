@@ -10,21 +10,63 @@ Design Intent:
     - Performance metrics
     - Error tracking
     - Security (no API keys logged)
+
+Concurrency:
+    The in-memory log buffers follow a writer-locked, reader-free scheme.
+    Writers (request threads finishing a call) serialize on
+    ``_writer_lock`` only among themselves. Readers never take a lock:
+    they snapshot a buffer with ``tuple(deque)``, which copies the entry
+    references in a single C-level call that a concurrent append cannot
+    interleave with under the GIL, then work on the immutable snapshot.
+    Entries are frozen ``RequestLog`` objects, so a snapshot never
+    observes a partially built entry. The columnar statistics buffers are
+    the exception: get_stats() copies them under the writer lock so the
+    count and the sums come from the same moment.
 """
 
+import array
+import itertools
 import logging
 import json
+import os
+import queue
+import threading
 import time
+import weakref
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
 
+# Optional fast JSON encoder
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    orjson = None
+    
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+    
+    def _dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj) + "\n").encode()
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class RequestLog:
-    """Log entry for an LLM request."""
+    """
+    Log entry for an LLM request.
+    
+    Immutable once created. The dict form is built on first use and then
+    shared, so callers of to_dict() must treat it as read-only.
+    """
     request_id: str
     timestamp: str
     agent: str
@@ -40,8 +82,16 @@ class RequestLog:
     error_code: Optional[str] = None
     policy_decision: Optional[str] = None
     rate_limit_remaining: Optional[int] = None
+    _dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def to_dict(self) -> Dict[str, Any]:
+        if self._dict is None:
+            object.__setattr__(self, "_dict", self._build_dict())
+        return self._dict
+    
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "request_id": self.request_id,
             "timestamp": self.timestamp,
@@ -64,7 +114,178 @@ class RequestLog:
         }
     
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
+
+
+class _BatchedFileHandler(logging.Handler):
+    """
+    File handler that writes buffered lines in batches.
+    
+    emit() formats the record and buffers the encoded line; the buffer
+    goes out in one writev to an O_APPEND descriptor when it holds
+    max_batch lines and on flush(). GatewayLogger's drain thread flushes
+    its handlers after every batch, so the handler needs no thread of its
+    own. Lines emitted after close() are dropped.
+    """
+    
+    def __init__(self, path: str, max_batch: int = 32):
+        super().__init__()
+        self._fd: Optional[int] = os.open(
+            path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        self._max_batch = max_batch
+        self._pending: List[bytes] = []
+    
+    def emit(self, record: logging.LogRecord):
+        # Handler.handle() holds self.lock around emit()
+        if self._fd is None:
+            return
+        try:
+            line = (self.format(record) + "\n").encode("utf-8", "backslashreplace")
+        except Exception:
+            self.handleError(record)
+            return
+        self._pending.append(line)
+        if len(self._pending) >= self._max_batch:
+            self._write_pending()
+    
+    def flush(self):
+        """Write every buffered line."""
+        with self.lock:
+            self._write_pending()
+    
+    def close(self):
+        with self.lock:
+            if self._fd is not None:
+                self._write_pending()
+                os.close(self._fd)
+                self._fd = None
+        super().close()
+    
+    def _write_pending(self):
+        lines, self._pending = self._pending, []
+        if not lines or self._fd is None:
+            return
+        try:
+            self._write(lines)
+        except OSError:
+            pass  # Logging must never take the gateway down
+    
+    def _write(self, lines: List[bytes]):
+        if hasattr(os, "writev"):
+            written = os.writev(self._fd, lines)
+            total = sum(map(len, lines))
+            if written == total:
+                return
+            data = b"".join(lines)[written:]
+        else:
+            data = b"".join(lines)
+        while data:
+            data = data[os.write(self._fd, data):]
+
+
+# Max records the writer thread hands to the handlers per wake-up
+_DRAIN_BATCH = 64
+
+
+class _StructuredSink:
+    """JSON Lines file receiving completed-request records."""
+    
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.fd: Optional[int] = os.open(
+            path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+    
+    def write(self, entries: List[RequestLog]):
+        """Append request records in one write."""
+        fd = self.fd
+        if not entries or fd is None:
+            return
+        try:
+            os.write(fd, b"".join([_dumps_line(e.to_dict()) for e in entries]))
+        except Exception:
+            pass  # Logging must never take the gateway down
+    
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def _drain_loop(
+    q: "queue.SimpleQueue",
+    logger: logging.Logger,
+    sink: Optional[_StructuredSink]
+):
+    """
+    Writer thread: hand queued records to the handlers in batches.
+    
+    Holds no reference to its GatewayLogger, so an unused logger can be
+    collected; its finalizer queues None, which ends the loop.
+    """
+    stop = False
+    while not stop:
+        batch = [q.get()]
+        while len(batch) < _DRAIN_BATCH:
+            try:
+                batch.append(q.get_nowait())
+            except queue.Empty:
+                break
+        
+        lines = []
+        handled = False
+        for item in batch:
+            if item is None:
+                stop = True
+            elif isinstance(item, RequestLog):
+                lines.append(item)
+            elif isinstance(item, threading.Event):
+                if sink is not None:
+                    sink.write(lines)
+                lines = []
+                item.set()
+            else:
+                level, msg, args, created = item
+                try:
+                    record = logger.makeRecord(
+                        logger.name, level, __file__, 0, msg, args, None
+                    )
+                    # Keep the time the event happened, not when it was drained
+                    record.created = created
+                    record.msecs = (created - int(created)) * 1000
+                    logger.handle(record)
+                    handled = True
+                except Exception:
+                    pass  # Logging must never take the gateway down
+        if sink is not None:
+            sink.write(lines)
+        if handled:
+            # Write out lines the handlers buffered during this batch
+            for handler in tuple(logger.handlers):
+                try:
+                    handler.flush()
+                except Exception:
+                    pass
+
+
+def _stop_drain(q: "queue.SimpleQueue", writer: threading.Thread,
+                sink: Optional[_StructuredSink]):
+    """Finalizer: stop a writer thread once its queue is drained."""
+    if writer.is_alive():
+        q.put(None)
+        if writer is threading.current_thread():
+            return  # the loop exits after this batch; leave the sink open
+        writer.join()
+    if sink is not None:
+        sink.close()
+
+
+def _tail(snapshot: Tuple[RequestLog, ...], limit: int) -> Tuple[RequestLog, ...]:
+    """Return the last `limit` entries of a buffer snapshot, oldest first."""
+    if limit <= 0:
+        return ()
+    return snapshot[-limit:]
 
 
 class GatewayLogger:
@@ -90,7 +311,9 @@ class GatewayLogger:
         log_level: int = logging.INFO,
         log_file: Optional[str] = None,
         log_to_console: bool = True,
-        max_recent_logs: int = 1000
+        max_recent_logs: int = 1000,
+        max_error_logs: int = 1000,
+        structured_log_file: Optional[str] = None
     ):
         """
         Initialize the gateway logger.
@@ -101,12 +324,17 @@ class GatewayLogger:
             log_file: Optional file path for logging
             log_to_console: Whether to log to console
             max_recent_logs: Maximum recent logs to keep in memory
+            max_error_logs: Maximum failed-request logs to keep in memory
+            structured_log_file: Optional JSON Lines file receiving one
+                RequestLog record per completed request
         """
         self.name = name
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
         
-        # Clear existing handlers
+        # Clear existing handlers (closing them writes out buffered lines)
+        for handler in self.logger.handlers:
+            handler.close()
         self.logger.handlers = []
         
         # Console handler
@@ -123,7 +351,7 @@ class GatewayLogger:
         if log_file:
             log_path = Path(log_file)
             log_path.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(log_file)
+            file_handler = _BatchedFileHandler(log_file)
             file_handler.setLevel(log_level)
             file_format = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -131,19 +359,101 @@ class GatewayLogger:
             file_handler.setFormatter(file_format)
             self.logger.addHandler(file_handler)
         
-        # In-memory recent logs for quick access
-        self._recent_logs: List[RequestLog] = []
+        # Structured sink: completed requests as JSON lines, written as
+        # raw bytes by the writer thread (no logging.Formatter involved)
+        self._sink: Optional[_StructuredSink] = None
+        if structured_log_file:
+            self._sink = _StructuredSink(structured_log_file)
+        
+        # In-memory recent logs for quick access (ring buffers: appending
+        # past maxlen drops the oldest entry). Failures are also kept in a
+        # separate buffer so they are not crowded out by successes.
+        self._recent_logs: deque = deque(maxlen=max_recent_logs)
+        self._error_logs: deque = deque(maxlen=max_error_logs)
         self._max_recent = max_recent_logs
-        self._lock = Lock()
         
-        # Request counter for IDs
-        self._request_counter = 0
+        # Columnar copies of the numeric fields get_stats() needs, kept as
+        # ring buffers in step with _recent_logs. Unused slots stay zero.
+        self._stat_latency = array.array("d", bytes(8 * max_recent_logs))
+        self._stat_success = bytearray(max_recent_logs)
+        self._stat_pos = 0
+        self._stat_count = 0
+        
+        # Serializes writers only; readers snapshot without locking
+        self._writer_lock = Lock()
+        
+        # Request counter for IDs (next() on itertools.count is atomic)
+        self._request_counter = itertools.count(1)
+        
+        # Formatted-time caches as (key, text) tuples, replaced wholesale:
+        # ISO stamps per millisecond, request-ID stamps per second
+        self._iso_cache: Tuple[int, str] = (-1, "")
+        self._id_stamp_cache: Tuple[int, str] = (-1, "")
+        
+        # Records are handed to a writer thread so formatting and handler
+        # I/O stay off the request path (see _emit / _drain_loop). The
+        # finalizer drains and stops the thread when this logger is
+        # closed, garbage collected, or at interpreter exit.
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=_drain_loop,
+            args=(self._queue, self.logger, self._sink),
+            name=f"{name}-log-drain",
+            daemon=True,
+        )
+        self._writer.start()
+        self._finalizer = weakref.finalize(
+            self, _stop_drain, self._queue, self._writer, self._sink
+        )
+    
+    def _emit(self, level: int, msg: str, *args: Any):
+        """
+        Queue a log record for the writer thread.
+        
+        Records below the logger's level are dropped here, before anything
+        is queued. After close() records are logged synchronously.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        if self._writer.is_alive():
+            self._queue.put((level, msg, args, time.time()))
+        else:
+            self.logger.log(level, msg, *args)
+    
+    def flush(self):
+        """Block until queued records have reached the handlers, then flush them."""
+        if self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+        for handler in self.logger.handlers:
+            handler.flush()
+    
+    def close(self):
+        """Drain pending records and stop the writer thread."""
+        self._finalizer()
+        for handler in self.logger.handlers:
+            handler.flush()
+    
+    def _now_iso(self) -> str:
+        """Current time in ISO format, reused within the same millisecond."""
+        ns = time.time_ns()
+        key = ns // 1_000_000
+        cached = self._iso_cache
+        if cached[0] != key:
+            cached = self._iso_cache = (key, datetime.fromtimestamp(ns / 1e9).isoformat())
+        return cached[1]
     
     def _generate_request_id(self) -> str:
         """Generate a unique request ID."""
-        self._request_counter += 1
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"req_{timestamp}_{self._request_counter:06d}"
+        n = next(self._request_counter)
+        second = int(time.time())
+        cached = self._id_stamp_cache
+        if cached[0] != second:
+            cached = self._id_stamp_cache = (
+                second, datetime.fromtimestamp(second).strftime("%Y%m%d%H%M%S")
+            )
+        return f"req_{cached[1]}_{n:06d}"
     
     def log_request_start(
         self,
@@ -168,10 +478,12 @@ class GatewayLogger:
         """
         request_id = self._generate_request_id()
         
-        self.logger.info(
-            f"REQUEST_START | id={request_id} | agent={agent} | task={task_id} | "
-            f"prompt_chars={prompt_length} | max_tokens={config.get('max_tokens')} | "
-            f"temp={config.get('temperature')}"
+        self._emit(
+            logging.INFO,
+            "REQUEST_START | id=%s | agent=%s | task=%s | "
+            "prompt_chars=%s | max_tokens=%s | temp=%s",
+            request_id, agent, task_id,
+            prompt_length, config.get('max_tokens'), config.get('temperature')
         )
         
         return request_id
@@ -214,7 +526,7 @@ class GatewayLogger:
         """
         log_entry = RequestLog(
             request_id=request_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp=self._now_iso(),
             agent=agent,
             task_id=task_id,
             session_id=session_id,
@@ -231,24 +543,40 @@ class GatewayLogger:
         )
         
         # Store in memory
-        with self._lock:
+        with self._writer_lock:
             self._recent_logs.append(log_entry)
-            if len(self._recent_logs) > self._max_recent:
-                self._recent_logs = self._recent_logs[-self._max_recent:]
+            if not success:
+                self._error_logs.append(log_entry)
+            if self._max_recent > 0:
+                pos = self._stat_pos
+                self._stat_latency[pos] = latency_ms
+                self._stat_success[pos] = 1 if success else 0
+                self._stat_pos = (pos + 1) % self._max_recent
+                if self._stat_count < self._max_recent:
+                    self._stat_count += 1
+        
+        # Structured sink (serialized once, on the writer thread)
+        if self._sink is not None:
+            if self._writer.is_alive():
+                self._queue.put(log_entry)
+            else:
+                self._sink.write([log_entry])
         
         # Log based on success
         if success:
-            self.logger.info(
-                f"REQUEST_COMPLETE | id={request_id} | agent={agent} | "
-                f"provider={provider} | model={model} | "
-                f"tokens_in={tokens_input} | tokens_out={tokens_output} | "
-                f"latency_ms={latency_ms:.1f}"
+            self._emit(
+                logging.INFO,
+                "REQUEST_COMPLETE | id=%s | agent=%s | provider=%s | model=%s | "
+                "tokens_in=%s | tokens_out=%s | latency_ms=%.1f",
+                request_id, agent, provider, model,
+                tokens_input, tokens_output, latency_ms
             )
         else:
-            self.logger.error(
-                f"REQUEST_FAILED | id={request_id} | agent={agent} | "
-                f"provider={provider} | error_code={error_code} | "
-                f"error={error}"
+            self._emit(
+                logging.ERROR,
+                "REQUEST_FAILED | id=%s | agent=%s | provider=%s | "
+                "error_code=%s | error=%s",
+                request_id, agent, provider, error_code, error
             )
     
     def log_policy_violation(
@@ -261,10 +589,10 @@ class GatewayLogger:
     ):
         """Log a policy violation."""
         log_level = logging.ERROR if severity == "error" else logging.WARNING
-        self.logger.log(
+        self._emit(
             log_level,
-            f"POLICY_VIOLATION | agent={agent} | task={task_id} | "
-            f"type={violation_type} | severity={severity} | message={message}"
+            "POLICY_VIOLATION | agent=%s | task=%s | type=%s | severity=%s | message=%s",
+            agent, task_id, violation_type, severity, message
         )
     
     def log_rate_limit(
@@ -275,9 +603,10 @@ class GatewayLogger:
         wait_seconds: float
     ):
         """Log a rate limit event."""
-        self.logger.warning(
-            f"RATE_LIMIT | agent={agent} | task={task_id} | "
-            f"reason={reason} | wait_seconds={wait_seconds:.1f}"
+        self._emit(
+            logging.WARNING,
+            "RATE_LIMIT | agent=%s | task=%s | reason=%s | wait_seconds=%.1f",
+            agent, task_id, reason, wait_seconds
         )
     
     def log_provider_health(
@@ -287,61 +616,68 @@ class GatewayLogger:
         details: Optional[str] = None
     ):
         """Log provider health status."""
-        self.logger.info(
-            f"PROVIDER_HEALTH | provider={provider} | status={status} | "
-            f"details={details or 'none'}"
+        self._emit(
+            logging.INFO,
+            "PROVIDER_HEALTH | provider=%s | status=%s | details=%s",
+            provider, status, details or 'none'
         )
     
     def log_session_start(self, session_id: str, config: Dict[str, Any]):
         """Log session start."""
-        self.logger.info(
-            f"SESSION_START | session_id={session_id} | "
-            f"budget_usd={config.get('budget_usd')} | "
-            f"budget_tokens={config.get('budget_tokens')}"
+        self._emit(
+            logging.INFO,
+            "SESSION_START | session_id=%s | budget_usd=%s | budget_tokens=%s",
+            session_id, config.get('budget_usd'), config.get('budget_tokens')
         )
     
     def log_session_end(self, session_id: str, summary: Dict[str, Any]):
         """Log session end with summary."""
-        self.logger.info(
-            f"SESSION_END | session_id={session_id} | "
-            f"total_requests={summary.get('total_requests')} | "
-            f"total_tokens={summary.get('total_tokens')} | "
-            f"total_cost_usd={summary.get('estimated_cost_usd')}"
+        self._emit(
+            logging.INFO,
+            "SESSION_END | session_id=%s | total_requests=%s | "
+            "total_tokens=%s | total_cost_usd=%s",
+            session_id, summary.get('total_requests'),
+            summary.get('total_tokens'), summary.get('estimated_cost_usd')
         )
     
     def get_recent_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent log entries."""
-        with self._lock:
-            return [log.to_dict() for log in self._recent_logs[-limit:]]
+        logs = _tail(tuple(self._recent_logs), limit)
+        return [log.to_dict() for log in logs]
     
     def get_error_logs(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent error logs."""
-        with self._lock:
-            errors = [log for log in self._recent_logs if not log.success]
-            return [log.to_dict() for log in errors[-limit:]]
+        logs = _tail(tuple(self._error_logs), limit)
+        return [log.to_dict() for log in logs]
     
     def get_agent_logs(self, agent: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get logs for a specific agent."""
-        with self._lock:
-            agent_logs = [log for log in self._recent_logs if log.agent == agent]
-            return [log.to_dict() for log in agent_logs[-limit:]]
+        snapshot = tuple(self._recent_logs)
+        # Walk newest-first and stop once `limit` matches are found
+        newest = (log for log in reversed(snapshot) if log.agent == agent)
+        agent_logs = list(itertools.islice(newest, max(limit, 0)))
+        agent_logs.reverse()
+        return [log.to_dict() for log in agent_logs]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get logging statistics."""
-        with self._lock:
-            if not self._recent_logs:
-                return {"total_logs": 0, "success_rate": 0.0}
-            
-            total = len(self._recent_logs)
-            successful = sum(1 for log in self._recent_logs if log.success)
-            
-            total_latency = sum(log.latency_ms for log in self._recent_logs)
-            avg_latency = total_latency / total if total > 0 else 0
-            
-            return {
-                "total_logs": total,
-                "successful": successful,
-                "failed": total - successful,
-                "success_rate": successful / total if total > 0 else 0.0,
-                "average_latency_ms": round(avg_latency, 2)
-            }
+        # The three columns must agree, so copy them (two memcpys) under
+        # the writer lock rather than reading them lock-free
+        with self._writer_lock:
+            total = self._stat_count
+            latencies = self._stat_latency[:]
+            successes = bytes(self._stat_success)
+        if not total:
+            return {"total_logs": 0, "success_rate": 0.0}
+        
+        # Whole-buffer reductions in C; empty slots contribute zero
+        successful = successes.count(1)
+        avg_latency = sum(latencies) / total
+        
+        return {
+            "total_logs": total,
+            "successful": successful,
+            "failed": total - successful,
+            "success_rate": successful / total,
+            "average_latency_ms": round(avg_latency, 2)
+        }
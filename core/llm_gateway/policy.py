@@ -11,22 +11,31 @@ Design Intent:
     - Agent-specific overrides where needed
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set
+import re
+from dataclasses import dataclass, field, fields as dc_fields, replace as dc_replace
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
 from enum import Enum
 from datetime import datetime
 
 
-class PolicyDecision(Enum):
-    """Policy enforcement decision."""
+class PolicyDecision(str, Enum):
+    """
+    Policy enforcement decision.
+    
+    Members are strings ("allow" == PolicyDecision.ALLOW), so they can be
+    logged and serialized to JSON as-is.
+    """
     ALLOW = "allow"
     DENY = "deny"
     WARN = "warn"
     MODIFY = "modify"  # Allow but modify request
+    
+    __str__ = str.__str__
 
 
-class PolicyViolationType(Enum):
-    """Types of policy violations."""
+class PolicyViolationType(str, Enum):
+    """Types of policy violations (string members, like PolicyDecision)."""
     TOKEN_LIMIT_EXCEEDED = "token_limit_exceeded"
     TEMPERATURE_OUT_OF_BOUNDS = "temperature_out_of_bounds"
     PROMPT_TOO_LONG = "prompt_too_long"
@@ -36,9 +45,11 @@ class PolicyViolationType(Enum):
     COST_LIMIT_EXCEEDED = "cost_limit_exceeded"
     MALFORMED_REQUEST = "malformed_request"
     BLOCKED_CONTENT = "blocked_content"
+    
+    __str__ = str.__str__
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicyViolation:
     """Represents a policy violation."""
     violation_type: PolicyViolationType
@@ -48,14 +59,14 @@ class PolicyViolation:
     
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "type": self.violation_type.value,
+            "type": self.violation_type,
             "message": self.message,
             "severity": self.severity,
             "suggested_fix": self.suggested_fix
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicyResult:
     """Result of policy evaluation."""
     decision: PolicyDecision
@@ -69,7 +80,7 @@ class PolicyResult:
     
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "decision": self.decision.value,
+            "decision": self.decision,
             "allowed": self.allowed,
             "violations": [v.to_dict() for v in self.violations],
             "modified_config": self.modified_config,
@@ -77,13 +88,32 @@ class PolicyResult:
         }
 
 
-@dataclass
+# Sentinel for config keys the caller did not set
+_MISSING = object()
+
+
+# Agents allowed to use the gateway unless a Policy says otherwise
+_DEFAULT_AUTHORIZED_AGENTS: FrozenSet[str] = frozenset({
+    "Persona", "S-1",
+    "Architect", "A-1",
+    "Builder", "Forge", "F-1", "F-2", "F-3",
+    "Integrator", "I-1",
+    "Knowledge", "KnowledgeEngine", "S-2",
+    "Evolution", "S-3",
+    "SystemDesigner", "D-1",
+    "Gateway",  # Internal
+    "Test",     # Testing
+})
+
+
+@dataclass(frozen=True, slots=True)
 class Policy:
     """
     Policy configuration for the gateway.
     
     These are the system-wide defaults. Agent-specific overrides
-    can be configured per-agent.
+    can be configured per-agent. Policies are immutable; use
+    dataclasses.replace() to derive a variant.
     """
     # Token limits
     max_tokens_per_request: int = 8192
@@ -108,24 +138,26 @@ class Policy:
     max_timeout_seconds: int = 120
     default_timeout_seconds: int = 60
     
-    # Authorized agents
-    authorized_agents: Set[str] = field(default_factory=lambda: {
-        "Persona", "S-1",
-        "Architect", "A-1",
-        "Builder", "Forge", "F-1", "F-2", "F-3",
-        "Integrator", "I-1",
-        "Knowledge", "KnowledgeEngine", "S-2",
-        "Evolution", "S-3",
-        "SystemDesigner", "D-1",
-        "Gateway",  # Internal
-        "Test",     # Testing
-    })
+    # Authorized agents (stored as a frozenset; see __post_init__)
+    authorized_agents: FrozenSet[str] = _DEFAULT_AUTHORIZED_AGENTS
+    
+    # Content rules: regexes (case-insensitive) that deny a prompt on match
+    blocked_patterns: Tuple[str, ...] = ()
     
     # Deterministic mode (for reproducibility)
     enforce_deterministic: bool = False
     deterministic_temperature: float = 0.0
     deterministic_top_k: int = 1
     
+    def __post_init__(self):
+        # Accept any iterable of names, but keep the gatekeeper immutable
+        if not isinstance(self.authorized_agents, frozenset):
+            object.__setattr__(self, "authorized_agents", frozenset(self.authorized_agents))
+        if not isinstance(self.blocked_patterns, tuple):
+            object.__setattr__(self, "blocked_patterns", tuple(self.blocked_patterns))
+        # Compile now so a bad pattern fails here rather than on every request
+        _compile_blocked(self.blocked_patterns)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "max_tokens_per_request": self.max_tokens_per_request,
@@ -140,10 +172,28 @@ class Policy:
                 "tokens_per_session": self.max_tokens_per_session,
                 "usd_per_session": self.max_cost_per_session_usd
             },
-            "authorized_agents": list(self.authorized_agents)
+            "authorized_agents": list(self.authorized_agents),
+            "blocked_patterns": list(self.blocked_patterns)
         }
 
 
+@lru_cache(maxsize=32)
+def _compile_blocked(patterns: Tuple[str, ...]) -> Tuple[Pattern, ...]:
+    """
+    Compile blocked patterns once per distinct pattern set.
+    
+    Patterns are compiled one by one: joined into a single alternation,
+    backreferences would be renumbered and inline flags rejected.
+    """
+    compiled = []
+    for i, pattern in enumerate(patterns):
+        try:
+            compiled.append(re.compile(pattern, re.IGNORECASE))
+        except re.error as e:
+            raise ValueError(f"Invalid blocked pattern #{i} ({pattern!r}): {e}") from e
+    return tuple(compiled)
+
+
 class PolicyEngine:
     """
     Policy enforcement engine for LLM Gateway.
@@ -167,16 +217,22 @@ class PolicyEngine:
         """
         self.policy = policy or Policy()
         self._agent_overrides: Dict[str, Dict[str, Any]] = {}
+        # Merged per-agent policies, built once in set_agent_override
+        self._effective_policies: Dict[str, Policy] = {}
     
     def set_agent_override(self, agent: str, overrides: Dict[str, Any]):
         """
         Set agent-specific policy overrides.
         
+        The merged policy is built here, once, so evaluate() only does a
+        dict lookup. Overrides are merged onto the current base policy.
+        
         Args:
             agent: Agent name
             overrides: Dictionary of policy overrides
         """
         self._agent_overrides[agent] = overrides
+        self._effective_policies[agent] = self._merge_overrides(overrides)
     
     def evaluate(
         self,
@@ -201,35 +257,40 @@ class PolicyEngine:
         Returns:
             PolicyResult with decision and any violations
         """
-        violations = []
-        warnings = []
-        modified_config = dict(config)
-        
         # Get effective policy (with agent overrides)
         effective_policy = self._get_effective_policy(agent)
         
-        # Check agent authorization
+        # Check agent authorization first, before building any state
         if not self._is_agent_authorized(agent, effective_policy):
-            violations.append(PolicyViolation(
+            return PolicyResult(decision=PolicyDecision.DENY, violations=[PolicyViolation(
                 violation_type=PolicyViolationType.AGENT_NOT_AUTHORIZED,
                 message=f"Agent '{agent}' is not authorized to make LLM requests",
                 severity="error"
-            ))
-            return PolicyResult(decision=PolicyDecision.DENY, violations=violations)
+            )])
+        
+        # The caller's config is only copied once a value actually changes
+        modified = False
+        modified_config = config
         
-        # Check prompt validity
-        prompt_violations = self._check_prompt(prompt, effective_policy)
-        violations.extend(prompt_violations)
+        # Check prompt validity (the returned list collects all violations)
+        violations = self._check_prompt(prompt, effective_policy)
         
-        # Check token limits
-        token_violations, token_warnings, modified_tokens = self._check_tokens(
+        # Check blocked content
+        if effective_policy.blocked_patterns:
+            content_violation = self._check_content(prompt, effective_policy)
+            if content_violation is not None:
+                violations.append(content_violation)
+        
+        # Check token limits (the returned list collects all warnings)
+        token_violations, warnings, modified_tokens = self._check_tokens(
             config.get("max_tokens", effective_policy.max_tokens_per_request),
             session_tokens_used,
             effective_policy
         )
         violations.extend(token_violations)
-        warnings.extend(token_warnings)
-        if modified_tokens is not None:
+        if modified_tokens is not None and config.get("max_tokens", _MISSING) != modified_tokens:
+            modified_config = dict(config)
+            modified = True
             modified_config["max_tokens"] = modified_tokens
         
         # Check temperature bounds
@@ -238,7 +299,10 @@ class PolicyEngine:
             effective_policy
         )
         violations.extend(temp_violations)
-        if modified_temp is not None:
+        if modified_temp is not None and config.get("temperature", _MISSING) != modified_temp:
+            if not modified:
+                modified_config = dict(config)
+                modified = True
             modified_config["temperature"] = modified_temp
         
         # Check task request limits
@@ -254,12 +318,19 @@ class PolicyEngine:
         timeout = config.get("timeout_seconds", effective_policy.default_timeout_seconds)
         if timeout > effective_policy.max_timeout_seconds:
             warnings.append(f"Timeout {timeout}s exceeds max {effective_policy.max_timeout_seconds}s, capping")
+            if not modified:
+                modified_config = dict(config)
+                modified = True
             modified_config["timeout_seconds"] = effective_policy.max_timeout_seconds
         
         # Enforce deterministic mode if enabled
         if effective_policy.enforce_deterministic:
+            if not modified:
+                modified_config = dict(config)
             modified_config["temperature"] = effective_policy.deterministic_temperature
             modified_config["top_k"] = effective_policy.deterministic_top_k
+            # Only a real change counts (the config may already be deterministic)
+            modified = modified_config != config
             warnings.append("Deterministic mode enforced")
         
         # Determine final decision
@@ -271,7 +342,7 @@ class PolicyEngine:
                 violations=violations,
                 warnings=warnings
             )
-        elif modified_config != config:
+        elif modified:
             return PolicyResult(
                 decision=PolicyDecision.MODIFY,
                 violations=violations,
@@ -289,26 +360,16 @@ class PolicyEngine:
     
     def _get_effective_policy(self, agent: str) -> Policy:
         """Get policy with agent-specific overrides applied."""
-        if agent not in self._agent_overrides:
-            return self.policy
-
-        overrides = self._agent_overrides[agent]
-
-        # Build a dict of the base policy's fields, then overlay overrides
-        from dataclasses import fields as dc_fields
+        return self._effective_policies.get(agent, self.policy)
+    
+    def _merge_overrides(self, overrides: Dict[str, Any]) -> Policy:
+        """Build the base policy with overrides applied (unknown keys ignored)."""
         valid_field_names = {f.name for f in dc_fields(Policy)}
-
-        # Filter overrides to only valid Policy fields
-        merged = {}
-        for key, value in overrides.items():
-            if key in valid_field_names:
-                merged[key] = value
-
+        merged = {k: v for k, v in overrides.items() if k in valid_field_names}
+        
         if not merged:
             return self.policy
-
-        # Use dataclasses.replace to create a new Policy with overrides
-        from dataclasses import replace as dc_replace
+        
         return dc_replace(self.policy, **merged)
     
     def _is_agent_authorized(self, agent: str, policy: Policy) -> bool:
@@ -317,63 +378,84 @@ class PolicyEngine:
     
     def _check_prompt(self, prompt: str, policy: Policy) -> List[PolicyViolation]:
         """Check prompt validity."""
-        violations = []
+        violations: List[PolicyViolation] = []
         
-        if not prompt or len(prompt.strip()) < policy.min_prompt_length:
+        # Length after strip(), without copying the prompt unless its ends
+        # actually have whitespace to strip
+        n = len(prompt) if prompt else 0
+        if n == 0:
+            too_short = True
+        elif not prompt[0].isspace() and not prompt[-1].isspace():
+            too_short = n < policy.min_prompt_length
+        else:
+            too_short = len(prompt.strip()) < policy.min_prompt_length
+        
+        if too_short:
             violations.append(PolicyViolation(
                 violation_type=PolicyViolationType.PROMPT_EMPTY,
                 message="Prompt is empty or too short",
                 severity="error"
             ))
         
-        if len(prompt) > policy.max_prompt_length:
+        if n > policy.max_prompt_length:
             violations.append(PolicyViolation(
                 violation_type=PolicyViolationType.PROMPT_TOO_LONG,
-                message=f"Prompt length ({len(prompt)}) exceeds max ({policy.max_prompt_length})",
+                message=f"Prompt length ({n}) exceeds max ({policy.max_prompt_length})",
                 severity="error",
                 suggested_fix="Reduce prompt length or summarize context"
             ))
         
         return violations
     
+    def _check_content(self, prompt: str, policy: Policy) -> Optional[PolicyViolation]:
+        """Scan the prompt against the policy's blocked patterns."""
+        patterns = _compile_blocked(policy.blocked_patterns)
+        index = next((i for i, p in enumerate(patterns) if p.search(prompt)), None)
+        if index is None:
+            return None
+        
+        return PolicyViolation(
+            violation_type=PolicyViolationType.BLOCKED_CONTENT,
+            message=f"Prompt matches blocked pattern #{index}",
+            severity="error",
+            suggested_fix="Remove the blocked content from the prompt"
+        )
+    
     def _check_tokens(
         self,
         requested_tokens: int,
         session_tokens_used: int,
         policy: Policy
-    ) -> tuple:
+    ) -> Tuple[List[PolicyViolation], List[str], Optional[int]]:
         """Check token limits."""
-        violations = []
-        warnings = []
-        modified = None
-        
-        # Check per-request limit
-        if requested_tokens > policy.max_tokens_per_request:
-            warnings.append(f"Requested tokens ({requested_tokens}) exceeds max ({policy.max_tokens_per_request}), capping")
-            modified = policy.max_tokens_per_request
-        
-        # Check session limit
-        remaining_session_tokens = policy.max_tokens_per_session - session_tokens_used
-        if remaining_session_tokens <= 0:
-            violations.append(PolicyViolation(
+        session_cap = policy.max_tokens_per_session - session_tokens_used
+        if session_cap <= 0:
+            return [PolicyViolation(
                 violation_type=PolicyViolationType.COST_LIMIT_EXCEEDED,
                 message=f"Session token limit ({policy.max_tokens_per_session}) exceeded",
                 severity="error"
-            ))
-        elif requested_tokens > remaining_session_tokens:
-            warnings.append(f"Capping tokens to remaining session budget ({remaining_session_tokens})")
-            modified = remaining_session_tokens
+            )], [], None
         
-        return violations, warnings, modified
+        request_cap = policy.max_tokens_per_request
+        cap = min(requested_tokens, request_cap, session_cap)
+        if cap == requested_tokens:
+            return [], [], None
+        
+        # Report whichever bound applied
+        if session_cap < request_cap:
+            warning = f"Capping tokens to remaining session budget ({session_cap})"
+        else:
+            warning = f"Requested tokens ({requested_tokens}) exceeds max ({request_cap}), capping"
+        return [], [warning], cap
     
     def _check_temperature(
         self,
         temperature: float,
         policy: Policy
-    ) -> tuple:
+    ) -> Tuple[List[PolicyViolation], Optional[float]]:
         """Check temperature bounds."""
-        violations = []
-        modified = None
+        violations: List[PolicyViolation] = []
+        modified: Optional[float] = None
         
         if temperature < policy.min_temperature:
             violations.append(PolicyViolation(
@@ -7,6 +7,9 @@ Each provider must implement the BaseProvider interface.
 Current Providers:
     - GeminiProvider: Google Gemini (primary)
 
+Wrappers:
+    - CachedProvider: semantic response cache around any provider
+
 Future Providers (TODO):
     - OpenAIProvider: OpenAI GPT models
     - ClaudeProvider: Anthropic Claude
@@ -25,6 +28,7 @@ from .base import (
     ProviderAuthError,
 )
 from .gemini import GeminiProvider
+from .cached import CachedProvider
 
 __all__ = [
     'BaseProvider',
@@ -37,4 +41,5 @@ __all__ = [
     'ProviderTimeoutError',
     'ProviderAuthError',
     'GeminiProvider',
+    'CachedProvider',
 ]
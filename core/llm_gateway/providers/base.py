@@ -11,12 +11,20 @@ Design Intent:
     - Clean error handling
 """
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 from enum import Enum
 from datetime import datetime
 
+# Optional: only needed for EmbeddingResponse.to_numpy()
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class ProviderStatus(Enum):
     """Provider health status."""
@@ -26,13 +34,16 @@ class ProviderStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderResponse:
     """
     Standardized response from any LLM provider.
     
     All providers must return this format, regardless of their native response.
     This ensures agents never need to know which provider was used.
+    
+    The creation time is captured as an epoch float; the ISO `timestamp`
+    string is only formatted when something reads it.
     """
     success: bool
     content: str
@@ -46,7 +57,15 @@ class ProviderResponse:
     error: Optional[str] = None
     error_code: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    _created_at: float = field(default_factory=time.time, repr=False)
+    _timestamp: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO creation time (formatted on first access)."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created_at).isoformat()
+        return self._timestamp
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -69,9 +88,9 @@ class ProviderResponse:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingResponse:
-    """Standardized embedding response."""
+    """Standardized embedding response (timestamp is lazy, as above)."""
     success: bool
     embeddings: List[List[float]]
     model: str
@@ -80,12 +99,38 @@ class EmbeddingResponse:
     latency_ms: float = 0.0
     error: Optional[str] = None
     error_code: Optional[str] = None
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    _created_at: float = field(default_factory=time.time, repr=False)
+    _timestamp: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO creation time (formatted on first access)."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created_at).isoformat()
+        return self._timestamp
+    
+    def to_numpy(self) -> "np.ndarray":
+        """
+        Embeddings as a contiguous float32 array of shape (n, dimensions).
+        
+        This is the layout vector indexes and similarity code expect, so
+        consumers can convert once here instead of each re-copying lists.
+        Requires numpy.
+        """
+        if np is None:
+            raise ImportError("numpy is required for EmbeddingResponse.to_numpy()")
+        if not self.embeddings:
+            return np.empty((0, self.dimensions), dtype=np.float32)
+        return np.asarray(self.embeddings, dtype=np.float32)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProviderConfig:
-    """Configuration for provider requests."""
+    """
+    Configuration for provider requests.
+    
+    Immutable so the gateway can share one instance across requests.
+    """
     max_tokens: int = 8192
     temperature: float = 0.7
     top_p: float = 1.0
@@ -130,6 +175,8 @@ class BaseProvider(ABC):
         self._model = model
         self._status = ProviderStatus.UNKNOWN
         self._last_health_check: Optional[datetime] = None
+        # Monotonic time the provider last became UNAVAILABLE
+        self._unavailable_since = 0.0
     
     @property
     def model(self) -> str:
@@ -201,6 +248,65 @@ class BaseProvider(ABC):
         """
         pass
     
+    async def agenerate(
+        self,
+        prompt: str,
+        config: ProviderConfig
+    ) -> ProviderResponse:
+        """
+        Generate a completion without blocking the event loop.
+        
+        The default runs generate() in a worker thread. Providers with a
+        native async client should override this.
+        
+        Args:
+            prompt: The prompt text
+            config: Generation configuration
+            
+        Returns:
+            ProviderResponse with result or error
+        """
+        return await asyncio.to_thread(self.generate, prompt, config)
+    
+    async def agenerate_structured(
+        self,
+        prompt: str,
+        config: ProviderConfig,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> ProviderResponse:
+        """
+        Generate structured JSON output without blocking the event loop.
+        
+        Args:
+            prompt: The prompt text
+            config: Generation configuration
+            schema: Expected JSON schema (optional, for validation hints)
+            
+        Returns:
+            ProviderResponse with JSON content or error
+        """
+        return await asyncio.to_thread(self.generate_structured, prompt, config, schema)
+    
+    async def agenerate_many(
+        self,
+        prompts: List[str],
+        config: ProviderConfig
+    ) -> List[ProviderResponse]:
+        """
+        Generate completions for several prompts concurrently.
+        
+        The requests overlap in flight, so the batch takes roughly as long
+        as its slowest prompt rather than the sum of all of them.
+        
+        Args:
+            prompts: Prompt texts
+            config: Generation configuration shared by every prompt
+            
+        Returns:
+            ProviderResponses in the same order as prompts
+        """
+        return list(await asyncio.gather(*(self.agenerate(p, config) for p in prompts)))
+    
     @abstractmethod
     def health_check(self) -> bool:
         """
@@ -215,6 +321,8 @@ class BaseProvider(ABC):
     
     def _set_status(self, status: ProviderStatus):
         """Update provider status."""
+        if status == ProviderStatus.UNAVAILABLE and self._status != ProviderStatus.UNAVAILABLE:
+            self._unavailable_since = time.monotonic()
         self._status = status
         self._last_health_check = datetime.now()
 
@@ -0,0 +1,266 @@
+"""
+Cached Provider for LLM Gateway.
+
+Semantic response cache that wraps any BaseProvider.
+
+Design Intent:
+    - Repeated or near-duplicate prompts skip the LLM round-trip
+    - Exact repeats are answered without even an embedding call
+    - Only deterministic-enough requests are admitted
+    - Provider-agnostic: the wrapped provider supplies the embeddings
+"""
+
+import operator
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from dataclasses import replace as dc_replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base import (
+    BaseProvider,
+    EmbeddingResponse,
+    ProviderConfig,
+    ProviderResponse,
+)
+
+# Optional vectorized similarity search
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# (model, system_instruction): responses are only reused within a partition
+_PartitionKey = Tuple[str, Optional[str]]
+_EntryKey = Tuple[str, Optional[str], str]
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """Cached response with its unit-length prompt embedding."""
+    partition: _PartitionKey
+    vector: List[float]
+    response: ProviderResponse
+
+
+def admit_low_temperature(prompt: str, config: ProviderConfig) -> bool:
+    """Default admission rule: cache only near-deterministic requests."""
+    return config.temperature < 0.3
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length, so dot product is cosine similarity."""
+    norm = sum(v * v for v in vector) ** 0.5
+    if norm == 0:
+        return list(vector)
+    return [v / norm for v in vector]
+
+
+class CachedProvider(BaseProvider):
+    """
+    Semantic cache in front of another provider.
+
+    On generate(), the prompt is embedded with the wrapped provider and
+    compared against earlier prompts for the same model and system
+    instruction. A stored response is returned when cosine similarity
+    reaches the threshold; otherwise the wrapped provider is called and
+    a successful response is cached.
+
+    Design Rules:
+        - Cache hits report zero tokens (nothing was spent)
+        - Structured output and embeddings pass straight through
+        - Bounded size with least-recently-used eviction
+        - Thread-safe
+    """
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 1024,
+        admit: Callable[[str, ProviderConfig], bool] = admit_low_temperature
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            provider: Provider to wrap
+            similarity_threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum cached responses
+            admit: Predicate deciding whether a request may use the cache
+        """
+        super().__init__(provider._api_key, provider.model)
+        self._provider = provider
+        self._threshold = similarity_threshold
+        self._max_entries = max_entries
+        self._admit = admit
+
+        self._entries: "OrderedDict[_EntryKey, _CacheEntry]" = OrderedDict()
+        self._partitions: Dict[_PartitionKey, List[_EntryKey]] = {}
+        # Stacked vectors per partition, rebuilt after the partition changes
+        self._matrices: Dict[_PartitionKey, Any] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def name(self) -> str:
+        return self._provider.name
+
+    @property
+    def status(self):
+        return self._provider.status
+
+    def generate(
+        self,
+        prompt: str,
+        config: ProviderConfig
+    ) -> ProviderResponse:
+        """
+        Generate a completion, answering from the cache when possible.
+
+        Args:
+            prompt: The prompt text
+            config: Generation configuration
+
+        Returns:
+            ProviderResponse, marked with metadata["cache_hit"] on a hit
+        """
+        if not self._admit(prompt, config):
+            return self._provider.generate(prompt, config)
+
+        start_time = time.perf_counter()
+        partition = (self._provider.model, config.system_instruction)
+        key = (partition[0], partition[1], prompt)
+
+        # Exact repeat: no embedding call needed
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._as_hit(entry.response, 1.0, start_time)
+
+        embedding = self._provider.generate_embedding([prompt])
+        vector = None
+        if embedding.success and embedding.embeddings and embedding.embeddings[0]:
+            vector = _normalize(embedding.embeddings[0])
+            with self._lock:
+                match = self._search(partition, vector)
+                if match is not None:
+                    match_key, similarity = match
+                    self._entries.move_to_end(match_key)
+                    self._hits += 1
+                    return self._as_hit(
+                        self._entries[match_key].response, similarity, start_time
+                    )
+
+        response = self._provider.generate(prompt, config)
+        with self._lock:
+            self._misses += 1
+            if response.success and vector is not None:
+                self._insert(key, _CacheEntry(partition, vector, response))
+        return response
+
+    def generate_structured(
+        self,
+        prompt: str,
+        config: ProviderConfig,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> ProviderResponse:
+        """Generate structured JSON output (not cached)."""
+        return self._provider.generate_structured(prompt, config, schema)
+
+    def generate_embedding(
+        self,
+        texts: List[str]
+    ) -> EmbeddingResponse:
+        """Generate embeddings with the wrapped provider."""
+        return self._provider.generate_embedding(texts)
+
+    def health_check(self) -> bool:
+        """Report the wrapped provider's health."""
+        return self._provider.health_check()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._partitions.clear()
+            self._matrices.clear()
+
+    def _search(
+        self,
+        partition: _PartitionKey,
+        vector: List[float]
+    ) -> Optional[Tuple[_EntryKey, float]]:
+        """Find the most similar cached prompt in a partition (lock held)."""
+        keys = self._partitions.get(partition)
+        if not keys:
+            return None
+
+        if np is not None:
+            matrix = self._matrices.get(partition)
+            if matrix is None:
+                matrix = np.array([self._entries[k].vector for k in keys])
+                self._matrices[partition] = matrix
+            scores = matrix @ np.asarray(vector)
+            best = int(scores.argmax())
+            similarity = float(scores[best])
+        else:
+            similarity, best = max(
+                (sum(map(operator.mul, self._entries[k].vector, vector)), i)
+                for i, k in enumerate(keys)
+            )
+
+        if similarity < self._threshold:
+            return None
+        return keys[best], similarity
+
+    def _insert(self, key: _EntryKey, entry: _CacheEntry):
+        """Store an entry, evicting the least recently used (lock held)."""
+        if key in self._entries:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+        else:
+            self._entries[key] = entry
+            self._partitions.setdefault(entry.partition, []).append(key)
+        self._matrices.pop(entry.partition, None)
+
+        while len(self._entries) > self._max_entries:
+            old_key, old = self._entries.popitem(last=False)
+            keys = self._partitions[old.partition]
+            keys.remove(old_key)
+            if not keys:
+                del self._partitions[old.partition]
+            self._matrices.pop(old.partition, None)
+
+    def _as_hit(
+        self,
+        response: ProviderResponse,
+        similarity: float,
+        start_time: float
+    ) -> ProviderResponse:
+        """Copy of a cached response for the current caller."""
+        return dc_replace(
+            response,
+            tokens_input=0,
+            tokens_output=0,
+            tokens_total=0,
+            latency_ms=(time.perf_counter() - start_time) * 1000,
+            metadata={**response.metadata, "cache_hit": True, "cache_similarity": similarity}
+        )
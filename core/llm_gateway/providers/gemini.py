@@ -11,9 +11,11 @@ Design Intent:
     - Token counting where available
 """
 
+import re
 import time
 import json
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from .base import (
     BaseProvider,
@@ -27,6 +29,95 @@ from .base import (
     ProviderAuthError,
 )
 
+# Optional dependency: checked when a provider is created
+try:
+    from google import genai
+    from google.genai import types
+except ImportError:
+    genai = None
+    types = None
+
+
+# Optional fast JSON parser for structured replies (orjson's decode error
+# subclasses json.JSONDecodeError, so one except clause covers both)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    # One shared decoder (stateless, so safe across threads)
+    _loads = json.JSONDecoder().decode
+
+
+# Metadata for models missing from GeminiProvider.MODELS (limits unknown)
+_DEFAULT_MODEL_META: Mapping[str, Any] = MappingProxyType({"max_tokens": None, "embedding": False})
+
+# Connection pool for the client's httpx transports
+_HTTP_MAX_CONNECTIONS = 64
+_HTTP_MAX_KEEPALIVE = 32
+
+# Distinct schemas whose prompt hints are kept per provider
+_MAX_SCHEMA_HINTS = 64
+
+# Markdown code fence around a JSON reply; the closing fence is optional
+_FENCE_RE = re.compile(r"```[A-Za-z]*[ \t]*\n?(.*?)(?:\n?```)?$", re.DOTALL)
+
+
+# Error categories, matched in one pass over the error text
+_ERROR_RE = re.compile(
+    r"(?P<rate>429|rate[\s_-]?limit|resource[\s_-]?exhausted)"
+    r"|(?P<auth>401|403|auth(?:entication|orized)?)"
+    r"|(?P<timeout>timeout|timed\s?out)",
+    re.IGNORECASE
+)
+_ERROR_PRIORITY = ("rate", "auth", "timeout")
+
+# Category -> (provider status, error code)
+_ERROR_RESPONSES = {
+    "rate": (ProviderStatus.DEGRADED, "RATE_LIMIT"),
+    "auth": (ProviderStatus.UNAVAILABLE, "AUTH_ERROR"),
+    "timeout": (ProviderStatus.DEGRADED, "TIMEOUT"),
+    "other": (ProviderStatus.DEGRADED, "PROVIDER_ERROR"),
+}
+
+
+def _http_options() -> Optional[Any]:
+    """
+    HTTP settings for the google-genai client's pooled httpx clients.
+    
+    Raises the keep-alive pool size so concurrent requests reuse warm
+    connections, and enables HTTP/2 multiplexing when the optional `h2`
+    package is installed. Returns None (library defaults) on google-genai
+    versions whose HttpOptions has no client_args.
+    """
+    if "client_args" not in getattr(types.HttpOptions, "model_fields", {}):
+        return None
+    
+    import httpx  # Installed with google-genai
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    limits = httpx.Limits(
+        max_connections=_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=_HTTP_MAX_KEEPALIVE
+    )
+    return types.HttpOptions(
+        client_args={"limits": limits, "http2": http2},
+        async_client_args={"limits": limits, "http2": http2}
+    )
+
+
+def _classify_error(error_str: str) -> str:
+    """Categorize a provider error message: rate, auth, timeout or other."""
+    found = {m.lastgroup for m in _ERROR_RE.finditer(error_str)}
+    if not found:
+        return "other"
+    # Several categories can appear in one message; keep the old precedence
+    return next(kind for kind in _ERROR_PRIORITY if kind in found)
+
 
 class GeminiProvider(BaseProvider):
     """
@@ -36,28 +127,37 @@ class GeminiProvider(BaseProvider):
     Supports text generation, structured output, and embeddings.
     """
     
-    # Supported models
-    MODELS = {
+    # Supported models (read-only)
+    MODELS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
         # Gemini 3 Family (Preview)
-        "gemini-3-pro-preview": {"max_tokens": 32768, "embedding": False},
-        "gemini-3-flash-preview": {"max_tokens": 32768, "embedding": False},
+        "gemini-3-pro-preview": MappingProxyType({"max_tokens": 32768, "embedding": False}),
+        "gemini-3-flash-preview": MappingProxyType({"max_tokens": 32768, "embedding": False}),
         
         # Gemini 2.5 Family (Stable)
-        "gemini-2.5-flash": {"max_tokens": 65536, "embedding": False},
-        "gemini-2.5-pro": {"max_tokens": 65536, "embedding": False},
-        "gemini-2.5-flash-lite": {"max_tokens": 32768, "embedding": False},
+        "gemini-2.5-flash": MappingProxyType({"max_tokens": 65536, "embedding": False}),
+        "gemini-2.5-pro": MappingProxyType({"max_tokens": 65536, "embedding": False}),
+        "gemini-2.5-flash-lite": MappingProxyType({"max_tokens": 32768, "embedding": False}),
         
         # Gemini 2.0 Family
-        "gemini-2.0-flash": {"max_tokens": 32768, "embedding": False},
-        "gemini-2.0-flash-lite": {"max_tokens": 16384, "embedding": False},
+        "gemini-2.0-flash": MappingProxyType({"max_tokens": 32768, "embedding": False}),
+        "gemini-2.0-flash-lite": MappingProxyType({"max_tokens": 16384, "embedding": False}),
         
         # Latest aliases
-        "gemini-flash-latest": {"max_tokens": 65536, "embedding": False},
-        "gemini-pro-latest": {"max_tokens": 65536, "embedding": False},
-    }
+        "gemini-flash-latest": MappingProxyType({"max_tokens": 65536, "embedding": False}),
+        "gemini-pro-latest": MappingProxyType({"max_tokens": 65536, "embedding": False}),
+    })
     
     EMBEDDING_MODEL = "text-embedding-004"
     
+    # Input context window, in tokens (shared by every model above)
+    INPUT_TOKEN_LIMIT = 1_048_576
+    
+    # Seconds a health probe result is reused before probing again
+    HEALTH_CHECK_TTL = 30.0
+    
+    # Seconds requests fail fast after the provider becomes UNAVAILABLE
+    CIRCUIT_RESET_SECONDS = 30.0
+    
     def __init__(self, api_key: str, model: str = "gemini-2.5-flash"):
         """
         Initialize Gemini provider.
@@ -68,21 +168,31 @@ class GeminiProvider(BaseProvider):
         """
         super().__init__(api_key, model)
         self._client = None
+        # Limits for this model, bound once (unlisted models get the defaults)
+        self._model_meta = self.MODELS.get(model, _DEFAULT_MODEL_META)
+        # id(schema) -> (schema, hint); the stored reference keeps the id
+        # from being reused while the entry exists
+        self._schema_hints: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        # Monotonic time of the last real health probe
+        self._health_checked_at: Optional[float] = None
+        # Prompts up to this many characters cannot exceed the input limit
+        # (a character is at most 4 tokens), so they skip token counting
+        self._safe_prompt_chars = self.INPUT_TOKEN_LIMIT // 4
         self._init_client()
     
     def _init_client(self):
         """Initialize the Gemini client."""
-        try:
-            from google import genai
-            self._client = genai.Client(api_key=self._api_key)
-            self._genai = genai
-            self._set_status(ProviderStatus.HEALTHY)
-        except ImportError:
+        if genai is None:
             raise ProviderError(
                 "google-genai package not installed. Run: pip install google-genai",
                 code="IMPORT_ERROR",
                 provider="gemini"
             )
+        try:
+            self._client = genai.Client(api_key=self._api_key, http_options=_http_options())
+            self._genai = genai
+            self._GenerateContentConfig = types.GenerateContentConfig
+            self._set_status(ProviderStatus.HEALTHY)
         except Exception as e:
             self._set_status(ProviderStatus.UNAVAILABLE)
             raise ProviderAuthError(str(e), "gemini")
@@ -106,107 +216,195 @@ class GeminiProvider(BaseProvider):
         Returns:
             ProviderResponse with result or error
         """
-        start_time = time.time()
+        if self._circuit_open():
+            return self._circuit_open_response()
+        
+        start_time = time.perf_counter()
+        
+        if len(prompt) > self._safe_prompt_chars:
+            try:
+                counted = self._client.models.count_tokens(model=self._model, contents=prompt)
+            except Exception:
+                counted = None  # Fail open; the API enforces the limit anyway
+            rejected = self._reject_oversize(counted, start_time)
+            if rejected is not None:
+                return rejected
         
         try:
-            from google.genai import types
-            
-            # Build generation config
-            gen_config = types.GenerateContentConfig(
-                temperature=config.temperature,
-                max_output_tokens=config.max_tokens,
-                top_p=config.top_p,
-                top_k=config.top_k,
-            )
-            
-            # Add system instruction if provided
-            if config.system_instruction:
-                gen_config.system_instruction = config.system_instruction
-            
-            # Make the request
             response = self._client.models.generate_content(
                 model=self._model,
                 contents=prompt,
-                config=gen_config
+                config=self._build_config(config)
             )
-            
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Extract token counts
-            tokens_input = 0
-            tokens_output = 0
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                tokens_input = getattr(response.usage_metadata, 'prompt_token_count', 0) or 0
-                tokens_output = getattr(response.usage_metadata, 'candidates_token_count', 0) or 0
-            
-            # Extract finish reason
-            finish_reason = "completed"
-            if response.candidates and response.candidates[0].finish_reason:
-                finish_reason = str(response.candidates[0].finish_reason.name)
-            
-            self._set_status(ProviderStatus.HEALTHY)
-            
-            return ProviderResponse(
-                success=True,
-                content=response.text,
+            return self._to_response(response, start_time)
+        except Exception as e:
+            return self._to_error_response(e, start_time)
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        config: ProviderConfig
+    ) -> ProviderResponse:
+        """
+        Generate a completion on the client's native async API.
+        
+        Same result as generate(), without tying up a thread while the
+        request is in flight.
+        """
+        if self._circuit_open():
+            return self._circuit_open_response()
+        
+        start_time = time.perf_counter()
+        
+        if len(prompt) > self._safe_prompt_chars:
+            try:
+                counted = await self._client.aio.models.count_tokens(
+                    model=self._model, contents=prompt
+                )
+            except Exception:
+                counted = None  # Fail open; the API enforces the limit anyway
+            rejected = self._reject_oversize(counted, start_time)
+            if rejected is not None:
+                return rejected
+        
+        try:
+            response = await self._client.aio.models.generate_content(
                 model=self._model,
-                provider=self.name,
-                tokens_input=tokens_input,
-                tokens_output=tokens_output,
-                tokens_total=tokens_input + tokens_output,
-                latency_ms=latency_ms,
-                finish_reason=finish_reason,
+                contents=prompt,
+                config=self._build_config(config)
             )
-            
+            return self._to_response(response, start_time)
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
-            error_str = str(e)
-            
-            # Categorize errors
-            if "429" in error_str or "rate" in error_str.lower():
-                self._set_status(ProviderStatus.DEGRADED)
-                return ProviderResponse(
-                    success=False,
-                    content="",
-                    model=self._model,
-                    provider=self.name,
-                    latency_ms=latency_ms,
-                    error=error_str,
-                    error_code="RATE_LIMIT"
-                )
-            elif "401" in error_str or "403" in error_str or "auth" in error_str.lower():
-                self._set_status(ProviderStatus.UNAVAILABLE)
-                return ProviderResponse(
-                    success=False,
-                    content="",
-                    model=self._model,
-                    provider=self.name,
-                    latency_ms=latency_ms,
-                    error=error_str,
-                    error_code="AUTH_ERROR"
-                )
-            elif "timeout" in error_str.lower():
-                self._set_status(ProviderStatus.DEGRADED)
-                return ProviderResponse(
-                    success=False,
-                    content="",
-                    model=self._model,
-                    provider=self.name,
-                    latency_ms=latency_ms,
-                    error=error_str,
-                    error_code="TIMEOUT"
-                )
-            else:
-                self._set_status(ProviderStatus.DEGRADED)
-                return ProviderResponse(
-                    success=False,
-                    content="",
-                    model=self._model,
-                    provider=self.name,
-                    latency_ms=latency_ms,
-                    error=error_str,
-                    error_code="PROVIDER_ERROR"
-                )
+            return self._to_error_response(e, start_time)
+    
+    def _circuit_open(self) -> bool:
+        """
+        Whether requests should fail fast instead of reaching the API.
+        
+        The circuit opens when the provider becomes UNAVAILABLE (e.g. an
+        auth failure). Once CIRCUIT_RESET_SECONDS have passed, one request
+        is let through as a probe and the window restarts; a successful
+        probe marks the provider HEALTHY and closes the circuit.
+        """
+        if self._status != ProviderStatus.UNAVAILABLE:
+            return False
+        now = time.monotonic()
+        if now - self._unavailable_since < self.CIRCUIT_RESET_SECONDS:
+            return True
+        self._unavailable_since = now
+        return False
+    
+    def _circuit_open_response(self) -> ProviderResponse:
+        """Fast failure returned while the circuit is open."""
+        return ProviderResponse(
+            success=False,
+            content="",
+            model=self._model,
+            provider=self.name,
+            error="Provider unavailable; failing fast until the next probe",
+            error_code="CIRCUIT_OPEN"
+        )
+    
+    def _reject_oversize(
+        self,
+        counted: Any,
+        start_time: float
+    ) -> Optional[ProviderResponse]:
+        """
+        Error response when a counted prompt exceeds the model's input limit.
+        
+        Only very long prompts are counted (see _safe_prompt_chars); for
+        those, rejecting locally saves uploading the prompt just to have
+        the API refuse it.
+        """
+        tokens = getattr(counted, "total_tokens", None)
+        if not tokens or tokens <= self.INPUT_TOKEN_LIMIT:
+            return None
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        return self._error(
+            latency_ms,
+            f"Prompt is {tokens} tokens; {self._model} accepts at most {self.INPUT_TOKEN_LIMIT}",
+            "INPUT_TOO_LARGE",
+            self._status
+        )
+    
+    def _build_config(self, config: ProviderConfig):
+        """Translate a ProviderConfig into a Gemini GenerateContentConfig."""
+        # Cap output at what the model supports, when that is known
+        max_tokens = config.max_tokens
+        model_max = self._model_meta["max_tokens"]
+        if model_max is not None and max_tokens > model_max:
+            max_tokens = model_max
+        
+        gen_config = self._GenerateContentConfig(
+            temperature=config.temperature,
+            max_output_tokens=max_tokens,
+            top_p=config.top_p,
+            top_k=config.top_k,
+        )
+        
+        # Add system instruction if provided
+        if config.system_instruction:
+            gen_config.system_instruction = config.system_instruction
+        
+        return gen_config
+    
+    def _to_response(self, response: Any, start_time: float) -> ProviderResponse:
+        """Convert a Gemini response into a ProviderResponse."""
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        
+        # Extract token counts
+        tokens_input = 0
+        tokens_output = 0
+        if hasattr(response, 'usage_metadata') and response.usage_metadata:
+            tokens_input = getattr(response.usage_metadata, 'prompt_token_count', 0) or 0
+            tokens_output = getattr(response.usage_metadata, 'candidates_token_count', 0) or 0
+        
+        # Extract finish reason
+        finish_reason = "completed"
+        if response.candidates and response.candidates[0].finish_reason:
+            finish_reason = str(response.candidates[0].finish_reason.name)
+        
+        self._set_status(ProviderStatus.HEALTHY)
+        
+        return ProviderResponse(
+            success=True,
+            content=response.text,
+            model=self._model,
+            provider=self.name,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            tokens_total=tokens_input + tokens_output,
+            latency_ms=latency_ms,
+            finish_reason=finish_reason,
+        )
+    
+    def _to_error_response(self, e: Exception, start_time: float) -> ProviderResponse:
+        """Categorize a failed Gemini call into an error ProviderResponse."""
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        error_str = str(e)
+        
+        status, code = _ERROR_RESPONSES[_classify_error(error_str)]
+        return self._error(latency_ms, error_str, code, status)
+    
+    def _error(
+        self,
+        latency_ms: float,
+        error: str,
+        code: str,
+        status: ProviderStatus
+    ) -> ProviderResponse:
+        """Record the provider status and build a failed ProviderResponse."""
+        self._set_status(status)
+        return ProviderResponse(
+            success=False,
+            content="",
+            model=self._model,
+            provider=self.name,
+            latency_ms=latency_ms,
+            error=error,
+            error_code=code
+        )
     
     def generate_structured(
         self,
@@ -225,10 +423,28 @@ class GeminiProvider(BaseProvider):
         Returns:
             ProviderResponse with JSON content
         """
+        structured_prompt, structured_config = self._structured_request(prompt, config, schema)
+        return self._parse_structured(self.generate(structured_prompt, structured_config))
+    
+    async def agenerate_structured(
+        self,
+        prompt: str,
+        config: ProviderConfig,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> ProviderResponse:
+        """Generate structured JSON output on the native async API."""
+        structured_prompt, structured_config = self._structured_request(prompt, config, schema)
+        return self._parse_structured(await self.agenerate(structured_prompt, structured_config))
+    
+    def _structured_request(
+        self,
+        prompt: str,
+        config: ProviderConfig,
+        schema: Optional[Dict[str, Any]]
+    ) -> Tuple[str, ProviderConfig]:
+        """Build the JSON-only prompt and config for a structured request."""
         # Build structured prompt
-        schema_hint = ""
-        if schema:
-            schema_hint = f"\n\nExpected JSON structure:\n```json\n{json.dumps(schema, indent=2)}\n```"
+        schema_hint = self._schema_hint(schema) if schema else ""
         
         structured_prompt = f"""{prompt}{schema_hint}
 
@@ -244,9 +460,28 @@ Respond with valid JSON only. No markdown code blocks, no explanations, just the
             system_instruction=config.system_instruction or "You are a helpful assistant that always responds with valid JSON only."
         )
         
-        # Generate
-        response = self.generate(structured_prompt, structured_config)
+        return structured_prompt, structured_config
+    
+    def _schema_hint(self, schema: Dict[str, Any]) -> str:
+        """
+        Prompt suffix describing the expected JSON, rendered once per schema.
+        
+        Schemas are usually module-level constants passed on every call,
+        so hints are cached by object identity. A schema mutated after
+        first use keeps its original hint; pass a new dict instead.
+        """
+        cached = self._schema_hints.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
         
+        hint = f"\n\nExpected JSON structure:\n```json\n{json.dumps(schema, indent=2)}\n```"
+        if len(self._schema_hints) >= _MAX_SCHEMA_HINTS:
+            self._schema_hints.clear()
+        self._schema_hints[id(schema)] = (schema, hint)
+        return hint
+    
+    def _parse_structured(self, response: ProviderResponse) -> ProviderResponse:
+        """Validate and normalize the JSON content of a structured response."""
         if not response.success:
             return response
         
@@ -256,17 +491,13 @@ Respond with valid JSON only. No markdown code blocks, no explanations, just the
             
             # Remove markdown code blocks if present
             if content.startswith("```"):
-                lines = content.split('\n')
-                if lines[-1].strip() == '```':
-                    content = '\n'.join(lines[1:-1])
-                else:
-                    content = '\n'.join(lines[1:])
+                content = _FENCE_RE.match(content).group(1)
             
             # Validate JSON
-            parsed = json.loads(content)
+            parsed = _loads(content)
             
-            # Store parsed JSON as string for consistency
-            response.content = json.dumps(parsed)
+            # The unwrapped text is now known-valid JSON; keep it as is
+            response.content = content
             response.metadata["parsed_json"] = parsed
             
             return response
@@ -284,30 +515,26 @@ Respond with valid JSON only. No markdown code blocks, no explanations, just the
         """
         Generate embeddings for texts.
         
+        The texts are always sent as one batch request, so callers should
+        batch upstream: one call for many texts amortizes the HTTP round-trip.
+        
         Args:
             texts: List of texts to embed
             
         Returns:
-            EmbeddingResponse with vectors
+            EmbeddingResponse with vectors, one per text
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             result = self._client.models.embed_content(
                 model=self.EMBEDDING_MODEL,
-                contents=texts if len(texts) > 1 else texts[0]
+                contents=texts
             )
             
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
-            # Extract embeddings
-            if hasattr(result, 'embeddings'):
-                if isinstance(result.embeddings, list):
-                    embeddings = [e.values for e in result.embeddings]
-                else:
-                    embeddings = [result.embeddings.values]
-            else:
-                embeddings = [[]]
+            embeddings = [e.values for e in result.embeddings or ()]
             
             dimensions = len(embeddings[0]) if embeddings and embeddings[0] else 0
             
@@ -321,7 +548,7 @@ Respond with valid JSON only. No markdown code blocks, no explanations, just the
             )
             
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
             return EmbeddingResponse(
                 success=False,
                 embeddings=[],
@@ -336,19 +563,25 @@ Respond with valid JSON only. No markdown code blocks, no explanations, just the
         """
         Check if Gemini is operational.
         
-        Uses a minimal request to verify connectivity.
+        Probes the API with a model metadata lookup (no tokens spent) at
+        most once per HEALTH_CHECK_TTL seconds. Calls in between report the
+        current status, which requests also keep up to date.
         """
+        if self._client is None:
+            self._set_status(ProviderStatus.UNAVAILABLE)
+            return False
+        
+        now = time.monotonic()
+        checked_at = self._health_checked_at
+        if checked_at is not None and now - checked_at < self.HEALTH_CHECK_TTL:
+            return self._status == ProviderStatus.HEALTHY
+        
+        self._health_checked_at = now
         try:
-            # Minimal health check - just verify client is configured
-            if self._client is None:
-                self._set_status(ProviderStatus.UNAVAILABLE)
-                return False
-            
-            # Could do a lightweight API call here, but that costs tokens
-            # For now, trust that if client initialized, we're healthy
+            self._client.models.get(model=self._model)
             self._set_status(ProviderStatus.HEALTHY)
             return True
-            
-        except Exception:
-            self._set_status(ProviderStatus.UNAVAILABLE)
+        except Exception as e:
+            status, _ = _ERROR_RESPONSES[_classify_error(str(e))]
+            self._set_status(status)
             return False
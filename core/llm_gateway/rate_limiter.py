@@ -11,15 +11,16 @@ Design Intent:
     - No external dependencies (in-memory)
 """
 
+import array
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from threading import Lock
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitConfig:
     """Rate limit configuration."""
     requests_per_minute: int = 60
@@ -30,9 +31,12 @@ class RateLimitConfig:
     # Per-task limits
     requests_per_task: int = 50
     tokens_per_task: int = 50000
+    
+    # Agents whose counters are kept; least recently seen are dropped
+    max_tracked_agents: int = 10_000
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitResult:
     """Result of rate limit check."""
     allowed: bool
@@ -53,12 +57,24 @@ class RateLimitResult:
         }
 
 
+# [requests, tokens] for a task with no recorded usage (read-only)
+_NO_TASK_USAGE = (0, 0)
+
+# Shared result for allowed checks made with need_stats=False (do not mutate)
+_ALLOWED_RESULT = RateLimitResult(allowed=True)
+
+
 class SlidingWindowCounter:
     """
     Sliding window rate counter.
     
     Uses a sub-window approach for accurate rate limiting
     without storing every request timestamp.
+    
+    Only increment() and the once-per-sub-window advance lock, so the
+    check-then-bump stays exact. Other reads are lock-free: they sum
+    plain integers, and a read racing an increment sees the count from
+    just before or just after it.
     """
     
     def __init__(self, window_seconds: int, max_count: int, sub_windows: int = 10):
@@ -75,69 +91,100 @@ class SlidingWindowCounter:
         self.sub_window_seconds = window_seconds / sub_windows
         self.sub_windows = sub_windows
         
-        self._counts: Dict[int, int] = defaultdict(int)
+        # Ring buffer of sub-window counts. Slots of sub-windows older than
+        # _head are zeroed as _head advances, so the live count is simply
+        # sum(self._slots)
+        self._slots = array.array("q", bytes(8 * sub_windows))
+        self._head = -1
         self._lock = Lock()
+        
+        # Bound once: the clock is read on every check
+        self._now = time.monotonic
     
-    def _get_current_window(self) -> int:
+    def _get_current_window(self, now: Optional[float] = None) -> int:
         """Get current sub-window index."""
-        return int(time.time() / self.sub_window_seconds)
+        if now is None:
+            now = self._now()
+        return int(now / self.sub_window_seconds)
     
-    def _clean_old_windows(self, current_window: int):
-        """Remove expired sub-windows."""
-        cutoff = current_window - self.sub_windows
-        expired = [w for w in self._counts if w <= cutoff]
-        for w in expired:
-            del self._counts[w]
+    def _advance(self, current_window: int):
+        """Zero the slots of sub-windows that have expired (lock held)."""
+        head = self._head
+        if current_window <= head:
+            return
+        if current_window - head >= self.sub_windows:
+            self._slots = array.array("q", bytes(8 * self.sub_windows))
+        else:
+            for window in range(head + 1, current_window + 1):
+                self._slots[window % self.sub_windows] = 0
+        self._head = current_window
     
-    def get_count(self) -> int:
+    def _sum_live(self, current_window: int) -> int:
+        """Sum the live sub-windows, advancing the ring if time moved on."""
+        if current_window > self._head:
+            with self._lock:
+                self._advance(current_window)
+        return sum(self._slots)
+    
+    def get_count(self, now: Optional[float] = None) -> int:
         """Get current count in the sliding window."""
-        with self._lock:
-            current_window = self._get_current_window()
-            self._clean_old_windows(current_window)
-            
-            # Sum counts from all valid sub-windows
-            total = 0
-            for window_id, count in self._counts.items():
-                if window_id > current_window - self.sub_windows:
-                    total += count
-            
-            return total
+        return self._sum_live(self._get_current_window(now))
     
-    def increment(self, amount: int = 1) -> bool:
+    def increment(self, amount: int = 1, now: Optional[float] = None) -> bool:
         """
         Increment the counter.
         
         Args:
             amount: Amount to increment
+            now: time.monotonic() reading shared by the caller
             
         Returns:
             True if increment was allowed
         """
         with self._lock:
-            current_window = self._get_current_window()
-            self._clean_old_windows(current_window)
+            self._advance(self._get_current_window(now))
+            slots = self._slots
             
-            current_count = sum(
-                count for window_id, count in self._counts.items()
-                if window_id > current_window - self.sub_windows
-            )
-            
-            if current_count + amount > self.max_count:
+            if sum(slots) + amount > self.max_count:
                 return False
             
-            self._counts[current_window] += amount
+            slots[self._head % self.sub_windows] += amount
             return True
     
-    def get_remaining(self) -> int:
+    def snapshot(self, now: Optional[float] = None) -> Tuple[int, int, float]:
+        """
+        Read the counter once.
+        
+        Returns:
+            (count, remaining, reset_time) from a single window pass
+        """
+        if now is None:
+            now = self._now()
+        current_window = self._get_current_window(now)
+        count = self._sum_live(current_window)
+        reset_time = (current_window + 1) * self.sub_window_seconds
+        return count, max(0, self.max_count - count), max(0, reset_time - now)
+    
+    def get_remaining(self, now: Optional[float] = None) -> int:
         """Get remaining capacity."""
-        return max(0, self.max_count - self.get_count())
+        return max(0, self.max_count - self.get_count(now))
     
-    def get_reset_time(self) -> float:
+    def get_reset_time(self, now: Optional[float] = None) -> float:
         """Get time until oldest sub-window expires."""
-        current_window = self._get_current_window()
+        if now is None:
+            now = self._now()
+        current_window = self._get_current_window(now)
         oldest_window = current_window - self.sub_windows + 1
         reset_time = oldest_window * self.sub_window_seconds + self.window_seconds
-        return max(0, reset_time - time.time())
+        return max(0, reset_time - now)
+
+
+@dataclass(slots=True)
+class AgentCounters:
+    """Sliding window counters for one agent."""
+    requests_per_minute: SlidingWindowCounter
+    requests_per_hour: SlidingWindowCounter
+    tokens_per_minute: SlidingWindowCounter
 
 
 class RateLimiter:
@@ -156,6 +203,11 @@ class RateLimiter:
         - Clear limit messaging
     """
     
+    # Number of per-task lock stripes (power of two)
+    _TASK_LOCK_STRIPES = 16
+    # Number of per-agent lock stripes for try_acquire (power of two)
+    _AGENT_LOCK_STRIPES = 16
+    
     def __init__(self, config: Optional[RateLimitConfig] = None):
         """
         Initialize the rate limiter.
@@ -165,47 +217,69 @@ class RateLimiter:
         """
         self.config = config or RateLimitConfig()
         
-        # Per-agent counters
-        self._agent_requests_per_minute: Dict[str, SlidingWindowCounter] = {}
-        self._agent_requests_per_hour: Dict[str, SlidingWindowCounter] = {}
-        self._agent_tokens_per_minute: Dict[str, SlidingWindowCounter] = {}
+        # Per-agent counters in least-recently-used order, capped at
+        # config.max_tracked_agents (see _get_agent_counters)
+        self._agents: "OrderedDict[str, AgentCounters]" = OrderedDict()
+        self._agent_locks = tuple(Lock() for _ in range(self._AGENT_LOCK_STRIPES))
         
-        # Per-task counters
-        self._task_requests: Dict[str, int] = defaultdict(int)
-        self._task_tokens: Dict[str, int] = defaultdict(int)
+        # Per-task counters, guarded by striped locks so unrelated tasks
+        # don't contend (see _task_lock). Each entry is [requests, tokens].
+        self._tasks: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        # Tasks with at least one request; a set rather than a counter
+        # because add/discard are atomic under the GIL across lock stripes
+        self._active_tasks: Set[str] = set()
+        self._task_locks = tuple(Lock() for _ in range(self._TASK_LOCK_STRIPES))
         
         # System-wide counter (use self.config, not config)
         self._system_requests_per_minute = SlidingWindowCounter(60, self.config.requests_per_minute * 10)
         
-        self._lock = Lock()
+        # Bound once: the clock is read on every check
+        self._now = time.monotonic
     
-    def _get_agent_counters(self, agent: str) -> Tuple[SlidingWindowCounter, SlidingWindowCounter, SlidingWindowCounter]:
-        """Get or create counters for an agent."""
-        with self._lock:
-            if agent not in self._agent_requests_per_minute:
-                self._agent_requests_per_minute[agent] = SlidingWindowCounter(
-                    60, self.config.requests_per_minute
-                )
-            if agent not in self._agent_requests_per_hour:
-                self._agent_requests_per_hour[agent] = SlidingWindowCounter(
-                    3600, self.config.requests_per_hour
-                )
-            if agent not in self._agent_tokens_per_minute:
-                self._agent_tokens_per_minute[agent] = SlidingWindowCounter(
-                    60, self.config.tokens_per_minute
-                )
-            
-            return (
-                self._agent_requests_per_minute[agent],
-                self._agent_requests_per_hour[agent],
-                self._agent_tokens_per_minute[agent]
-            )
+    def _task_lock(self, task_id: str) -> Lock:
+        """Lock stripe guarding a task's counters."""
+        return self._task_locks[hash(task_id) & (self._TASK_LOCK_STRIPES - 1)]
+    
+    def _agent_lock(self, agent: str) -> Lock:
+        """Lock stripe serializing an agent's try_acquire calls."""
+        return self._agent_locks[hash(agent) & (self._AGENT_LOCK_STRIPES - 1)]
+    
+    def _get_agent_counters(self, agent: str) -> AgentCounters:
+        """
+        Get or create counters for an agent.
+        
+        Lock-free: each OrderedDict operation is atomic under the GIL.
+        Racing first requests share whichever counters setdefault keeps,
+        and a key evicted by another thread between calls is tolerated.
+        An evicted agent simply starts over with fresh windows.
+        """
+        agents = self._agents
+        counters = agents.get(agent)
+        if counters is not None:
+            try:
+                agents.move_to_end(agent)
+            except KeyError:
+                pass
+            return counters
+        
+        counters = agents.setdefault(agent, AgentCounters(
+            SlidingWindowCounter(60, self.config.requests_per_minute),
+            SlidingWindowCounter(3600, self.config.requests_per_hour),
+            SlidingWindowCounter(60, self.config.tokens_per_minute)
+        ))
+        while len(agents) > self.config.max_tracked_agents:
+            try:
+                agents.popitem(last=False)
+            except KeyError:
+                break
+        return counters
     
     def check_limit(
         self,
         agent: str,
         task_id: str,
-        estimated_tokens: int = 0
+        estimated_tokens: int = 0,
+        need_stats: bool = True
     ) -> RateLimitResult:
         """
         Check if a request is within rate limits.
@@ -214,62 +288,129 @@ class RateLimiter:
             agent: Agent name
             task_id: Task identifier
             estimated_tokens: Estimated tokens for this request
+            need_stats: Fill in remaining counts when allowed; if False an
+                allowed check returns a shared, read-only result
+            
+        Returns:
+            RateLimitResult with decision
+        """
+        return self._check(
+            agent, task_id, estimated_tokens,
+            self._get_agent_counters(agent), self._now(), need_stats
+        )
+    
+    def try_acquire(
+        self,
+        agent: str,
+        task_id: str,
+        estimated_tokens: int = 0,
+        need_stats: bool = True
+    ) -> RateLimitResult:
+        """
+        Check limits and, if allowed, count the request in one step.
+        
+        Unlike check_limit() followed by record_request(), concurrent
+        callers for the same agent and task cannot both pass the check
+        for the last permit. Tokens are checked but not reserved; report
+        actual usage with record_tokens() once the request completes.
+        
+        Args:
+            agent: Agent name
+            task_id: Task identifier
+            estimated_tokens: Estimated tokens for this request
+            need_stats: Fill in remaining counts when allowed; if False an
+                allowed check returns a shared, read-only result
             
         Returns:
             RateLimitResult with decision
         """
-        req_per_min, req_per_hour, tok_per_min = self._get_agent_counters(agent)
+        counters = self._get_agent_counters(agent)
+        with self._agent_lock(agent), self._task_lock(task_id):
+            now = self._now()
+            result = self._check(agent, task_id, estimated_tokens, counters, now, need_stats)
+            if result.allowed:
+                self._count_request(counters, task_id, now)
+                if need_stats:
+                    result.remaining_requests = max(0, result.remaining_requests - 1)
+        return result
+    
+    def _check(
+        self,
+        agent: str,
+        task_id: str,
+        estimated_tokens: int,
+        counters: AgentCounters,
+        now: float,
+        need_stats: bool = True
+    ) -> RateLimitResult:
+        """Evaluate every limit at one clock reading."""
+        req_per_min = counters.requests_per_minute
+        req_per_hour = counters.requests_per_hour
+        tok_per_min = counters.tokens_per_minute
         
         # Check requests per minute
-        if req_per_min.get_remaining() <= 0:
-            return RateLimitResult(
-                allowed=False,
-                wait_seconds=req_per_min.get_reset_time(),
-                reason=f"Agent '{agent}' rate limit exceeded (requests/minute)",
-                remaining_requests=0,
-                reset_time=time.time() + req_per_min.get_reset_time()
+        _, minute_remaining, minute_reset = req_per_min.snapshot(now)
+        if minute_remaining <= 0:
+            return self._denied(
+                minute_reset,
+                f"Agent '{agent}' rate limit exceeded (requests/minute)",
+                remaining_requests=0
             )
         
         # Check requests per hour
-        if req_per_hour.get_remaining() <= 0:
-            return RateLimitResult(
-                allowed=False,
-                wait_seconds=req_per_hour.get_reset_time(),
-                reason=f"Agent '{agent}' rate limit exceeded (requests/hour)",
-                remaining_requests=0,
-                reset_time=time.time() + req_per_hour.get_reset_time()
+        _, hour_remaining, hour_reset = req_per_hour.snapshot(now)
+        if hour_remaining <= 0:
+            return self._denied(
+                hour_reset,
+                f"Agent '{agent}' rate limit exceeded (requests/hour)",
+                remaining_requests=0
             )
         
-        # Check tokens per minute
-        if estimated_tokens > 0 and tok_per_min.get_remaining() < estimated_tokens:
-            return RateLimitResult(
-                allowed=False,
-                wait_seconds=tok_per_min.get_reset_time(),
-                reason=f"Agent '{agent}' token limit exceeded (tokens/minute)",
-                remaining_tokens=tok_per_min.get_remaining(),
-                reset_time=time.time() + tok_per_min.get_reset_time()
+        # Check tokens per minute (only read when it can matter)
+        tokens_remaining = 0
+        if estimated_tokens > 0 or need_stats:
+            _, tokens_remaining, tokens_reset = tok_per_min.snapshot(now)
+        if estimated_tokens > 0 and tokens_remaining < estimated_tokens:
+            return self._denied(
+                tokens_reset,
+                f"Agent '{agent}' token limit exceeded (tokens/minute)",
+                remaining_tokens=tokens_remaining
             )
         
         # Check task limits
-        if self._task_requests[task_id] >= self.config.requests_per_task:
+        task_requests, task_tokens = self._tasks.get(task_id, _NO_TASK_USAGE)
+        if task_requests >= self.config.requests_per_task:
             return RateLimitResult(
                 allowed=False,
                 reason=f"Task '{task_id}' has exceeded request limit ({self.config.requests_per_task})",
                 remaining_requests=0
             )
         
-        if self._task_tokens[task_id] + estimated_tokens > self.config.tokens_per_task:
+        if task_tokens + estimated_tokens > self.config.tokens_per_task:
             return RateLimitResult(
                 allowed=False,
                 reason=f"Task '{task_id}' would exceed token limit ({self.config.tokens_per_task})",
-                remaining_tokens=max(0, self.config.tokens_per_task - self._task_tokens[task_id])
+                remaining_tokens=max(0, self.config.tokens_per_task - task_tokens)
             )
         
         # All checks passed
+        if not need_stats:
+            return _ALLOWED_RESULT
         return RateLimitResult(
             allowed=True,
-            remaining_requests=min(req_per_min.get_remaining(), req_per_hour.get_remaining()),
-            remaining_tokens=tok_per_min.get_remaining()
+            remaining_requests=min(minute_remaining, hour_remaining),
+            remaining_tokens=tokens_remaining
+        )
+    
+    @staticmethod
+    def _denied(wait: float, reason: str, **remaining: int) -> RateLimitResult:
+        """Build a window-limit denial; reset_time is wall-clock for callers."""
+        return RateLimitResult(
+            allowed=False,
+            wait_seconds=wait,
+            reason=reason,
+            reset_time=time.time() + wait,
+            **remaining
         )
     
     def record_request(
@@ -286,63 +427,104 @@ class RateLimiter:
             task_id: Task identifier
             tokens_used: Actual tokens used
         """
-        req_per_min, req_per_hour, tok_per_min = self._get_agent_counters(agent)
+        counters = self._get_agent_counters(agent)
+        now = self._now()
         
-        req_per_min.increment(1)
-        req_per_hour.increment(1)
+        with self._task_lock(task_id):
+            self._count_request(counters, task_id, now)
         
-        if tokens_used > 0:
-            tok_per_min.increment(tokens_used)
+        self.record_tokens(agent, task_id, tokens_used, now)
+    
+    def record_tokens(
+        self,
+        agent: str,
+        task_id: str,
+        tokens_used: int,
+        now: Optional[float] = None
+    ):
+        """
+        Record tokens used by a request already counted by try_acquire().
         
-        with self._lock:
-            self._task_requests[task_id] += 1
-            self._task_tokens[task_id] += tokens_used
-            self._system_requests_per_minute.increment(1)
+        Args:
+            agent: Agent name
+            task_id: Task identifier
+            tokens_used: Actual tokens used
+            now: time.monotonic() reading shared by the caller
+        """
+        if tokens_used <= 0:
+            return
+        if now is None:
+            now = self._now()
+        
+        self._get_agent_counters(agent).tokens_per_minute.increment(tokens_used, now)
+        
+        with self._task_lock(task_id):
+            self._tasks[task_id][1] += tokens_used
+    
+    def _count_request(
+        self,
+        counters: AgentCounters,
+        task_id: str,
+        now: float
+    ):
+        """Count one request against every window (task lock held)."""
+        counters.requests_per_minute.increment(1, now)
+        counters.requests_per_hour.increment(1, now)
+        usage = self._tasks[task_id]
+        if usage[0] == 0:
+            self._active_tasks.add(task_id)
+        usage[0] += 1
+        self._system_requests_per_minute.increment(1, now)
     
     def get_agent_stats(self, agent: str) -> Dict[str, Any]:
         """Get rate limit stats for an agent."""
-        req_per_min, req_per_hour, tok_per_min = self._get_agent_counters(agent)
+        counters = self._get_agent_counters(agent)
+        req_per_min = counters.requests_per_minute
+        req_per_hour = counters.requests_per_hour
+        tok_per_min = counters.tokens_per_minute
+        now = self._now()
         
         return {
             "agent": agent,
             "requests_per_minute": {
-                "used": req_per_min.get_count(),
+                "used": req_per_min.get_count(now),
                 "limit": self.config.requests_per_minute,
-                "remaining": req_per_min.get_remaining()
+                "remaining": req_per_min.get_remaining(now)
             },
             "requests_per_hour": {
-                "used": req_per_hour.get_count(),
+                "used": req_per_hour.get_count(now),
                 "limit": self.config.requests_per_hour,
-                "remaining": req_per_hour.get_remaining()
+                "remaining": req_per_hour.get_remaining(now)
             },
             "tokens_per_minute": {
-                "used": tok_per_min.get_count(),
+                "used": tok_per_min.get_count(now),
                 "limit": self.config.tokens_per_minute,
-                "remaining": tok_per_min.get_remaining()
+                "remaining": tok_per_min.get_remaining(now)
             }
         }
     
     def get_task_stats(self, task_id: str) -> Dict[str, Any]:
         """Get rate limit stats for a task."""
+        task_requests, task_tokens = self._tasks.get(task_id, _NO_TASK_USAGE)
         return {
             "task_id": task_id,
             "requests": {
-                "used": self._task_requests[task_id],
+                "used": task_requests,
                 "limit": self.config.requests_per_task,
-                "remaining": max(0, self.config.requests_per_task - self._task_requests[task_id])
+                "remaining": max(0, self.config.requests_per_task - task_requests)
             },
             "tokens": {
-                "used": self._task_tokens[task_id],
+                "used": task_tokens,
                 "limit": self.config.tokens_per_task,
-                "remaining": max(0, self.config.tokens_per_task - self._task_tokens[task_id])
+                "remaining": max(0, self.config.tokens_per_task - task_tokens)
             }
         }
     
     def reset_task(self, task_id: str):
         """Reset counters for a task."""
-        with self._lock:
-            self._task_requests[task_id] = 0
-            self._task_tokens[task_id] = 0
+        with self._task_lock(task_id):
+            self._tasks.pop(task_id, None)
+            self._active_tasks.discard(task_id)
     
     def get_system_stats(self) -> Dict[str, Any]:
         """Get system-wide rate limit stats."""
@@ -351,6 +533,6 @@ class RateLimiter:
                 "used": self._system_requests_per_minute.get_count(),
                 "limit": self.config.requests_per_minute * 10
             },
-            "active_agents": len(self._agent_requests_per_minute),
-            "active_tasks": len([t for t, c in self._task_requests.items() if c > 0])
+            "active_agents": len(self._agents),
+            "active_tasks": len(self._active_tasks)
         }
@@ -29,24 +29,60 @@ Example:
 
 import os
 import json
+import asyncio
+import functools
+import hashlib
 import time
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from threading import BoundedSemaphore, Lock
 
-# Load .env file automatically
+# Optional fast JSON encoder for prompt context (values orjson rejects,
+# e.g. integers beyond 64 bits, fall back to the json module)
 try:
-    from dotenv import load_dotenv
-    # Look for .env in project root
-    env_path = Path(__file__).parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-    else:
-        load_dotenv()  # Try current directory
+    import orjson
+    
+    def _dumps_compact(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(obj)
+    
+    def _dumps_pretty(obj: Any) -> str:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            return json.dumps(obj, indent=2)
 except ImportError:
-    pass  # python-dotenv not installed, rely on system env vars
+    orjson = None
+    
+    def _dumps_compact(obj: Any) -> str:
+        return json.dumps(obj)
+    
+    def _dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+
+@functools.cache
+def _load_env_once():
+    """Load the .env file (if any) when the first provider is created."""
+    try:
+        from dotenv import load_dotenv
+        # Look for .env in project root
+        env_path = Path(__file__).parent.parent / '.env'
+        if env_path.exists():
+            load_dotenv(env_path)
+        else:
+            load_dotenv()  # Try current directory
+    except ImportError:
+        pass  # python-dotenv not installed, rely on system env vars
 
 
 class LLMModel(Enum):
@@ -69,7 +105,18 @@ class LLMModel(Enum):
     GEMINI_PRO_LATEST = "gemini-pro-latest"
 
 
-@dataclass
+_LOGGER = logging.getLogger("LLMProvider")
+
+# genai clients shared by every LLMProvider with the same API key, so
+# providers reuse one connection pool instead of opening their own
+_CLIENT_CACHE: Dict[Tuple[str, int], Any] = {}
+_CLIENT_LOCK = Lock()
+
+# Model id for each enum member; plain strings pass through unchanged
+_MODEL_VALUES: Dict[Any, str] = {m: m.value for m in LLMModel}
+
+
+@dataclass(slots=True)
 class LLMResponse:
     """Structured response from LLM."""
     content: str
@@ -108,7 +155,8 @@ class LLMProvider:
         model: Union[str, LLMModel] = DEFAULT_MODEL,
         temperature: float = DEFAULT_TEMPERATURE,
         max_tokens: int = DEFAULT_MAX_TOKENS,
-        timeout: int = 60
+        timeout: int = 60,
+        max_concurrent: int = 16
     ):
         """
         Initialize the LLM provider.
@@ -119,7 +167,10 @@ class LLMProvider:
             temperature: Sampling temperature
             max_tokens: Maximum response tokens
             timeout: Request timeout in seconds
+            max_concurrent: Maximum generate calls in flight at once
         """
+        # .env also carries settings such as ARCYN_LLM_CACHE, so always load it
+        _load_env_once()
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError(
@@ -128,20 +179,22 @@ class LLMProvider:
             )
         
         # Model configuration
-        if isinstance(model, LLMModel):
-            self.model = model.value
-        else:
-            self.model = model
+        self.model = _MODEL_VALUES.get(model, model)
         
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.timeout = timeout
         
+        # Caps concurrent generate_content calls from this provider
+        self._sem = BoundedSemaphore(max_concurrent)
+        self._max_concurrent = max_concurrent
+        self._async_sem: Optional[asyncio.Semaphore] = None
+        
         # Initialize the Gemini client
         self._init_client()
         
         # Logging
-        self.logger = logging.getLogger("LLMProvider")
+        self.logger = _LOGGER
         
         # Statistics
         self._request_count = 0
@@ -152,13 +205,53 @@ class LLMProvider:
         """Initialize the Gemini client using google-genai package."""
         try:
             from google import genai
-            self._client = genai.Client(api_key=self.api_key)
+            from google.genai import types
             self._genai = genai
+            self._types = types
         except ImportError:
             raise ImportError(
                 "google-genai package not installed. "
                 "Run: pip install google-genai"
             )
+        
+        # One client (and so one pooled HTTP connection set) per key/timeout
+        cache_key = (self.api_key, self.timeout)
+        client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            with _CLIENT_LOCK:
+                client = _CLIENT_CACHE.get(cache_key)
+                if client is None:
+                    client = _CLIENT_CACHE[cache_key] = genai.Client(
+                        api_key=self.api_key,
+                        http_options=types.HttpOptions(timeout=self.timeout * 1000),
+                    )
+        self._client = client
+        
+        # Reused by every call that doesn't override the defaults
+        self._default_config = types.GenerateContentConfig(
+            temperature=self.temperature,
+            max_output_tokens=self.max_tokens,
+        )
+    
+    def _generate_config(
+        self,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str] = None
+    ):
+        """Return the shared default config, or build one for the overrides."""
+        default = self._default_config
+        if (
+            not system
+            and temperature == default.temperature
+            and max_tokens == default.max_output_tokens
+        ):
+            return default
+        return self._types.GenerateContentConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+            system_instruction=system or None,
+        )
     
     def complete(
         self,
@@ -179,52 +272,110 @@ class LLMProvider:
         Returns:
             LLMResponse with content and metadata
         """
-        from google.genai import types
-        
-        # Build config
-        config = types.GenerateContentConfig(
-            temperature=temperature or self.temperature,
-            max_output_tokens=max_tokens or self.max_tokens,
+        config = self._generate_config(
+            temperature or self.temperature,
+            max_tokens or self.max_tokens,
+            system
         )
         
-        # Add system instruction if provided
-        if system:
-            config.system_instruction = system
-        
         try:
-            response = self._client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=config
-            )
-            
-            # Track statistics
-            self._request_count += 1
-            self._last_request_time = time.time()
-            
-            # Extract token count if available
-            tokens = 0
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                tokens = getattr(response.usage_metadata, 'total_token_count', 0)
-            self._total_tokens += tokens
+            with self._sem:
+                response = self._client.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=config
+                )
+            return self._to_response(response)
             
-            # Get finish reason
-            finish_reason = "completed"
-            if response.candidates and response.candidates[0].finish_reason:
-                finish_reason = str(response.candidates[0].finish_reason)
+        except Exception as e:
+            self.logger.error(f"LLM request failed: {str(e)}")
+            raise LLMError(f"Gemini API error: {str(e)}") from e
+    
+    async def async_complete(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> LLMResponse:
+        """
+        Async variant of complete(), using the client's async transport.
+        
+        Concurrency is capped at max_concurrent per provider, as for
+        complete(). Use from a single event loop.
+        
+        Args:
+            prompt: The user prompt
+            system: Optional system instruction
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
             
-            return LLMResponse(
-                content=response.text,
-                model=self.model,
-                tokens_used=tokens,
-                finish_reason=finish_reason,
-                raw_response=response
-            )
+        Returns:
+            LLMResponse with content and metadata
+        """
+        config = self._generate_config(
+            temperature or self.temperature,
+            max_tokens or self.max_tokens,
+            system
+        )
+        if self._async_sem is None:
+            self._async_sem = asyncio.Semaphore(self._max_concurrent)
+        
+        try:
+            async with self._async_sem:
+                response = await self._client.aio.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=config
+                )
+            return self._to_response(response)
             
         except Exception as e:
             self.logger.error(f"LLM request failed: {str(e)}")
             raise LLMError(f"Gemini API error: {str(e)}") from e
     
+    def prewarm(self) -> bool:
+        """
+        Open the client's connection before the first real request.
+        
+        Fetches the model's metadata, which costs no tokens, so the TCP and
+        TLS handshakes are already done when complete() is first called.
+        
+        Returns:
+            True if the endpoint answered
+        """
+        try:
+            self._client.models.get(model=self.model)
+            return True
+        except Exception as e:
+            self.logger.warning(f"LLM prewarm failed: {str(e)}")
+            return False
+    
+    def _to_response(self, response: Any) -> LLMResponse:
+        """Record statistics for a raw Gemini response and wrap it."""
+        # Track statistics
+        self._request_count += 1
+        self._last_request_time = time.time()
+        
+        # Extract token count if available
+        tokens = 0
+        if hasattr(response, 'usage_metadata') and response.usage_metadata:
+            tokens = getattr(response.usage_metadata, 'total_token_count', 0)
+        self._total_tokens += tokens
+        
+        # Get finish reason
+        finish_reason = "completed"
+        if response.candidates and response.candidates[0].finish_reason:
+            finish_reason = str(response.candidates[0].finish_reason)
+        
+        return LLMResponse(
+            content=response.text,
+            model=self.model,
+            tokens_used=tokens,
+            finish_reason=finish_reason,
+            raw_response=response
+        )
+    
     def structured_output(
         self,
         prompt: str,
@@ -266,14 +417,12 @@ Respond with valid JSON only. No markdown, no explanations, just the JSON object
                 # Parse JSON from response
                 content = response.content.strip()
                 
-                # Remove markdown code blocks if present
+                # Remove markdown code blocks if present: drop the opening
+                # fence line (```json) and the closing fence, if any
                 if content.startswith("```"):
-                    lines = content.split('\n')
-                    # Remove first line (```json) and last line (```)
-                    if lines[-1].strip() == '```':
-                        content = '\n'.join(lines[1:-1])
-                    else:
-                        content = '\n'.join(lines[1:])
+                    nl = content.find('\n')
+                    end = content.rfind("```")
+                    content = content[nl + 1:end] if end > nl else content[nl + 1:]
                 
                 return json.loads(content)
                 
@@ -298,7 +447,7 @@ Respond with valid JSON only. No markdown, no explanations, just the JSON object
         Returns:
             LLMResponse with assistant's reply
         """
-        from google.genai import types
+        types = self._types
         
         # Build contents
         contents = []
@@ -311,20 +460,15 @@ Respond with valid JSON only. No markdown, no explanations, just the JSON object
                 parts=[types.Part(text=msg["content"])]
             ))
         
-        config = types.GenerateContentConfig(
-            temperature=self.temperature,
-            max_output_tokens=self.max_tokens,
-        )
-        
-        if system:
-            config.system_instruction = system
+        config = self._generate_config(self.temperature, self.max_tokens, system)
         
         try:
-            response = self._client.models.generate_content(
-                model=self.model,
-                contents=contents,
-                config=config
-            )
+            with self._sem:
+                response = self._client.models.generate_content(
+                    model=self.model,
+                    contents=contents,
+                    config=config
+                )
             
             self._request_count += 1
             
@@ -377,11 +521,11 @@ Respond with valid JSON only. No markdown, no explanations, just the JSON object
             return [e.values for e in result.embeddings]
         except Exception as e:
             self.logger.error(f"Batch embedding failed: {str(e)}")
-            # Fallback to individual embedding
-            embeddings = []
-            for text in texts:
-                embeddings.append(self.embed(text))
-            return embeddings
+            if not texts:
+                return []
+            # Fallback to individual embedding, a few requests at a time
+            with ThreadPoolExecutor(max_workers=min(8, len(texts))) as executor:
+                return list(executor.map(self.embed, texts))
     
     def get_stats(self) -> Dict[str, Any]:
         """Get usage statistics."""
@@ -402,26 +546,13 @@ class LLMError(Exception):
 # Agent-Specific Prompt Builders
 # =============================================================================
 
-class PromptBuilder:
-    """
-    Helper class for building agent-specific prompts.
-    
-    Each agent can use these templates for consistent prompting.
-    """
-    
-    @staticmethod
-    def architect_plan(goal: str, context: Optional[Dict] = None) -> str:
-        """Build prompt for Architect planning."""
-        context_str = ""
-        if context:
-            context_str = f"\nContext:\n{json.dumps(context, indent=2)}"
-        
-        return f"""You are the Architect Agent (A-1) of Arcyn OS.
+# Prompt templates. Each prompt is a static prefix (role, instructions and
+# JSON output shape) followed by the per-call input, so repeated calls for
+# the same agent share a prefix that providers can serve from their prompt
+# cache. Only the input part goes through str.format_map.
+_ARCHITECT_PREFIX = """You are the Architect Agent (A-1) of Arcyn OS.
 
-Your task is to create a structured development plan for the following goal:
-
-Goal: {goal}
-{context_str}
+Your task is to create a structured development plan for the goal given below.
 
 Create a comprehensive plan that includes:
 1. Technology decisions with reasoning (e.g., framework, database, auth method)
@@ -432,40 +563,29 @@ Create a comprehensive plan that includes:
 6. Open questions that need clarification
 
 Output JSON with this structure:
-{{
+{
   "goal": "...",
-  "decisions": {{
-    "framework": {{"choice": "...", "reasoning": "..."}},
-    "database": {{"choice": "...", "reasoning": "..."}}
-  }},
+  "decisions": {
+    "framework": {"choice": "...", "reasoning": "..."},
+    "database": {"choice": "...", "reasoning": "..."}
+  },
   "rejected_options": [
-    {{"category": "...", "option": "...", "reason": "..."}}
+    {"category": "...", "option": "...", "reason": "..."}
   ],
   "milestones": [
-    {{"id": "M1", "name": "...", "description": "...", "tasks": ["T1", "T2"]}}
+    {"id": "M1", "name": "...", "description": "...", "tasks": ["T1", "T2"]}
   ],
   "tasks": [
-    {{"id": "T1", "name": "...", "description": "...", "milestone_id": "M1", "dependencies": [], "effort": "low|medium|high"}}
+    {"id": "T1", "name": "...", "description": "...", "milestone_id": "M1", "dependencies": [], "effort": "low|medium|high"}
   ],
   "execution_order": ["T1", "T2", "..."],
   "architectural_constraints": ["..."],
   "open_questions": ["..."]
-}}"""
-    
-    @staticmethod
-    def builder_code(task: Dict[str, Any], context: Optional[Dict] = None) -> str:
-        """Build prompt for Builder code generation."""
-        context_str = ""
-        if context:
-            context_str = f"\nProject Context:\n{json.dumps(context, indent=2)}"
-        
-        return f"""You are the Builder Agent (F-1) of Arcyn OS.
+}"""
 
-Your task is to generate production-ready code for the following task:
+_BUILDER_PREFIX = """You are the Builder Agent (F-1) of Arcyn OS.
 
-Task: {task.get('name', 'Unknown')}
-Description: {task.get('description', 'No description')}
-{context_str}
+Your task is to generate production-ready code for the task given below.
 
 Requirements:
 1. Generate complete, runnable code
@@ -476,25 +596,20 @@ Requirements:
 6. Add TODO comments for future enhancements
 
 Output JSON with this structure:
-{{
+{
   "files": [
-    {{
+    {
       "path": "relative/path/to/file.py",
       "content": "# Full file content here..."
-    }}
+    }
   ],
   "dependencies": ["package-name"],
   "notes": ["Any important notes about the implementation"]
-}}"""
-    
-    @staticmethod
-    def persona_classify(user_input: str) -> str:
-        """Build prompt for Persona intent classification."""
-        return f"""You are the Persona Agent (S-1) of Arcyn OS.
+}"""
 
-Analyze this user input and classify the intent:
+_PERSONA_PREFIX = """You are the Persona Agent (S-1) of Arcyn OS.
 
-User Input: "{user_input}"
+Analyze the user input given below and classify the intent.
 
 Determine:
 1. Primary intent (build, design, integrate, query, explain, help, unknown)
@@ -505,33 +620,27 @@ Determine:
 6. Risk flags (ambiguity, scope issues, etc.)
 
 Output JSON:
-{{
+{
   "intent": "build|design|integrate|query|explain|help|unknown",
   "confidence": 0.85,
-  "entities": {{
+  "entities": {
     "goal": "...",
     "module": null,
     "agent": null
-  }},
+  },
   "assumptions": ["..."],
   "missing_info": ["..."],
   "risk_flags": [
-    {{"flag": "...", "detail": "...", "mitigation": "..."}}
+    {"flag": "...", "detail": "...", "mitigation": "..."}
   ],
   "route_to": "architect_agent|builder_agent|...",
   "clarification_required": false,
   "clarification_prompt": null
-}}"""
-    
-    @staticmethod
-    def evolution_analyze(observation: Dict[str, Any]) -> str:
-        """Build prompt for Evolution analysis."""
-        return f"""You are the Evolution Agent (S-3) of Arcyn OS.
+}"""
 
-Analyze this system observation and provide strategic recommendations:
+_EVOLUTION_PREFIX = """You are the Evolution Agent (S-3) of Arcyn OS.
 
-Observation:
-{json.dumps(observation, indent=2)}
+Analyze the system observation given below and provide strategic recommendations.
 
 Provide a thorough analysis including:
 1. Architectural risks and concerns
@@ -543,9 +652,9 @@ Provide a thorough analysis including:
 Be critical and strategic, not just safe observations.
 
 Output JSON:
-{{
+{
   "risks": [
-    {{
+    {
       "component": "...",
       "issue": "...",
       "impact": "...",
@@ -553,29 +662,99 @@ Output JSON:
       "risk_level": "low|medium|high|critical",
       "effort_to_fix_now": "low|medium|high",
       "effort_to_fix_later": "low|medium|high"
-    }}
+    }
   ],
   "inefficiencies": [...],
   "architectural_concerns": [...],
   "scalability_limits": [...],
-  "maintenance_forecast": {{
+  "maintenance_forecast": {
     "6_months": "...",
     "12_months": "...",
     "risk_trajectory": "stable|increasing|decreasing"
-  }},
+  },
   "suggested_changes": [
-    {{
+    {
       "title": "...",
       "scope": "...",
       "risk": "low|medium|high",
       "effort": "low|medium|high",
       "priority": "low|medium|high",
       "rationale": "..."
-    }}
+    }
   ],
   "priority": "low|medium|high",
   "confidence": 0.85
-}}"""
+}"""
+
+
+_INPUT_SENTINEL = "\n\nNow process the following input:\n\n"
+
+_ARCHITECT_INPUT = _INPUT_SENTINEL + "Goal: {goal}{context_str}"
+
+_BUILDER_INPUT = _INPUT_SENTINEL + "Task: {name}\nDescription: {description}{context_str}"
+
+_PERSONA_INPUT = _INPUT_SENTINEL + 'User Input: "{user_input}"'
+
+_EVOLUTION_INPUT = _INPUT_SENTINEL + "Observation:\n{observation}"
+
+
+@functools.lru_cache(maxsize=256)
+def _ctx_json(key: str) -> str:
+    """Pretty-print a context from its compact JSON form."""
+    return _dumps_pretty(json.loads(key))
+
+
+def _fmt_ctx(context: Dict[str, Any]) -> str:
+    """Pretty JSON for a context dict, memoized for repeated contexts."""
+    return _ctx_json(_dumps_compact(context))
+
+
+class PromptBuilder:
+    """
+    Helper class for building agent-specific prompts.
+    
+    Each agent can use these templates for consistent prompting.
+    Every prompt starts with the agent's entry in CACHE_PREFIXES.
+    """
+    
+    # Static leading text of each builder's prompts, for prompt caching
+    CACHE_PREFIXES: Dict[str, str] = {
+        "architect_plan": _ARCHITECT_PREFIX,
+        "builder_code": _BUILDER_PREFIX,
+        "persona_classify": _PERSONA_PREFIX,
+        "evolution_analyze": _EVOLUTION_PREFIX,
+    }
+    
+    @staticmethod
+    def architect_plan(goal: str, context: Optional[Dict] = None) -> str:
+        """Build prompt for Architect planning."""
+        context_str = f"\nContext:\n{_fmt_ctx(context)}" if context else ""
+        return _ARCHITECT_PREFIX + _ARCHITECT_INPUT.format_map({
+            "goal": goal,
+            "context_str": context_str
+        })
+    
+    @staticmethod
+    def builder_code(task: Dict[str, Any], context: Optional[Dict] = None) -> str:
+        """Build prompt for Builder code generation."""
+        context_str = f"\nProject Context:\n{_fmt_ctx(context)}" if context else ""
+        return _BUILDER_PREFIX + _BUILDER_INPUT.format_map({
+            "name": task.get('name', 'Unknown'),
+            "description": task.get('description', 'No description'),
+            "context_str": context_str
+        })
+    
+    @staticmethod
+    def persona_classify(user_input: str) -> str:
+        """Build prompt for Persona intent classification."""
+        return _PERSONA_PREFIX + _PERSONA_INPUT.format_map({"user_input": user_input})
+    
+    @staticmethod
+    def evolution_analyze(observation: Dict[str, Any]) -> str:
+        """Build prompt for Evolution analysis."""
+        return _EVOLUTION_PREFIX + _EVOLUTION_INPUT.format_map({
+            "observation": _dumps_pretty(observation)
+        })
 
 
 # =============================================================================
@@ -601,10 +780,84 @@ def get_llm(api_key: Optional[str] = None) -> LLMProvider:
     return _default_provider
 
 
+# Exact-match response cache for complete() and structured(), enabled with
+# ARCYN_LLM_CACHE=1. Hot entries live in-process; every entry is also
+# persisted through Memory so later runs can reuse it until it expires.
+_CACHE_TTL_SECONDS = 3600
+_CACHE_MAX_ENTRIES = 4096
+_response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_response_cache_lock = Lock()
+_cache_memory = None  # Memory backing the cache, created on first use
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("ARCYN_LLM_CACHE") == "1"
+
+
+def _cache_key(*parts: str) -> str:
+    """Memory key for a request: a digest of its parts."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return f"llm_cache_{h.hexdigest()}"
+
+
+def _cache_store():
+    """Memory instance persisting cached responses."""
+    global _cache_memory
+    if _cache_memory is None:
+        from .memory import Memory
+        _cache_memory = Memory()
+    return _cache_memory
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Cached response text for a key, or None if missing or expired."""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is not None:
+            _response_cache.move_to_end(key)
+    if entry is None:
+        stored = _cache_store().read(key)
+        if not isinstance(stored, dict):
+            return None
+        entry = (stored.get("created_at", 0.0), stored.get("response", ""))
+    created_at, response = entry
+    if time.time() - created_at >= _CACHE_TTL_SECONDS:
+        with _response_cache_lock:
+            _response_cache.pop(key, None)
+        return None
+    with _response_cache_lock:
+        _response_cache[key] = entry
+        if len(_response_cache) > _CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+    return response
+
+
+def _cache_put(key: str, response: str) -> None:
+    """Cache a response in-process and persist it."""
+    entry = (time.time(), response)
+    with _response_cache_lock:
+        _response_cache[key] = entry
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > _CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+    _cache_store().write(
+        key,
+        {"created_at": entry[0], "response": response},
+        namespace="llm_cache",
+        source_agent="llm_provider",
+        ttl_seconds=_CACHE_TTL_SECONDS,
+    )
+
+
 def complete(prompt: str, system: Optional[str] = None) -> str:
     """
     Quick completion using default provider.
     
+    Cached when ARCYN_LLM_CACHE=1 (exact prompt, system and model match).
+    
     Args:
         prompt: The prompt
         system: Optional system instruction
@@ -612,13 +865,25 @@ def complete(prompt: str, system: Optional[str] = None) -> str:
     Returns:
         Response content string
     """
-    return get_llm().complete(prompt, system).content
+    llm = get_llm()
+    if not _cache_enabled():
+        return llm.complete(prompt, system).content
+    
+    key = _cache_key("complete", llm.model, system or "", prompt)
+    content = _cache_get(key)
+    if content is None:
+        content = llm.complete(prompt, system).content
+        _cache_put(key, content)
+    return content
 
 
 def structured(prompt: str, schema: Optional[Dict] = None) -> Dict:
     """
     Quick structured output using default provider.
     
+    Cached when ARCYN_LLM_CACHE=1 (exact prompt, schema and model match).
+    Each call returns a fresh dictionary.
+    
     Args:
         prompt: The prompt
         schema: Optional expected schema
@@ -626,4 +891,16 @@ def structured(prompt: str, schema: Optional[Dict] = None) -> Dict:
     Returns:
         Parsed JSON dictionary
     """
-    return get_llm().structured_output(prompt, schema)
+    llm = get_llm()
+    if not _cache_enabled():
+        return llm.structured_output(prompt, schema)
+    
+    key = _cache_key(
+        "structured", llm.model, json.dumps(schema, sort_keys=True, default=str), prompt
+    )
+    cached = _cache_get(key)
+    if cached is not None:
+        return json.loads(cached)
+    result = llm.structured_output(prompt, schema)
+    _cache_put(key, _dumps_compact(result))
+    return result
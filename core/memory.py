@@ -16,14 +16,156 @@ Features:
     - Auto-cleanup of expired entries
 """
 
+import os
 import json
+import atexit
 import sqlite3
+import threading
 import time
 import logging
-from typing import Any, Dict, List, Optional
+import weakref
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 
+# Optional fast JSON encoder (values orjson rejects, e.g. integers beyond
+# 64 bits, fall back to the json module)
+try:
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+    def _dumps_compact(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            return json.dumps(obj, default=str)
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(
+                obj, default=str, option=_ORJSON_OPTS | orjson.OPT_INDENT_2
+            )
+        except TypeError:
+            return json.dumps(obj, indent=2, default=str).encode("utf-8")
+except ImportError:
+    orjson = None
+
+    def _dumps_compact(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, default=str).encode("utf-8")
+
+
+# Seconds between background flushes of queued index rows
+_FLUSH_INTERVAL = 0.1
+
+# Last formatted timestamp as (epoch milliseconds, ISO string)
+_ts_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """Current local time in ISO format, reformatted at most once per millisecond."""
+    global _ts_cache
+    now_ms = time.time_ns() // 1_000_000
+    cached_ms, cached = _ts_cache
+    if now_ms == cached_ms:
+        return cached
+    stamp = datetime.fromtimestamp(now_ms / 1000).isoformat(timespec="milliseconds")
+    _ts_cache = (now_ms, stamp)
+    return stamp
+
+
+# Namespace and agent names are stored once in lookup tables; entries
+# reference them by integer id
+_CREATE_ENTRIES_SQL = """
+    CREATE TABLE IF NOT EXISTS memory_entries (
+        key TEXT PRIMARY KEY,
+        namespace_id INTEGER NOT NULL REFERENCES namespaces(id),
+        source_agent_id INTEGER NOT NULL REFERENCES agents(id),
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        accessed_at TEXT NOT NULL,
+        access_count INTEGER DEFAULT 0,
+        size_bytes INTEGER DEFAULT 0,
+        data_type TEXT DEFAULT 'json',
+        tags TEXT DEFAULT '[]',
+        ttl_seconds INTEGER DEFAULT NULL,
+        metadata TEXT DEFAULT '{}'
+    )
+"""
+
+# Entry rows with names joined back in, as returned by search()
+_SELECT_ENTRIES = """
+    SELECT e.key, n.name AS namespace, a.name AS source_agent,
+           e.created_at, e.updated_at, e.accessed_at, e.access_count,
+           e.size_bytes, e.data_type, e.tags, e.ttl_seconds, e.metadata
+"""
+_ENTRY_JOINS = """
+    JOIN namespaces n ON n.id = e.namespace_id
+    JOIN agents a ON a.id = e.source_agent_id
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO memory_entries
+        (key, namespace_id, source_agent_id, created_at, updated_at,
+         accessed_at, access_count, size_bytes, tags, ttl_seconds, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        updated_at = ?,
+        accessed_at = ?,
+        size_bytes = ?,
+        tags = ?,
+        metadata = ?
+"""
+
+_TOUCH_SQL = """
+    UPDATE memory_entries
+    SET accessed_at = ?, access_count = access_count + ?
+    WHERE key = ?
+"""
+
+# Buffered access updates that trigger an immediate flush
+_TOUCH_FLUSH_ENTRIES = 1000
+
+
+# Resolved storage directory -> keys with a JSON file there
+_KEY_SETS: Dict[Path, Set[str]] = {}
+_KEY_SETS_LOCK = threading.Lock()
+
+
+def _shared_key_set(storage_path: Path) -> Set[str]:
+    """Key set for a directory, scanned once per process."""
+    path = storage_path.resolve()
+    with _KEY_SETS_LOCK:
+        keys = _KEY_SETS.get(path)
+        if keys is None:
+            keys = _KEY_SETS[path] = {p.stem for p in path.glob("*.json")}
+        return keys
+
+
+# Open instances, closed at interpreter exit so queued index rows are kept
+_OPEN_MEMORIES: "weakref.WeakSet[Memory]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_memories() -> None:
+    """Flush and close every Memory still open at exit."""
+    for memory in list(_OPEN_MEMORIES):
+        memory.close()
+
+
+def _flush_loop(memory_ref: "weakref.ref[Memory]", stop: threading.Event) -> None:
+    """Periodically flush a Memory's queued index rows until it closes."""
+    while not stop.wait(_FLUSH_INTERVAL):
+        memory = memory_ref()
+        if memory is None:
+            return
+        memory.flush()
+        del memory
+
 
 class Memory:
     """
@@ -32,6 +174,20 @@ class Memory:
     Provides a read-through cache backed by JSON files and an optional
     SQLite database for metadata, search, and structured queries.
 
+    JSON files are written synchronously and atomically (temp file, then
+    rename) but not fsynced; checkpoint() makes everything written so far
+    durable. SQLite index rows and read access updates are queued and
+    committed in batches by a background thread (every 100ms), by flush(),
+    or before any query that reads the index. Queued rows are also drained
+    when the instance is garbage collected or the interpreter exits, so
+    close() is optional.
+
+    Instances on the same directory share one set of known keys, used by
+    exists() and the file-only search. With the database enabled,
+    list_keys() and get_stats() are answered from the index, which other
+    processes on the same directory also write; without it they scan the
+    directory.
+
     Example:
         >>> mem = Memory("./memory")
         >>> mem.write("plan_001", {"goal": "Build API"}, namespace="architect")
@@ -42,23 +198,54 @@ class Memory:
         [{"key": "plan_001", ...}]
     """
 
-    def __init__(self, storage_path: Optional[str] = None, enable_db: bool = True):
+    def __init__(self, storage_path: Optional[str] = None, enable_db: bool = True,
+                 cache_max_entries: int = 1024,
+                 cache_max_bytes: int = 256 * 1024 * 1024):
         """
         Initialize the memory manager.
 
         Args:
             storage_path: Path to storage directory. Defaults to ./memory/
             enable_db: Whether to enable SQLite metadata database
+            cache_max_entries: Maximum entries kept in the in-memory cache
+            cache_max_bytes: Maximum serialized size of cached entries
         """
         self.storage_path = Path(storage_path) if storage_path else Path("./memory")
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        self._cache: Dict[str, Any] = {}
+
+        # Keys with a JSON file, shared by every instance on this directory
+        self._keys = _shared_key_set(self.storage_path)
+        # Keys written since the last checkpoint()
+        self._unsynced: Set[str] = set()
+
+        # LRU read cache, bounded by entry count and by serialized size
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cache_sizes: Dict[str, int] = {}
+        self._cache_bytes = 0
+        self._cache_max_entries = cache_max_entries
+        self._cache_max_bytes = cache_max_bytes
+        self._cache_hits = 0
+        self._cache_misses = 0
+
         self._db_enabled = enable_db
         self._db: Optional[sqlite3.Connection] = None
+        self._fts = False
+        # Lookup table -> {name: id}, filled as names are first written
+        self._name_id_cache: Dict[str, Dict[str, int]] = {"namespaces": {}, "agents": {}}
         self.logger = logging.getLogger("arcyn.memory")
 
+        # Index rows waiting for the next batched commit (see flush)
+        self._pending: Deque[Tuple] = deque()
+        # key -> [last access time (epoch seconds), reads since last flush]
+        self._touch_pending: Dict[str, List] = {}
+        self._touch_lock = threading.Lock()
+        self._db_lock = threading.RLock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
         if self._db_enabled:
             self._init_db()
+        _OPEN_MEMORIES.add(self)
 
     def _init_db(self) -> None:
         """Initialize SQLite metadata database."""
@@ -66,37 +253,119 @@ class Memory:
             db_path = self.storage_path / "memory_index.db"
             self._db = sqlite3.connect(str(db_path), check_same_thread=False)
             self._db.row_factory = sqlite3.Row
-            self._db.execute("""
-                CREATE TABLE IF NOT EXISTS memory_entries (
-                    key TEXT PRIMARY KEY,
-                    namespace TEXT DEFAULT 'default',
-                    source_agent TEXT DEFAULT 'unknown',
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    accessed_at TEXT NOT NULL,
-                    access_count INTEGER DEFAULT 0,
-                    size_bytes INTEGER DEFAULT 0,
-                    data_type TEXT DEFAULT 'json',
-                    tags TEXT DEFAULT '[]',
-                    ttl_seconds INTEGER DEFAULT NULL,
-                    metadata TEXT DEFAULT '{}'
+            # WAL + NORMAL sync: commits no longer fsync the main database
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA temp_store=MEMORY")
+            self._db.execute("PRAGMA mmap_size=268435456")
+            for table in ("namespaces", "agents"):
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)"
                 )
-            """)
+            self._migrate_legacy_names()
+            self._db.execute(_CREATE_ENTRIES_SQL)
             self._db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_namespace ON memory_entries(namespace)
+                CREATE INDEX IF NOT EXISTS idx_namespace ON memory_entries(namespace_id)
             """)
             self._db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_source_agent ON memory_entries(source_agent)
+                CREATE INDEX IF NOT EXISTS idx_source_agent ON memory_entries(source_agent_id)
             """)
             self._db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_created_at ON memory_entries(created_at)
             """)
+            self._fts = self._init_fts()
             self._db.commit()
         except Exception as e:
             self.logger.warning(f"SQLite init failed, falling back to file-only: {e}")
             self._db_enabled = False
             self._db = None
 
+    def _migrate_legacy_names(self) -> None:
+        """Convert an index with TEXT namespace/source_agent columns to ids."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(memory_entries)")}
+        if "namespace" not in columns:
+            return
+        self.logger.info("Migrating memory index to namespace/agent lookup tables")
+        self._db.execute("""
+            INSERT OR IGNORE INTO namespaces(name)
+            SELECT DISTINCT COALESCE(namespace, 'default') FROM memory_entries
+        """)
+        self._db.execute("""
+            INSERT OR IGNORE INTO agents(name)
+            SELECT DISTINCT COALESCE(source_agent, 'unknown') FROM memory_entries
+        """)
+        # Row ids change, so the key index is dropped and rebuilt by _init_fts
+        for trigger in ("memory_fts_insert", "memory_fts_delete"):
+            self._db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        self._db.execute("DROP TABLE IF EXISTS memory_fts")
+        for index in ("idx_namespace", "idx_source_agent", "idx_created_at"):
+            self._db.execute(f"DROP INDEX IF EXISTS {index}")
+        self._db.execute("ALTER TABLE memory_entries RENAME TO memory_entries_legacy")
+        self._db.execute(_CREATE_ENTRIES_SQL)
+        self._db.execute("""
+            INSERT INTO memory_entries
+                (key, namespace_id, source_agent_id, created_at, updated_at,
+                 accessed_at, access_count, size_bytes, data_type, tags,
+                 ttl_seconds, metadata)
+            SELECT l.key, n.id, a.id, l.created_at, l.updated_at,
+                   l.accessed_at, l.access_count, l.size_bytes, l.data_type, l.tags,
+                   l.ttl_seconds, l.metadata
+            FROM memory_entries_legacy l
+            JOIN namespaces n ON n.name = COALESCE(l.namespace, 'default')
+            JOIN agents a ON a.name = COALESCE(l.source_agent, 'unknown')
+        """)
+        self._db.execute("DROP TABLE memory_entries_legacy")
+
+    def _name_ids(self, table: str, names: Iterable[str]) -> Dict[str, int]:
+        """Map names to lookup-table ids, adding new names (lock held)."""
+        ids = self._name_id_cache[table]
+        missing = [name for name in set(names) if name not in ids]
+        if missing:
+            self._db.executemany(
+                f"INSERT OR IGNORE INTO {table}(name) VALUES (?)",
+                [(name,) for name in missing]
+            )
+            for name in missing:
+                ids[name] = self._db.execute(
+                    f"SELECT id FROM {table} WHERE name = ?", (name,)
+                ).fetchone()[0]
+        return ids
+
+    def _init_fts(self) -> bool:
+        """Create the trigram key index used by search(), if SQLite has FTS5."""
+        try:
+            exists = self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'memory_fts'"
+            ).fetchone()
+            self._db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+                    key, content='memory_entries', content_rowid='rowid',
+                    tokenize='trigram'
+                )
+            """)
+            # Keys never change once inserted, so inserts and deletes suffice
+            self._db.execute("""
+                CREATE TRIGGER IF NOT EXISTS memory_fts_insert
+                AFTER INSERT ON memory_entries BEGIN
+                    INSERT INTO memory_fts(rowid, key) VALUES (new.rowid, new.key);
+                END
+            """)
+            self._db.execute("""
+                CREATE TRIGGER IF NOT EXISTS memory_fts_delete
+                AFTER DELETE ON memory_entries BEGIN
+                    INSERT INTO memory_fts(memory_fts, rowid, key)
+                    VALUES ('delete', old.rowid, old.key);
+                END
+            """)
+            if not exists:
+                # Index rows written before the FTS table existed
+                self._db.execute("INSERT INTO memory_fts(memory_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            self.logger.info(f"FTS5 trigram index unavailable, search will scan: {e}")
+            return False
+
     def write(self, key: str, data: Any, namespace: str = "default",
               source_agent: str = "unknown", tags: Optional[List[str]] = None,
               ttl_seconds: Optional[int] = None,
@@ -117,42 +386,20 @@ class Memory:
             True if successful, False otherwise
         """
         try:
+            payload = _dumps_pretty(data)
+
             # Store in cache
-            self._cache[key] = data
+            self._cache_put(key, data, len(payload))
 
             # Write JSON file
-            file_path = self.storage_path / f"{key}.json"
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=str)
+            self._write_file(key, payload)
 
-            # Update SQLite index
+            # Queue the SQLite index update
             if self._db:
-                now = datetime.now().isoformat()
-                serialized_data = json.dumps(data, default=str)
-                self._db.execute("""
-                    INSERT INTO memory_entries
-                        (key, namespace, source_agent, created_at, updated_at,
-                         accessed_at, access_count, size_bytes, tags, ttl_seconds, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
-                    ON CONFLICT(key) DO UPDATE SET
-                        updated_at = ?,
-                        accessed_at = ?,
-                        size_bytes = ?,
-                        tags = ?,
-                        metadata = ?
-                """, (
-                    key, namespace, source_agent, now, now, now,
-                    len(serialized_data),
-                    json.dumps(tags or []),
-                    ttl_seconds,
-                    json.dumps(metadata or {}),
-                    # ON CONFLICT params
-                    now, now,
-                    len(serialized_data),
-                    json.dumps(tags or []),
-                    json.dumps(metadata or {}),
+                self._pending.append(self._index_row(
+                    key, len(payload), namespace, source_agent, tags, ttl_seconds, metadata
                 ))
-                self._db.commit()
+                self._start_flusher()
 
             return True
 
@@ -160,6 +407,176 @@ class Memory:
             self.logger.error(f"Memory write failed for key '{key}': {e}")
             return False
 
+    def write_many(self, entries: Iterable[Tuple[str, Any]], namespace: str = "default",
+                   source_agent: str = "unknown", tags: Optional[List[str]] = None,
+                   ttl_seconds: Optional[int] = None,
+                   metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Write several entries, indexing them in a single transaction.
+
+        Args:
+            entries: (key, data) pairs
+            namespace: Namespace shared by all entries
+            source_agent: ID of the agent writing the data
+            tags: Optional tags for every entry
+            ttl_seconds: Optional time-to-live in seconds
+            metadata: Optional additional metadata
+
+        Returns:
+            True if every entry was written, False otherwise
+        """
+        try:
+            rows = []
+            for key, data in entries:
+                payload = _dumps_pretty(data)
+                self._cache_put(key, data, len(payload))
+                self._write_file(key, payload)
+                if self._db:
+                    rows.append(self._index_row(
+                        key, len(payload), namespace, source_agent, tags, ttl_seconds,
+                        metadata
+                    ))
+
+            if rows:
+                self._pending.extend(rows)
+                self.flush()
+
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Memory write_many failed: {e}")
+            return False
+
+    def _write_file(self, key: str, payload: bytes) -> None:
+        """Replace a key's JSON file atomically, so readers never see a partial file."""
+        file_path = self.storage_path / f"{key}.json"
+        tmp_path = file_path.with_name(
+            f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._keys.add(key)
+        self._unsynced.add(key)
+
+    def checkpoint(self) -> int:
+        """
+        Make every JSON file written so far durable, and commit the index.
+
+        Fsyncs each file written since the last checkpoint, then the
+        storage directory so the renames themselves survive a crash.
+
+        Returns:
+            Number of files synced
+        """
+        keys, self._unsynced = self._unsynced, set()
+        synced = 0
+        for key in keys:
+            try:
+                fd = os.open(self.storage_path / f"{key}.json", os.O_RDONLY)
+            except FileNotFoundError:
+                continue  # deleted since it was written
+            try:
+                os.fsync(fd)
+                synced += 1
+            finally:
+                os.close(fd)
+
+        # Directory fsync is POSIX-only; Windows cannot open directories
+        try:
+            dir_fd = os.open(self.storage_path, os.O_RDONLY)
+        except OSError:
+            dir_fd = None
+        if dir_fd is not None:
+            try:
+                os.fsync(dir_fd)
+            except OSError:
+                pass
+            finally:
+                os.close(dir_fd)
+
+        self.flush()
+        return synced
+
+    def _index_row(self, key: str, size_bytes: int, namespace: str, source_agent: str,
+                   tags: Optional[List[str]], ttl_seconds: Optional[int],
+                   metadata: Optional[Dict[str, Any]]) -> Tuple:
+        """Build the parameters of one _UPSERT_SQL row (size_bytes: file size)."""
+        now = _now_iso()
+        tags_json = _dumps_compact(tags or [])
+        metadata_json = _dumps_compact(metadata or {})
+        return (
+            key, namespace, source_agent, now, now, now,
+            size_bytes, tags_json, ttl_seconds, metadata_json,
+            # ON CONFLICT params
+            now, now, size_bytes, tags_json, metadata_json,
+        )
+
+    def flush(self) -> None:
+        """Commit queued index rows and access updates in one transaction."""
+        with self._db_lock:
+            if not self._db or not (self._pending or self._touch_pending):
+                return
+            rows = []
+            try:
+                while True:
+                    rows.append(self._pending.popleft())
+            except IndexError:
+                pass
+            with self._touch_lock:
+                touches, self._touch_pending = self._touch_pending, {}
+            try:
+                if rows:
+                    ns_ids = self._name_ids("namespaces", (row[1] for row in rows))
+                    agent_ids = self._name_ids("agents", (row[2] for row in rows))
+                    self._db.executemany(_UPSERT_SQL, [
+                        (row[0], ns_ids[row[1]], agent_ids[row[2]]) + row[3:]
+                        for row in rows
+                    ])
+                if touches:
+                    self._db.executemany(_TOUCH_SQL, [
+                        (
+                            datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"),
+                            count, key
+                        )
+                        for key, (ts, count) in touches.items()
+                    ])
+                self._db.commit()
+            except Exception as e:
+                # Undo the partial batch and queue it again for the next flush
+                self._db.rollback()
+                for ids in self._name_id_cache.values():
+                    ids.clear()
+                self._pending.extendleft(reversed(rows))
+                with self._touch_lock:
+                    for key, (ts, count) in touches.items():
+                        entry = self._touch_pending.get(key)
+                        if entry is None:
+                            self._touch_pending[key] = [ts, count]
+                        else:
+                            entry[1] += count
+                self.logger.error(
+                    f"Memory index flush failed ({len(rows)} rows, "
+                    f"{len(touches)} accesses), will retry: {e}"
+                )
+
+    def _start_flusher(self) -> None:
+        """Start the background flush thread on first use."""
+        if self._flusher is not None:
+            return
+        with self._db_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=_flush_loop,
+                    args=(weakref.ref(self), self._stop),
+                    name="memory-flush",
+                    daemon=True,
+                )
+                self._flusher.start()
+
     def read(self, key: str) -> Optional[Any]:
         """
         Read data from memory.
@@ -174,18 +591,22 @@ class Memory:
         """
         # Check cache first
         if key in self._cache:
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
             self._touch(key)
             return self._cache[key]
 
         # Load from disk
+        self._cache_misses += 1
         file_path = self.storage_path / f"{key}.json"
         if file_path.exists():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self._cache[key] = data
-                    self._touch(key)
-                    return data
+                payload = file_path.read_bytes()
+                data = json.loads(payload)
+                self._keys.add(key)
+                self._cache_put(key, data, len(payload))
+                self._touch(key)
+                return data
             except Exception as e:
                 self.logger.error(f"Memory read failed for key '{key}': {e}")
                 return None
@@ -204,17 +625,18 @@ class Memory:
         """
         try:
             # Remove from cache
-            self._cache.pop(key, None)
+            self._cache_drop(key)
 
             # Remove file
-            file_path = self.storage_path / f"{key}.json"
-            if file_path.exists():
-                file_path.unlink()
+            self._keys.discard(key)
+            (self.storage_path / f"{key}.json").unlink(missing_ok=True)
 
-            # Remove from DB
+            # Remove from DB (flushing first so a queued row can't revive it)
             if self._db:
-                self._db.execute("DELETE FROM memory_entries WHERE key = ?", (key,))
-                self._db.commit()
+                with self._db_lock:
+                    self.flush()
+                    self._db.execute("DELETE FROM memory_entries WHERE key = ?", (key,))
+                    self._db.commit()
 
             return True
         except Exception as e:
@@ -231,7 +653,7 @@ class Memory:
         Returns:
             True if data exists, False otherwise
         """
-        if key in self._cache:
+        if key in self._cache or key in self._keys:
             return True
         file_path = self.storage_path / f"{key}.json"
         return file_path.exists()
@@ -253,35 +675,52 @@ class Memory:
 
         if self._db:
             try:
-                query = "SELECT * FROM memory_entries WHERE key LIKE ?"
+                # The trigram index answers LIKE '%...%' without a table scan
+                if self._fts:
+                    query = (
+                        _SELECT_ENTRIES + "FROM memory_fts f "
+                        "JOIN memory_entries e ON e.rowid = f.rowid" + _ENTRY_JOINS
+                        + "WHERE f.key LIKE ?"
+                    )
+                else:
+                    query = (
+                        _SELECT_ENTRIES + "FROM memory_entries e" + _ENTRY_JOINS
+                        + "WHERE e.key LIKE ?"
+                    )
                 params: list = [f"%{pattern}%"]
 
                 if namespace:
-                    query += " AND namespace = ?"
+                    query += " AND n.name = ?"
                     params.append(namespace)
 
-                query += " ORDER BY updated_at DESC LIMIT ?"
+                query += " ORDER BY e.updated_at DESC LIMIT ?"
                 params.append(limit)
 
-                cursor = self._db.execute(query, params)
-                for row in cursor:
-                    results.append(dict(row))
+                with self._db_lock:
+                    self.flush()
+                    cursor = self._db.execute(query, params)
+                    for row in cursor:
+                        results.append(dict(row))
 
             except Exception as e:
                 self.logger.error(f"Memory search failed: {e}")
         else:
-            # Fallback: search files
-            for file_path in self.storage_path.glob("*.json"):
-                if pattern.lower() in file_path.stem.lower():
-                    results.append({
-                        "key": file_path.stem,
-                        "size_bytes": file_path.stat().st_size,
-                        "updated_at": datetime.fromtimestamp(
-                            file_path.stat().st_mtime
-                        ).isoformat(),
-                    })
-                    if len(results) >= limit:
-                        break
+            # Fallback: match known keys, stat only the matching files
+            needle = pattern.lower()
+            for key in list(self._keys):
+                if needle not in key.lower():
+                    continue
+                try:
+                    st = (self.storage_path / f"{key}.json").stat()
+                except OSError:
+                    continue
+                results.append({
+                    "key": key,
+                    "size_bytes": st.st_size,
+                    "updated_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
+                })
+                if len(results) >= limit:
+                    break
 
         return results
 
@@ -295,13 +734,19 @@ class Memory:
         Returns:
             List of key strings
         """
-        if self._db and namespace:
+        if self._db:
             try:
-                cursor = self._db.execute(
-                    "SELECT key FROM memory_entries WHERE namespace = ?",
-                    (namespace,)
-                )
-                return [row['key'] for row in cursor]
+                with self._db_lock:
+                    self.flush()
+                    if namespace:
+                        cursor = self._db.execute(
+                            "SELECT key FROM memory_entries WHERE namespace_id = "
+                            "(SELECT id FROM namespaces WHERE name = ?)",
+                            (namespace,)
+                        )
+                    else:
+                        cursor = self._db.execute("SELECT key FROM memory_entries")
+                    return [row['key'] for row in cursor]
             except Exception:
                 pass
 
@@ -317,16 +762,21 @@ class Memory:
         """
         stats: Dict[str, Any] = {
             "cache_entries": len(self._cache),
-            "file_entries": len(list(self.storage_path.glob("*.json"))),
             "db_enabled": self._db_enabled,
         }
 
         if self._db:
             try:
-                cursor = self._db.execute(
-                    "SELECT COUNT(*) as count, SUM(size_bytes) as total_bytes, "
-                    "namespace FROM memory_entries GROUP BY namespace"
-                )
+                with self._db_lock:
+                    self.flush()
+                    stats["file_entries"] = self._db.execute(
+                        "SELECT COUNT(*) FROM memory_entries"
+                    ).fetchone()[0]
+                    cursor = self._db.execute(
+                        "SELECT COUNT(*) as count, SUM(e.size_bytes) as total_bytes, "
+                        "n.name as namespace FROM memory_entries e "
+                        "JOIN namespaces n ON n.id = e.namespace_id GROUP BY e.namespace_id"
+                    ).fetchall()
                 namespaces = {}
                 total_entries = 0
                 total_bytes = 0
@@ -344,20 +794,63 @@ class Memory:
             except Exception:
                 pass
 
+        if "file_entries" not in stats:
+            stats["file_entries"] = len(list(self.storage_path.glob("*.json")))
         return stats
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get in-memory cache statistics.
+
+        Returns:
+            Dictionary with entry and byte usage, limits, and hit counts
+        """
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cache_bytes,
+            "max_entries": self._cache_max_entries,
+            "max_bytes": self._cache_max_bytes,
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+        }
+
+    def _cache_put(self, key: str, data: Any, size_bytes: int) -> None:
+        """Cache an entry, evicting least recently used ones over the limits."""
+        self._cache_drop(key)
+        self._cache[key] = data
+        self._cache_sizes[key] = size_bytes
+        self._cache_bytes += size_bytes
+
+        while len(self._cache) > 1 and (
+            len(self._cache) > self._cache_max_entries
+            or self._cache_bytes > self._cache_max_bytes
+        ):
+            old_key, _ = self._cache.popitem(last=False)
+            self._cache_bytes -= self._cache_sizes.pop(old_key, 0)
+
+    def _cache_drop(self, key: str) -> None:
+        """Remove an entry from the cache, if present."""
+        self._cache.pop(key, None)
+        self._cache_bytes -= self._cache_sizes.pop(key, 0)
+
     def _touch(self, key: str) -> None:
-        """Update access metadata for a key."""
+        """Queue an access metadata update for a key (applied on flush)."""
         if self._db:
-            try:
-                self._db.execute("""
-                    UPDATE memory_entries
-                    SET accessed_at = ?, access_count = access_count + 1
-                    WHERE key = ?
-                """, (datetime.now().isoformat(), key))
-                self._db.commit()
-            except Exception:
-                pass
+            now = time.time()
+            with self._touch_lock:
+                entry = self._touch_pending.get(key)
+                if entry is None:
+                    self._touch_pending[key] = [now, 1]
+                else:
+                    entry[0] = now
+                    entry[1] += 1
+                backlog = len(self._touch_pending)
+            if backlog >= _TOUCH_FLUSH_ENTRIES:
+                self.flush()
+            else:
+                self._start_flusher()
 
     def cleanup_expired(self) -> int:
         """
@@ -369,10 +862,12 @@ class Memory:
         removed = 0
         if self._db:
             try:
-                cursor = self._db.execute("""
-                    SELECT key, created_at, ttl_seconds FROM memory_entries
-                    WHERE ttl_seconds IS NOT NULL
-                """)
+                with self._db_lock:
+                    self.flush()
+                    cursor = self._db.execute("""
+                        SELECT key, created_at, ttl_seconds FROM memory_entries
+                        WHERE ttl_seconds IS NOT NULL
+                    """).fetchall()
                 now = time.time()
                 for row in cursor:
                     created = datetime.fromisoformat(row['created_at']).timestamp()
@@ -385,7 +880,20 @@ class Memory:
         return removed
 
     def close(self) -> None:
-        """Close database connection."""
-        if self._db:
-            self._db.close()
-            self._db = None
+        """Sync written files, flush queued index rows and close the database."""
+        self._stop.set()
+        _OPEN_MEMORIES.discard(self)
+        self.checkpoint()
+        with self._db_lock:
+            if self._db:
+                self.flush()
+                self._db.close()
+                self._db = None
+
+    def __del__(self) -> None:
+        # Instances dropped without close() still write their queued rows
+        if hasattr(self, "_db_lock"):
+            try:
+                self.close()
+            except Exception:
+                pass
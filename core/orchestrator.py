@@ -22,9 +22,11 @@ Design Constraints:
 
 import sys
 import time
+import queue
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 from datetime import datetime
 
 # Ensure project root is on path
@@ -124,17 +126,25 @@ class Orchestrator:
         'completed'
     """
 
-    def __init__(self, log_level: int = logging.INFO):
+    def __init__(self, log_level: int = logging.INFO, max_concurrency: int = 8,
+                 builder_factory: Optional[Callable[[str], Any]] = None):
         """
         Initialize the Orchestrator with all agents.
 
         Args:
             log_level: Logging level (default: INFO)
+            max_concurrency: Maximum build tasks run at once
+            builder_factory: Creates a builder from an agent_id, for the
+                pipeline and for parallel build workers (default: BuilderAgent)
         """
         self.logger = Logger("orchestrator", log_level=log_level)
+        self.max_concurrency = max(1, max_concurrency)
+        self._builder_factory = builder_factory
         self.memory = Memory()
         self.context = ContextManager("orchestrator")
         self._agents: Dict[str, Any] = {}
+        # Extra builders for parallel build workers (see _worker_builders)
+        self._extra_builders: List[Any] = []
         self._initialized = False
 
         self.logger.info("Orchestrator created")
@@ -161,8 +171,7 @@ class Orchestrator:
             self.logger.warning(f"  ✗ Architect Agent: {e}")
 
         try:
-            from agents.builder import BuilderAgent
-            self._agents['builder'] = BuilderAgent()
+            self._agents['builder'] = self._new_builder("builder_agent")
             self.logger.info("  ✓ Builder Agent (F-1)")
         except Exception as e:
             self.logger.warning(f"  ✗ Builder Agent: {e}")
@@ -431,33 +440,20 @@ class Orchestrator:
                     "task_results": [],
                 }
             else:
-                # Execute each task through the builder
-                task_results = []
+                task_results = self._run_build_tasks(
+                    builder, tasks, self._execution_levels(plan, tasks)
+                )
+
                 files_changed = []
                 warnings = []
-
-                for task in tasks:
-                    task_input = {
-                        "action": "build",
-                        "description": task.get("name", task.get("description", "")),
-                        "target_path": task.get("target_path", ""),
-                    }
-                    try:
-                        task_result = builder.build(task_input)
-                        task_results.append({
-                            "task_id": task.get("id", "unknown"),
-                            "status": "completed",
-                            "result": task_result,
-                        })
-                        files_changed.extend(task_result.get("files_changed", []))
-                        warnings.extend(task_result.get("warnings", []))
-                    except Exception as te:
-                        task_results.append({
-                            "task_id": task.get("id", "unknown"),
-                            "status": "failed",
-                            "error": str(te),
-                        })
-                        warnings.append(f"Task {task.get('id', '?')} failed: {te}")
+                for task, task_result in zip(tasks, task_results):
+                    if task_result["status"] == "completed":
+                        files_changed.extend(task_result["result"].get("files_changed", []))
+                        warnings.extend(task_result["result"].get("warnings", []))
+                    else:
+                        warnings.append(
+                            f"Task {task.get('id', '?')} failed: {task_result['error']}"
+                        )
 
                 result = {
                     "action": "build",
@@ -481,6 +477,124 @@ class Orchestrator:
         result['_stage'] = stage
         return result
 
+    @staticmethod
+    def _execution_levels(plan: Dict[str, Any],
+                          tasks: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group task indices into levels whose tasks can be built concurrently.
+
+        Levels come from plan["task_graph"]["execution_order"] when present,
+        otherwise from the tasks' "dependencies" lists. Without either, each
+        task is its own level, so tasks run one at a time in plan order.
+        """
+        index: Dict[Any, List[int]] = {}
+        for i, task in enumerate(tasks):
+            index.setdefault(task.get("id"), []).append(i)
+
+        order = (plan.get("task_graph") or {}).get("execution_order")
+        if order:
+            levels = [[i for task_id in level for i in index.get(task_id, [])]
+                      for level in order]
+        elif any(isinstance(task.get("dependencies"), list) for task in tasks):
+            levels = []
+            done: Set[Any] = set()
+            remaining = list(range(len(tasks)))
+            while remaining:
+                ready = [
+                    i for i in remaining
+                    if all(dep in done or dep not in index
+                           for dep in tasks[i].get("dependencies") or [])
+                ]
+                if not ready:
+                    # Dependency cycle: build the rest in plan order
+                    levels.extend([i] for i in remaining)
+                    break
+                levels.append(ready)
+                done.update(tasks[i].get("id") for i in ready)
+                remaining = [i for i in remaining if i not in ready]
+        else:
+            return [[i] for i in range(len(tasks))]
+
+        # Tasks missing from the graph are built last, in plan order
+        placed = {i for level in levels for i in level}
+        levels.extend([i] for i in range(len(tasks)) if i not in placed)
+        return [level for level in levels if level]
+
+    def _run_build_tasks(self, builder: Any, tasks: List[Dict[str, Any]],
+                         levels: List[List[int]]) -> List[Dict[str, Any]]:
+        """
+        Build plan tasks level by level, returning results in task order.
+
+        Each level finishes before the next starts. Within a level, tasks
+        run concurrently, except that tasks with the same target_path run
+        in order on one worker so they never race on a file. Each worker
+        has its own builder, since a BuilderAgent's context and history
+        are not thread-safe.
+        """
+        results: List[Any] = [None] * len(tasks)
+        for level in levels:
+            units: Dict[Any, List[int]] = {}
+            for i in level:
+                units.setdefault(tasks[i].get("target_path") or ("", i), []).append(i)
+
+            workers = min(self.max_concurrency, len(units))
+            if workers <= 1:
+                for i in level:
+                    results[i] = self._build_task(builder, tasks[i])
+                continue
+
+            idle: "queue.Queue[Any]" = queue.Queue()
+            for worker_builder in [builder] + self._worker_builders(builder, workers - 1):
+                idle.put(worker_builder)
+
+            def run(unit: List[int]) -> None:
+                worker_builder = idle.get()
+                try:
+                    for i in unit:
+                        results[i] = self._build_task(worker_builder, tasks[i])
+                finally:
+                    idle.put(worker_builder)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(run, units.values()))
+        return results
+
+    def _new_builder(self, agent_id: str) -> Any:
+        """Create a builder through the builder factory."""
+        if self._builder_factory is not None:
+            return self._builder_factory(agent_id)
+        from agents.builder import BuilderAgent
+        return BuilderAgent(agent_id=agent_id)
+
+    def _worker_builders(self, builder: Any, count: int) -> List[Any]:
+        """Extra builders for parallel build workers, created on first use."""
+        base_id = getattr(builder, "agent_id", "builder_agent")
+        while len(self._extra_builders) < count:
+            n = len(self._extra_builders) + 1
+            self._extra_builders.append(self._new_builder(f"{base_id}_worker{n}"))
+        return self._extra_builders[:count]
+
+    @staticmethod
+    def _build_task(builder: Any, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one plan task through the builder, capturing failures."""
+        task_input = {
+            "action": "build",
+            "description": task.get("name", task.get("description", "")),
+            "target_path": task.get("target_path", ""),
+        }
+        try:
+            return {
+                "task_id": task.get("id", "unknown"),
+                "status": "completed",
+                "result": builder.build(task_input),
+            }
+        except Exception as te:
+            return {
+                "task_id": task.get("id", "unknown"),
+                "status": "failed",
+                "error": str(te),
+            }
+
     def validate(self, build_result: Dict[str, Any],
                  plan: Dict[str, Any]) -> Dict[str, Any]:
         """
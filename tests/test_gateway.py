@@ -0,0 +1,846 @@
+"""
+Tests for core.llm_gateway (offline).
+
+Covers:
+    - Pre-flight gate (policy, rate limit, budget)
+    - Request pipeline with a stub provider
+    - Error responses
+
+The provider is replaced with an in-process stub, so no API key or
+network access is needed.
+"""
+
+import asyncio
+import dataclasses
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from core.llm_gateway import gateway as gw_module
+from core.llm_gateway import rate_limiter as rl_module
+from core.llm_gateway.gateway import LLMGateway
+from core.llm_gateway.logger import GatewayLogger
+from core.llm_gateway.policy import Policy, PolicyDecision, PolicyEngine, PolicyViolationType
+from core.llm_gateway.providers import (
+    BaseProvider,
+    CachedProvider,
+    EmbeddingResponse,
+    ProviderConfig,
+    ProviderResponse,
+    ProviderStatus,
+)
+from core.llm_gateway.providers.gemini import GeminiProvider, _classify_error
+from core.llm_gateway.rate_limiter import RateLimitConfig, RateLimiter, SlidingWindowCounter
+
+
+class StubProvider(BaseProvider):
+    """Provider that answers locally and records its calls."""
+
+    def __init__(self, model: str = "gemini-2.5-flash"):
+        super().__init__("stub-key", model)
+        self.calls = []
+        self._set_status(ProviderStatus.HEALTHY)
+
+    @property
+    def name(self) -> str:
+        return "stub"
+
+    def generate(self, prompt: str, config: ProviderConfig) -> ProviderResponse:
+        self.calls.append((prompt, config))
+        return ProviderResponse(
+            success=True,
+            content=f"echo: {prompt}",
+            model=self._model,
+            provider=self.name,
+            tokens_input=10,
+            tokens_output=20,
+            tokens_total=30,
+            latency_ms=1.0,
+        )
+
+    def generate_structured(self, prompt, config, schema=None) -> ProviderResponse:
+        response = self.generate(prompt, config)
+        response.content = '{"ok": true}'
+        response.metadata["parsed_json"] = {"ok": True}
+        return response
+
+    def generate_embedding(self, texts) -> EmbeddingResponse:
+        self.calls.append((texts, None))
+        return EmbeddingResponse(
+            success=True,
+            embeddings=[[0.1, 0.2, 0.3] for _ in texts],
+            model="text-embedding-004",
+            provider=self.name,
+            dimensions=3,
+        )
+
+    def health_check(self) -> bool:
+        return True
+
+
+def _reset_singleton():
+    gw_module._gateway = None
+    LLMGateway._instance = None
+
+
+@pytest.fixture
+def make_gateway(monkeypatch):
+    """Factory building a fresh gateway backed by a StubProvider."""
+    def _install_stub(self):
+        self._provider = StubProvider(self._default_model)
+
+    monkeypatch.setattr(LLMGateway, "_init_provider", _install_stub)
+
+    def _make(**kwargs):
+        _reset_singleton()
+        kwargs.setdefault("api_key", "test-key")
+        return LLMGateway(**kwargs)
+
+    yield _make
+    _reset_singleton()
+
+
+@pytest.fixture
+def gateway(make_gateway):
+    return make_gateway()
+
+
+class TestGatewayRequest:
+    """Tests for the request pipeline."""
+
+    def test_request_success(self, gateway):
+        """A valid request should reach the provider and succeed."""
+        response = gateway.request("Test", "T1", "hello")
+        assert response.success is True
+        assert response.content == "echo: hello"
+        assert response.tokens_total == 30
+        assert response.provider == "stub"
+
+    def test_estimated_cost_matches_tracker(self, gateway):
+        """Cached per-token prices agree with CostTracker.estimate_cost."""
+        response = gateway.request("Test", "T1", "hello")
+        expected = gateway._cost_tracker.estimate_cost(response.model, 10, 20)
+        assert response.estimated_cost_usd == pytest.approx(expected)
+        assert response.estimated_cost_usd > 0
+
+    def test_response_timestamp_lazy(self, gateway):
+        """Responses are slotted and format their timestamp on demand."""
+        response = gateway.request("Test", "T1", "hello")
+        assert not hasattr(response, "__dict__")
+        assert response._timestamp is None
+        assert response.timestamp == response.to_dict()["timestamp"]
+        flat = dict(response)
+        assert flat["content"] == "echo: hello"
+        assert "_created_at" not in flat
+
+    def test_timestamps_share_100ms_bucket(self):
+        """Times in the same 100 ms bucket reuse one formatted string."""
+        base = 1_800_000_000.0
+        first = gw_module._iso_from_epoch(base + 0.01)
+        assert gw_module._iso_from_epoch(base + 0.05) is first
+        later = gw_module._iso_from_epoch(base + 0.15)
+        assert later == datetime.fromtimestamp(base + 0.15).isoformat()
+
+    def test_structured_request(self, gateway):
+        """Structured requests should expose parsed JSON."""
+        response = gateway.request_structured("Test", "T1", "give json", schema={"ok": True})
+        assert response.success is True
+        assert response.parsed_json == {"ok": True}
+
+    def test_arequest_concurrent(self, gateway):
+        """Async requests run the same pipeline and can be gathered."""
+        async def run():
+            return await asyncio.gather(
+                gateway.arequest("Test", "A1", "one"),
+                gateway.arequest("Test", "A2", "two"),
+            )
+        responses = asyncio.run(run())
+        assert [r.content for r in responses] == ["echo: one", "echo: two"]
+        assert gateway.get_budget_status()["budget_tokens"]["used"] == 60
+
+    def test_arequest_denied_skips_provider(self, gateway):
+        """Async requests are gated like sync ones."""
+        response = asyncio.run(gateway.arequest("Intruder", "A1", "hello"))
+        assert response.error_code == "POLICY_DENIED"
+        assert gateway._provider.calls == []
+
+    def test_provider_agenerate_many_keeps_order(self):
+        """Batched provider calls come back in prompt order."""
+        provider = StubProvider()
+        responses = asyncio.run(provider.agenerate_many(["a", "b", "c"], ProviderConfig()))
+        assert [r.content for r in responses] == ["echo: a", "echo: b", "echo: c"]
+
+    def test_embedding_to_numpy(self):
+        """Embeddings convert to a float32 (n, d) array."""
+        np = pytest.importorskip("numpy")
+        response = StubProvider().generate_embedding(["a", "b"])
+        array = response.to_numpy()
+        assert array.shape == (2, 3) and array.dtype == np.float32
+
+    def test_embedding_request(self, gateway):
+        """Embedding requests should return vectors in metadata."""
+        response = gateway.request_embedding("Test", "E1", ["a", "b"])
+        assert response.success is True
+        assert len(response.metadata["embeddings"]) == 2
+
+    def test_single_text_embedding(self, gateway):
+        """A bare string is embedded as a batch of one."""
+        response = gateway.request_embedding("Test", "E1", "solo")
+        assert response.success is True
+        assert gateway._provider.calls[-1][0] == ["solo"]
+        assert len(response.metadata["embeddings"]) == 1
+
+
+class TestGatewayGate:
+    """Tests for the fused pre-flight gate."""
+
+    def test_unauthorized_agent_denied(self, gateway):
+        """Unknown agents are denied before reaching the provider."""
+        response = gateway.request("Intruder", "T1", "hello")
+        assert response.success is False
+        assert response.error_code == "POLICY_DENIED"
+        assert gateway._provider.calls == []
+
+    def test_error_responses_independent(self, gateway):
+        """Error responses built from the same code don't share state."""
+        first = gateway.request("Intruder", "T1", "hello")
+        second = gateway.request("Intruder", "T2", "hello")
+        first.warnings.append("x")
+        assert second.warnings == []
+        assert (second.task_id, second.provider) == ("T2", "stub")
+
+    def test_empty_prompt_denied(self, gateway):
+        """Empty prompts fail policy."""
+        response = gateway.request("Test", "T1", "   ")
+        assert response.error_code == "POLICY_DENIED"
+
+    def test_gate_cached_per_agent(self, gateway):
+        """The gate is compiled once per agent and reused."""
+        gateway.request("Test", "T1", "hello")
+        gate = gateway._gate_cache["Test"]
+        gateway.request("Test", "T2", "hello again")
+        assert gateway._gate_cache["Test"] is gate
+
+    def test_rate_limit_denied(self, gateway):
+        """Exhausted rate limits deny with RATE_LIMIT."""
+        gateway._rate_limiter.config.requests_per_task = 1
+        assert gateway.request("Test", "T1", "one").success is True
+        response = gateway.request("Test", "T1", "two")
+        assert response.error_code == "RATE_LIMIT"
+
+    def test_budget_exhausted_denied(self, gateway):
+        """Requests stop once the session USD budget is used up."""
+        gateway._cost_tracker.session_budget_usd = 0.0
+        response = gateway.request("Test", "T1", "hello")
+        assert response.error_code == "BUDGET_EXHAUSTED"
+        assert gateway._provider.calls == []
+
+    def test_session_token_limit_denied(self, make_gateway):
+        """The policy denies requests once session tokens run out."""
+        gateway = make_gateway(policy=Policy(max_tokens_per_session=30))
+        assert gateway.request("Test", "T1", "first", {"max_tokens": 10}).success is True
+        response = gateway.request("Test", "T2", "second", {"max_tokens": 10})
+        assert response.error_code == "POLICY_DENIED"
+
+    def test_policy_modifications_applied(self, gateway):
+        """Policy caps (e.g. max_tokens) reach the provider config."""
+        gateway.request("Test", "T1", "hello", {"max_tokens": 999_999})
+        _, provider_config = gateway._provider.calls[-1]
+        assert provider_config.max_tokens == gateway._policy_engine.policy.max_tokens_per_request
+
+    def test_provider_config_shared(self, gateway):
+        """Requests with identical settings reuse one frozen ProviderConfig."""
+        gateway.request("Test", "T1", "one", {"temperature": 0.2})
+        gateway.request("Test", "T2", "two", {"temperature": 0.2})
+        (_, first), (_, second) = gateway._provider.calls
+        assert first is second
+        with pytest.raises(AttributeError):
+            first.temperature = 1.0
+
+
+class TestBlockedContent:
+    """Tests for policy content rules."""
+
+    def test_blocked_pattern_denies(self):
+        """A prompt matching any blocked pattern is denied."""
+        engine = PolicyEngine(Policy(blocked_patterns=(r"rm\s+-rf", r"api[_-]?key")))
+        result = engine.evaluate("Test", "T1", "please print the API_KEY", {})
+        assert not result.allowed
+        assert result.violations[0].violation_type is PolicyViolationType.BLOCKED_CONTENT
+        assert result.violations[0].message.endswith("#1")
+
+    def test_clean_prompt_allowed(self):
+        """Prompts without blocked content pass."""
+        engine = PolicyEngine(Policy(blocked_patterns=(r"rm\s+-rf",)))
+        assert engine.evaluate("Test", "T1", "design an API", {}).allowed
+
+    def test_backreference_patterns_kept_separate(self):
+        """Each pattern's backreferences refer to its own groups."""
+        engine = PolicyEngine(Policy(blocked_patterns=(r"(a)\1", r"(b)\1")))
+        result = engine.evaluate("Test", "T1", "xx bb yy", {})
+        assert not result.allowed
+        assert result.violations[0].message.endswith("#1")
+
+    def test_inline_flag_pattern(self):
+        """Patterns may carry their own leading inline flags."""
+        engine = PolicyEngine(Policy(blocked_patterns=("secret", "(?i)password")))
+        assert not engine.evaluate("Test", "T1", "my PASSWORD is", {}).allowed
+        assert engine.evaluate("Test", "T1", "hello", {}).allowed
+
+    def test_invalid_pattern_rejected_at_construction(self):
+        """A pattern that does not compile fails when the policy is built."""
+        with pytest.raises(ValueError, match="#1"):
+            Policy(blocked_patterns=("ok", "(unclosed"))
+
+
+class TestPolicyAgents:
+    """Tests for the authorized agent set."""
+
+    def test_authorized_agents_frozen_and_shared(self):
+        """Defaults are shared; custom sets are frozen on construction."""
+        assert Policy().authorized_agents is Policy().authorized_agents
+        custom = Policy(authorized_agents={"Solo"})
+        assert isinstance(custom.authorized_agents, frozenset)
+        engine = PolicyEngine(custom)
+        assert engine.evaluate("Solo", "T1", "hi", {}).allowed
+        assert not engine.evaluate("Test", "T1", "hi", {}).allowed
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            custom.max_tokens_per_request = 1
+
+    def test_modify_copies_config_only_on_change(self):
+        """Capped values yield MODIFY on a copy; in-bounds values don't."""
+        engine = PolicyEngine(Policy(max_tokens_per_request=100))
+        config = {"max_tokens": 500, "temperature": 0.5}
+        result = engine.evaluate("Test", "T1", "hi", config)
+        assert result.decision == PolicyDecision.MODIFY
+        assert result.modified_config["max_tokens"] == 100
+        assert config["max_tokens"] == 500
+        
+        result = engine.evaluate("Test", "T1", "hi", {"max_tokens": 100, "temperature": 0.5})
+        assert result.decision == PolicyDecision.ALLOW
+        
+        engine = PolicyEngine(Policy(enforce_deterministic=True))
+        result = engine.evaluate("Test", "T1", "hi", {"temperature": 0.0, "top_k": 1})
+        assert result.decision == PolicyDecision.WARN
+
+    @pytest.mark.parametrize("requested,used,cap,warned", [
+        (100, 0, None, None),
+        (500, 0, 200, "exceeds max"),
+        (500, 900, 100, "session budget"),
+        (150, 900, 100, "session budget"),
+    ])
+    def test_token_cap_uses_tightest_bound(self, requested, used, cap, warned):
+        """Tokens are capped to the smaller of the request and session limits."""
+        engine = PolicyEngine(Policy(max_tokens_per_request=200, max_tokens_per_session=1000))
+        violations, warnings, modified = engine._check_tokens(requested, used, engine.policy)
+        assert violations == []
+        assert modified == cap
+        assert (warned in warnings[0]) if warned else warnings == []
+
+    def test_session_token_limit_denies(self):
+        """An exhausted session budget is a violation, not a cap."""
+        engine = PolicyEngine(Policy(max_tokens_per_session=1000))
+        result = engine.evaluate("Test", "T1", "hi", {}, session_tokens_used=1000)
+        assert result.decision == PolicyDecision.DENY
+        assert result.violations[0].violation_type == PolicyViolationType.COST_LIMIT_EXCEEDED
+
+    def test_agent_override_merged_once(self):
+        """Overrides are merged at set time and reused for every request."""
+        engine = PolicyEngine()
+        engine.set_agent_override("Test", {"max_tokens_per_request": 100})
+        merged = engine._get_effective_policy("Test")
+        assert merged is engine._get_effective_policy("Test")
+        result = engine.evaluate("Test", "T1", "hi", {"max_tokens": 500})
+        assert result.modified_config["max_tokens"] == 100
+
+    def test_enum_members_serialize_as_strings(self):
+        """Decision and violation members behave as their string values."""
+        assert PolicyDecision.ALLOW == "allow"
+        assert str(PolicyViolationType.PROMPT_EMPTY) == "prompt_empty"
+        result = PolicyEngine().evaluate("Intruder", "T1", "hi", {})
+        data = json.loads(json.dumps(result.to_dict()))
+        assert data["decision"] == "deny"
+        assert data["violations"][0]["type"] == "agent_not_authorized"
+
+    def test_unauthorized_agent_single_violation(self):
+        """An unauthorized agent is denied with exactly one violation."""
+        result = PolicyEngine().evaluate("Intruder", "T1", "", {"max_tokens": 10**9})
+        assert result.decision == PolicyDecision.DENY
+        assert [v.violation_type for v in result.violations] == [
+            PolicyViolationType.AGENT_NOT_AUTHORIZED
+        ]
+
+
+    @pytest.mark.parametrize("prompt,short", [
+        ("", True), ("   ", True), (" ab ", True), ("abc", False), ("  abc\n", False),
+    ])
+    def test_prompt_min_length_after_strip(self, prompt, short):
+        """Minimum length is measured on the stripped prompt."""
+        engine = PolicyEngine(Policy(min_prompt_length=3))
+        violations = engine._check_prompt(prompt, engine.policy)
+        assert bool(violations) is short
+
+
+class TestCachedProvider:
+    """Tests for the semantic response cache."""
+
+    def _provider(self, vectors):
+        stub = StubProvider()
+        def embed(texts):
+            stub.calls.append((texts, None))
+            return EmbeddingResponse(
+                success=True, embeddings=[vectors[t] for t in texts],
+                model="text-embedding-004", provider="stub", dimensions=2,
+            )
+        stub.generate_embedding = embed
+        return stub, CachedProvider(stub, similarity_threshold=0.9)
+
+    def test_exact_and_similar_prompts_hit(self):
+        """Repeats and near-duplicates are served from the cache."""
+        stub, cached = self._provider({"hi": [1.0, 0.0], "hey": [0.99, 0.05], "bye": [0.0, 1.0]})
+        config = ProviderConfig(temperature=0.0)
+        first = cached.generate("hi", config)
+        assert "cache_hit" not in first.metadata
+
+        again = cached.generate("hi", config)
+        similar = cached.generate("hey", config)
+        assert again.metadata["cache_hit"] and similar.content == "echo: hi"
+        assert similar.tokens_total == 0
+        assert cached.generate("bye", config).content == "echo: bye"
+        assert cached.get_stats()["hits"] == 2
+
+    def test_high_temperature_bypasses_cache(self):
+        """Requests failing admission go straight to the provider."""
+        stub, cached = self._provider({"hi": [1.0, 0.0]})
+        config = ProviderConfig(temperature=0.9)
+        cached.generate("hi", config)
+        cached.generate("hi", config)
+        assert [c[0] for c in stub.calls] == ["hi", "hi"]
+
+    def test_lru_eviction(self):
+        """The least recently used entry is dropped past max_entries."""
+        stub, cached = self._provider({"a": [1.0, 0.0], "b": [0.0, 1.0]})
+        cached._max_entries = 1
+        config = ProviderConfig(temperature=0.0)
+        cached.generate("a", config)
+        cached.generate("b", config)
+        assert cached.get_stats()["entries"] == 1
+        assert "cache_hit" not in cached.generate("a", config).metadata
+
+
+class TestGeminiProvider:
+    """Tests for Gemini provider helpers (no client or network needed)."""
+
+    @pytest.mark.parametrize("message,kind", [
+        ("429 Too Many Requests", "rate"),
+        ("RESOURCE_EXHAUSTED: quota", "rate"),
+        ("403 Forbidden", "auth"),
+        ("Request timed out", "timeout"),
+        ("Failed to generate content", "other"),
+        ("auth timeout after 429", "rate"),
+    ])
+    def test_classify_error(self, message, kind):
+        """Errors map to one category, rate limits taking precedence."""
+        assert _classify_error(message) == kind
+
+    def _bare_provider(self, models):
+        """GeminiProvider wired to a fake client instead of google-genai."""
+        provider = GeminiProvider.__new__(GeminiProvider)
+        BaseProvider.__init__(provider, "key", "gemini-2.5-flash")
+        provider._client = type("Client", (), {"models": models})()
+        provider._schema_hints = {}
+        provider._health_checked_at = None
+        provider._safe_prompt_chars = GeminiProvider.INPUT_TOKEN_LIMIT // 4
+        provider._GenerateContentConfig = lambda **kwargs: kwargs
+        provider._model_meta = GeminiProvider.MODELS["gemini-2.5-flash"]
+        return provider
+
+    def test_health_check_probes_once_per_ttl(self):
+        """A real probe runs at most once per TTL window."""
+        class Models:
+            calls = 0
+            def get(self, model):
+                Models.calls += 1
+        provider = self._bare_provider(Models())
+        assert provider.health_check() and provider.health_check()
+        assert Models.calls == 1
+        provider._health_checked_at -= GeminiProvider.HEALTH_CHECK_TTL
+        provider.health_check()
+        assert Models.calls == 2
+
+    def test_models_read_only_and_output_capped(self):
+        """Model metadata is immutable and caps max_output_tokens."""
+        with pytest.raises(TypeError):
+            GeminiProvider.MODELS["gemini-2.5-flash"]["max_tokens"] = 1
+        provider = self._bare_provider(None)
+        config = provider._build_config(ProviderConfig(max_tokens=10**6))
+        assert config["max_output_tokens"] == 65536
+
+    def test_oversize_prompt_rejected_before_request(self):
+        """Prompts counted over the input limit never reach generate_content."""
+        class Models:
+            def count_tokens(self, model, contents):
+                return type("Count", (), {"total_tokens": len(contents)})()
+            def generate_content(self, **kwargs):
+                raise AssertionError("should not be called")
+        provider = self._bare_provider(Models())
+        provider._safe_prompt_chars = 10
+        response = provider.generate("x" * 20, ProviderConfig())
+        assert response.error_code == "PROVIDER_ERROR"  # 20 tokens fit, so it was sent
+        provider.INPUT_TOKEN_LIMIT = 15
+        response = provider.generate("x" * 20, ProviderConfig())
+        assert response.error_code == "INPUT_TOO_LARGE"
+
+    def test_circuit_breaker_fails_fast_after_auth_error(self):
+        """An UNAVAILABLE provider fails fast until the reset window passes."""
+        class Models:
+            calls = 0
+            def generate_content(self, **kwargs):
+                Models.calls += 1
+                raise RuntimeError("401 Unauthorized")
+        provider = self._bare_provider(Models())
+        assert provider.generate("hi", ProviderConfig()).error_code == "AUTH_ERROR"
+        assert provider.generate("hi", ProviderConfig()).error_code == "CIRCUIT_OPEN"
+        assert Models.calls == 1
+        provider._unavailable_since -= GeminiProvider.CIRCUIT_RESET_SECONDS
+        assert provider.generate("hi", ProviderConfig()).error_code == "AUTH_ERROR"
+        assert provider.generate("hi", ProviderConfig()).error_code == "CIRCUIT_OPEN"
+        assert Models.calls == 2
+
+    def test_schema_hint_cached_per_schema_object(self):
+        """The schema hint is rendered once and reused for the same dict."""
+        provider = GeminiProvider.__new__(GeminiProvider)
+        provider._schema_hints = {}
+        schema = {"type": "object"}
+        hint = provider._schema_hint(schema)
+        assert '"type": "object"' in hint
+        assert provider._schema_hint(schema) is hint
+        assert provider._schema_hint({"type": "array"}) != hint
+
+    @pytest.mark.parametrize("content", [
+        '{"a": 1}',
+        '```json\n{"a": 1}\n```',
+        '```\n{"a": 1}\n```',
+        '```json{"a": 1}```',
+        '```json\n{"a": 1}',
+    ])
+    def test_parse_structured_strips_fences(self, content):
+        """JSON is recovered with or without a markdown fence."""
+        provider = GeminiProvider.__new__(GeminiProvider)
+        response = ProviderResponse(success=True, content=content, model="m", provider="gemini")
+        parsed = provider._parse_structured(response)
+        assert parsed.success and parsed.metadata["parsed_json"] == {"a": 1}
+
+
+class _FakeClock:
+    """Stand-in for the time module with a settable clock."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+class TestRateLimiter:
+    """Sliding window counters."""
+
+    def test_sub_windows_expire(self, monkeypatch):
+        clock = _FakeClock()
+        monkeypatch.setattr(rl_module, "time", clock)
+        counter = SlidingWindowCounter(60, 3)
+        assert [counter.increment() for _ in range(4)] == [True, True, True, False]
+        clock.now += 30
+        assert counter.increment() is False
+        assert counter.get_count() == 3
+        clock.now += 31
+        assert counter.get_count() == 0
+        assert counter.increment(3) is True
+        assert counter.get_remaining() == 0
+
+    def test_snapshot_matches_individual_reads(self):
+        counter = SlidingWindowCounter(60, 10)
+        counter.increment(4, now=1003.0)
+        for now in (1003.0, 1030.0, 1062.9, 1063.0):
+            assert counter.snapshot(now) == (
+                counter.get_count(now),
+                counter.get_remaining(now),
+                counter.get_reset_time(now),
+            )
+
+    def test_windows_follow_monotonic_clock(self, monkeypatch):
+        """Windows use the monotonic clock; reset_time stays wall-clock."""
+        clock = _FakeClock()
+        monkeypatch.setattr(rl_module, "time", clock)
+        limiter = RateLimiter(RateLimitConfig(requests_per_minute=1))
+        limiter.record_request("A", "T1")
+        clock.time = lambda: 5_000_000.0
+        result = limiter.check_limit("A", "T1")
+        assert result.allowed is False
+        assert 0 < result.wait_seconds <= 60
+        assert result.reset_time == 5_000_000.0 + result.wait_seconds
+
+    def test_try_acquire_grants_exactly_the_limit(self):
+        limiter = RateLimiter(RateLimitConfig(requests_per_minute=5))
+        barrier = threading.Barrier(8)
+        results = []
+
+        def acquire():
+            barrier.wait()
+            results.append(limiter.try_acquire("A", "T1").allowed)
+
+        threads = [threading.Thread(target=acquire) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 5
+        assert limiter.get_task_stats("T1")["requests"]["used"] == 5
+
+    def test_try_acquire_counts_request_not_tokens(self):
+        limiter = RateLimiter()
+        result = limiter.try_acquire("A", "T1", estimated_tokens=8192)
+        assert result.allowed is True
+        assert result.remaining_requests == 59
+        assert limiter.get_task_stats("T1")["tokens"]["used"] == 0
+        limiter.record_tokens("A", "T1", 120)
+        stats = limiter.get_agent_stats("A")
+        assert stats["requests_per_minute"]["used"] == 1
+        assert stats["tokens_per_minute"]["used"] == 120
+
+    def test_allowed_without_stats_is_shared(self):
+        limiter = RateLimiter()
+        first = limiter.try_acquire("A", "T1", need_stats=False)
+        second = limiter.check_limit("A", "T1", need_stats=False)
+        assert first.allowed is True and first is second
+        assert limiter.check_limit("A", "T1").remaining_requests == 59
+
+    def test_active_tasks_tracked_incrementally(self):
+        limiter = RateLimiter()
+        limiter.record_request("A", "T1")
+        limiter.record_request("A", "T1")
+        limiter.try_acquire("B", "T2")
+        limiter.check_limit("A", "T3")
+        assert limiter.get_system_stats()["active_tasks"] == 2
+        limiter.reset_task("T1")
+        assert limiter.get_system_stats()["active_tasks"] == 1
+
+    def test_racing_first_requests_share_counters(self):
+        limiter = RateLimiter()
+        barrier = threading.Barrier(8)
+        seen = []
+
+        def first_request():
+            barrier.wait()
+            seen.append(limiter._get_agent_counters("A"))
+
+        threads = [threading.Thread(target=first_request) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(c) for c in seen}) == 1
+
+    def test_agent_counters_bounded_lru(self):
+        limiter = RateLimiter(RateLimitConfig(max_tracked_agents=2))
+        limiter.record_request("A", "T1")
+        limiter.record_request("B", "T1")
+        limiter.record_request("A", "T1")
+        limiter.record_request("C", "T1")
+        assert list(limiter._agents) == ["A", "C"]
+        assert limiter.get_agent_stats("A")["requests_per_minute"]["used"] == 2
+
+
+class TestSingleFlight:
+    """Tests for in-flight coalescing of identical requests."""
+
+    def _block_provider(self, gateway):
+        entered, release = threading.Event(), threading.Event()
+        generate = gateway._provider.generate
+
+        def slow_generate(prompt, config):
+            entered.set()
+            release.wait(5)
+            return generate(prompt, config)
+
+        gateway._provider.generate = slow_generate
+        return entered, release
+
+    def test_identical_deterministic_requests_coalesce(self, gateway):
+        """A concurrent duplicate at temperature 0 waits for the first call."""
+        entered, release = self._block_provider(gateway)
+        results = {}
+        leader = threading.Thread(
+            target=lambda: results.setdefault(
+                "leader", gateway.request("Test", "T1", "plan", {"temperature": 0})
+            )
+        )
+        leader.start()
+        assert entered.wait(5)
+        threading.Timer(0.2, release.set).start()
+        follower = gateway.request("Test", "T2", "plan", {"temperature": 0})
+        leader.join(5)
+
+        assert len(gateway._provider.calls) == 1
+        assert follower.content == results["leader"].content
+        assert follower.metadata["coalesced"] is True
+        assert follower.tokens_total == 0
+        assert gateway.get_budget_status()["budget_tokens"]["used"] == 30
+        assert gateway._inflight == {}
+
+    def test_sampled_requests_not_coalesced(self, gateway):
+        """Requests with temperature > 0 always reach the provider."""
+        assert gateway._fingerprint("p", ProviderConfig(temperature=0.7), None, False) is None
+        gateway.request("Test", "T1", "plan", {"temperature": 0.7})
+        gateway.request("Test", "T2", "plan", {"temperature": 0.7})
+        assert len(gateway._provider.calls) == 2
+
+class TestGatewayLogger:
+    """Tests for the in-memory log buffers."""
+
+    def _log(self, logger, n, success=True):
+        logger.log_request_complete(
+            request_id=f"r{n}", agent="Test", task_id="T1", session_id="S",
+            provider="stub", model="m", tokens_input=1, tokens_output=1,
+            latency_ms=1.0, success=success, error=None if success else "boom"
+        )
+
+    def test_recent_logs_bounded_and_ordered(self):
+        """Recent logs keep the newest entries, oldest first."""
+        logger = GatewayLogger(log_to_console=False, max_recent_logs=3)
+        for n in range(5):
+            self._log(logger, n)
+        assert [log["request_id"] for log in logger.get_recent_logs()] == ["r2", "r3", "r4"]
+        assert [log["request_id"] for log in logger.get_recent_logs(limit=2)] == ["r3", "r4"]
+
+    def test_stats_cover_recent_window(self):
+        """Stats reflect only the entries still in the recent buffer."""
+        logger = GatewayLogger(log_to_console=False, max_recent_logs=4)
+        assert logger.get_stats() == {"total_logs": 0, "success_rate": 0.0}
+        for n in range(6):
+            self._log(logger, n, success=n % 3 != 0)
+        stats = logger.get_stats()
+        assert stats["total_logs"] == 4
+        assert stats["failed"] == 1
+        assert stats["average_latency_ms"] == 1.0
+
+    def test_structured_log_file_jsonl(self, tmp_path):
+        """Completed requests are appended to the structured sink as JSON lines."""
+        path = tmp_path / "requests.jsonl"
+        logger = GatewayLogger(log_to_console=False, structured_log_file=str(path))
+        self._log(logger, 0)
+        self._log(logger, 1, success=False)
+        logger.flush()
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["request_id"] for r in records] == ["r0", "r1"]
+        assert records[1]["error"] == "boom"
+        logger.close()
+
+    def test_agent_logs_newest_matches(self):
+        """Agent logs return the latest matches for that agent, oldest first."""
+        logger = GatewayLogger(log_to_console=False)
+        for n in range(6):
+            self._log(logger, n)
+            logger.log_request_complete(
+                request_id=f"o{n}", agent="Other", task_id="T1", session_id="S",
+                provider="stub", model="m", tokens_input=1, tokens_output=1,
+                latency_ms=1.0, success=True
+            )
+        logs = logger.get_agent_logs("Test", limit=2)
+        assert [log["request_id"] for log in logs] == ["r4", "r5"]
+
+    def test_error_logs_survive_successes(self):
+        """Failures stay queryable after successes evict them from recent logs."""
+        logger = GatewayLogger(log_to_console=False, max_recent_logs=2)
+        self._log(logger, 0, success=False)
+        for n in range(1, 4):
+            self._log(logger, n)
+        assert [log["request_id"] for log in logger.get_error_logs()] == ["r0"]
+
+    def test_records_drained_in_order(self, tmp_path):
+        """Queued records reach the handlers in order; close() drains the queue."""
+        log_file = tmp_path / "gateway.log"
+        logger = GatewayLogger(log_to_console=False, log_file=str(log_file))
+        logger.log_rate_limit("Test", "T1", "too fast", 1.0)
+        self._log(logger, 0, success=False)
+        logger.close()
+        assert not logger._writer.is_alive()
+        logger.logger.handlers[0].flush()
+        lines = log_file.read_text().splitlines()
+        assert "RATE_LIMIT" in lines[0] and "REQUEST_FAILED" in lines[1]
+        logger.log_rate_limit("Test", "T1", "after close", 1.0)
+        logger.logger.handlers[0].flush()
+        assert "after close" in log_file.read_text()
+        logger.logger.handlers[0].close()
+
+    def test_unused_logger_releases_writer_thread(self, tmp_path):
+        """A dropped logger drains its queue and its writer thread exits."""
+        import gc
+        import weakref
+        sink = tmp_path / "requests.jsonl"
+        logger = GatewayLogger(log_to_console=False, structured_log_file=str(sink))
+        self._log(logger, 0)
+        writer = logger._writer
+        ref = weakref.ref(logger)
+        del logger
+        gc.collect()
+        assert ref() is None
+        writer.join(timeout=5)
+        assert not writer.is_alive()
+        assert json.loads(sink.read_text())["request_id"] == "r0"
+
+    def test_file_handler_after_close_drops_lines(self, tmp_path):
+        """A closed file handler neither queues nor blocks on new records."""
+        log_file = tmp_path / "gateway.log"
+        logger = GatewayLogger(log_to_console=False, log_file=str(log_file))
+        handler = logger.logger.handlers[0]
+        logger.log_rate_limit("Test", "T1", "before close", 1.0)
+        logger.flush()
+        handler.close()
+        for _ in range(200):
+            logger.log_rate_limit("Test", "T1", "after close", 1.0)
+        logger.close()
+        text = log_file.read_text()
+        assert "before close" in text and "after close" not in text
+
+    def test_request_ids_unique_and_stamped(self):
+        """Request IDs share the per-second stamp but stay unique."""
+        logger = GatewayLogger(log_to_console=False)
+        ids = [logger._generate_request_id() for _ in range(3)]
+        assert len(set(ids)) == 3
+        assert all(i.startswith("req_") and len(i.split("_")[1]) == 14 for i in ids)
+        assert datetime.fromisoformat(logger._now_iso())
+
+    def test_request_log_dict_cached(self):
+        """RequestLog is immutable and builds its dict form once."""
+        logger = GatewayLogger(log_to_console=False)
+        self._log(logger, 0)
+        entry = logger._recent_logs[-1]
+        assert entry.to_dict() is entry.to_dict()
+        with pytest.raises(AttributeError):
+            entry.success = False
+
+    def test_request_log_json_roundtrip(self):
+        """RequestLog.to_json emits the same data as to_dict."""
+        logger = GatewayLogger(log_to_console=False)
+        self._log(logger, 0)
+        entry = logger._recent_logs[-1]
+        assert json.loads(entry.to_json()) == entry.to_dict()
+
+    def test_file_log_written_in_background(self, tmp_path):
+        """File logging goes through the batched writer and survives flush/close."""
+        log_file = tmp_path / "gateway.log"
+        logger = GatewayLogger(log_to_console=False, log_file=str(log_file))
+        for n in range(50):
+            self._log(logger, n)
+        logger.flush()
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 50
+        assert "id=r49" in lines[-1]
+        logger.close()
+        logger.logger.handlers[0].close()
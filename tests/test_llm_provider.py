@@ -0,0 +1,108 @@
+"""
+Tests for core.llm_provider module.
+
+Covers:
+    - Response cache for complete() and structured()
+    - PromptBuilder prompt layout
+"""
+
+import shutil
+import tempfile
+
+import pytest
+
+from core import llm_provider
+from core.llm_provider import LLMResponse, PromptBuilder
+from core.memory import Memory
+
+
+class _FakeLLM:
+    """Stands in for LLMProvider, counting calls."""
+
+    def __init__(self):
+        self.model = "fake-model"
+        self.calls = 0
+
+    def complete(self, prompt, system=None):
+        self.calls += 1
+        return LLMResponse(
+            content=f"{system}:{prompt}", model=self.model,
+            tokens_used=0, finish_reason="stop", raw_response=None
+        )
+
+    def structured_output(self, prompt, schema=None):
+        self.calls += 1
+        return {"prompt": prompt, "items": [1, 2]}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Default provider replaced by a fake, cache backed by temp storage."""
+    d = tempfile.mkdtemp(prefix="arcyn_test_llm_cache_")
+    llm = _FakeLLM()
+    store = Memory(storage_path=d, enable_db=True)
+    monkeypatch.setattr(llm_provider, "get_llm", lambda api_key=None: llm)
+    monkeypatch.setattr(llm_provider, "_cache_memory", store)
+    monkeypatch.setattr(llm_provider, "_response_cache", type(llm_provider._response_cache)())
+    yield llm
+    store.close()
+    shutil.rmtree(d, ignore_errors=True)
+
+
+class TestResponseCache:
+    """Tests for the ARCYN_LLM_CACHE response cache."""
+
+    def test_disabled_by_default(self, fake_llm, monkeypatch):
+        monkeypatch.delenv("ARCYN_LLM_CACHE", raising=False)
+        llm_provider.complete("hi")
+        llm_provider.complete("hi")
+        assert fake_llm.calls == 2
+
+    def test_complete_repeat_served_from_cache(self, fake_llm, monkeypatch):
+        monkeypatch.setenv("ARCYN_LLM_CACHE", "1")
+        assert llm_provider.complete("hi", "sys") == "sys:hi"
+        assert llm_provider.complete("hi", "sys") == "sys:hi"
+        assert fake_llm.calls == 1
+        llm_provider.complete("hi", "other")
+        assert fake_llm.calls == 2
+
+    def test_persisted_entry_survives_process_cache(self, fake_llm, monkeypatch):
+        monkeypatch.setenv("ARCYN_LLM_CACHE", "1")
+        llm_provider.complete("hi")
+        llm_provider._response_cache.clear()
+        assert llm_provider.complete("hi") == "None:hi"
+        assert fake_llm.calls == 1
+
+    def test_expired_entry_refetched(self, fake_llm, monkeypatch):
+        monkeypatch.setenv("ARCYN_LLM_CACHE", "1")
+        llm_provider.complete("hi")
+        monkeypatch.setattr(llm_provider, "_CACHE_TTL_SECONDS", 0)
+        llm_provider.complete("hi")
+        assert fake_llm.calls == 2
+
+    def test_structured_returns_fresh_copies(self, fake_llm, monkeypatch):
+        monkeypatch.setenv("ARCYN_LLM_CACHE", "1")
+        first = llm_provider.structured("list", {"type": "object"})
+        first["items"].append(3)
+        second = llm_provider.structured("list", {"type": "object"})
+        assert second == {"prompt": "list", "items": [1, 2]}
+        assert fake_llm.calls == 1
+
+
+class TestPromptBuilder:
+    """Tests for PromptBuilder prompt layout."""
+
+    def test_prompts_start_with_static_prefix(self):
+        prompts = {
+            "architect_plan": PromptBuilder.architect_plan("Ship it", {"stack": "py"}),
+            "builder_code": PromptBuilder.builder_code({"name": "N", "description": "D"}),
+            "persona_classify": PromptBuilder.persona_classify("build a login"),
+            "evolution_analyze": PromptBuilder.evolution_analyze({"cpu": 0.9}),
+        }
+        for name, prompt in prompts.items():
+            assert prompt.startswith(PromptBuilder.CACHE_PREFIXES[name])
+
+    def test_input_follows_schema(self):
+        prompt = PromptBuilder.architect_plan("Ship it", {"stack": "py"})
+        assert prompt.index('"open_questions"') < prompt.index("Goal: Ship it")
+        assert prompt.endswith('Context:\n{\n  "stack": "py"\n}')
@@ -16,6 +16,7 @@ import json
 import shutil
 import tempfile
 import pytest
+from pathlib import Path
 
 from core.memory import Memory
 
@@ -62,6 +63,12 @@ class TestMemoryWrite:
                            tags=["important", "test"],
                            metadata={"source": "unit_test"}) is True
 
+    def test_write_non_json_values(self, memory):
+        """Non-string keys and unknown types are written, not rejected."""
+        assert memory.write("odd", {1: "one", "path": Path("a/b"), "text": "café"}) is True
+        memory._cache.clear()
+        assert memory.read("odd") == {"1": "one", "path": "a/b", "text": "café"}
+
     def test_write_overwrite(self, memory):
         """Writing to same key should overwrite."""
         memory.write("key1", {"v": 1})
@@ -102,6 +109,28 @@ class TestMemoryRead:
         assert result == {"disk": True}
 
 
+    def test_cache_evicts_least_recently_used(self, temp_dir):
+        """The read cache is bounded and evicts the least recently used."""
+        mem = Memory(storage_path=temp_dir, enable_db=False, cache_max_entries=2)
+        mem.write("a", {"v": 1})
+        mem.write("b", {"v": 2})
+        mem.read("a")
+        mem.write("c", {"v": 3})
+        assert list(mem._cache) == ["a", "c"]
+        assert mem.read("b") == {"v": 2}
+        stats = mem.get_cache_stats()
+        assert stats["entries"] == 2
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    def test_cache_bounded_by_bytes(self, temp_dir):
+        """Entries are evicted once their serialized size exceeds the cap."""
+        mem = Memory(storage_path=temp_dir, enable_db=False, cache_max_bytes=100)
+        mem.write("big_1", {"blob": "x" * 60})
+        mem.write("big_2", {"blob": "y" * 60})
+        assert list(mem._cache) == ["big_2"]
+        assert mem.get_cache_stats()["bytes"] <= 100
+        assert mem.read("big_1") == {"blob": "x" * 60}
+
 class TestMemoryDelete:
     """Tests for memory delete operations."""
 
@@ -154,6 +183,15 @@ class TestMemorySearch:
         assert len(results) == 1
         assert results[0]['key'] == "a_1"
 
+    def test_search_index_follows_deletes(self, memory):
+        """Substring search via the key index should drop deleted entries."""
+        memory.write("report_2024_q1", {"v": 1})
+        memory.write("report_2024_q2", {"v": 2})
+        memory.delete("report_2024_q1")
+
+        results = memory.search("2024_Q")
+        assert [r['key'] for r in results] == ["report_2024_q2"]
+
     def test_search_empty(self, memory):
         """Search with no matches should return empty list."""
         results = memory.search("zzzzz_no_match")
@@ -185,6 +223,50 @@ class TestMemoryStats:
         assert "k1" in keys
         assert "k2" in keys
 
+    def test_keys_loaded_at_startup(self, temp_dir):
+        """Files already on disk are listed, counted and searchable."""
+        Path(temp_dir, "old_entry.json").write_text('{"v": 1}')
+        mem = Memory(storage_path=temp_dir, enable_db=False)
+        mem.write("new_entry", {"v": 2})
+        assert sorted(mem.list_keys()) == ["new_entry", "old_entry"]
+        assert mem.get_stats()['file_entries'] == 2
+        assert [r['key'] for r in mem.search("old")] == ["old_entry"]
+
+        mem.delete("old_entry")
+        assert mem.list_keys() == ["new_entry"]
+        assert mem.exists("old_entry") is False
+
+    def test_instances_on_one_directory_see_each_other(self, temp_dir):
+        """Writes and deletes by one instance are visible to another."""
+        first = Memory(storage_path=temp_dir, enable_db=False)
+        second = Memory(storage_path=temp_dir, enable_db=False)
+        first.write("from_first", {"v": 1})
+        assert second.list_keys() == ["from_first"]
+        assert second.get_stats()['file_entries'] == 1
+        assert [r['key'] for r in second.search("first")] == ["from_first"]
+
+        assert second.exists("from_first") is True
+
+        second.delete("from_first")
+        assert second.exists("from_first") is False
+        assert first.list_keys() == []
+
+    def test_db_answers_listing_without_directory_scan(self, temp_dir, monkeypatch):
+        """With the index enabled, list_keys() and get_stats() come from SQLite."""
+        first = Memory(storage_path=temp_dir, enable_db=True)
+        second = Memory(storage_path=temp_dir, enable_db=True)
+        first.write("from_first", {"v": 1}, namespace="ns")
+        first.flush()
+
+        def no_glob(self, pattern):
+            raise AssertionError("directory scanned")
+
+        monkeypatch.setattr(Path, "glob", no_glob)
+        assert second.list_keys() == ["from_first"]
+        assert second.get_stats()['file_entries'] == 1
+        first.close()
+        second.close()
+
 
 class TestMemoryDB:
     """Tests for SQLite database features."""
@@ -207,8 +289,9 @@ class TestMemoryDB:
         memory.read("tracked")
         memory.read("tracked")
         memory.read("tracked")
-        # Access count should be 3
+        # Access count should be 3 once queued updates are flushed
         if memory._db:
+            memory.flush()
             cursor = memory._db.execute(
                 "SELECT access_count FROM memory_entries WHERE key = ?",
                 ("tracked",)
@@ -216,3 +299,101 @@ class TestMemoryDB:
             row = cursor.fetchone()
             assert row is not None
             assert row['access_count'] == 3
+
+    def test_checkpoint_syncs_written_files(self, memory, temp_dir):
+        """Writes leave no temp files; checkpoint syncs each written file once."""
+        memory.write("durable_1", {"v": 1})
+        memory.write("durable_2", {"v": 2})
+        memory.write("durable_1", {"v": 3})
+        assert not list(Path(temp_dir).glob("*.tmp"))
+        assert memory.checkpoint() == 2
+        assert memory.checkpoint() == 0
+        assert json.loads(Path(temp_dir, "durable_1.json").read_text()) == {"v": 3}
+
+    def test_write_many_indexed_together(self, memory):
+        """write_many stores every entry and indexes them in one commit."""
+        assert memory.write_many(
+            [("batch_1", {"n": 1}), ("batch_2", {"n": 2})], namespace="builder"
+        ) is True
+        assert memory.read("batch_2") == {"n": 2}
+        assert sorted(memory.list_keys(namespace="builder")) == ["batch_1", "batch_2"]
+
+    def test_legacy_index_migrated_to_lookup_tables(self, temp_dir):
+        """An index with TEXT namespace columns is converted on open."""
+        import sqlite3
+        conn = sqlite3.connect(os.path.join(temp_dir, "memory_index.db"))
+        conn.execute("""
+            CREATE TABLE memory_entries (
+                key TEXT PRIMARY KEY, namespace TEXT DEFAULT 'default',
+                source_agent TEXT DEFAULT 'unknown', created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL, accessed_at TEXT NOT NULL,
+                access_count INTEGER DEFAULT 0, size_bytes INTEGER DEFAULT 0,
+                data_type TEXT DEFAULT 'json', tags TEXT DEFAULT '[]',
+                ttl_seconds INTEGER DEFAULT NULL, metadata TEXT DEFAULT '{}'
+            )
+        """)
+        conn.execute(
+            "INSERT INTO memory_entries (key, namespace, source_agent, created_at, "
+            "updated_at, accessed_at) VALUES ('old_plan', 'architect', 'A-1', 't', 't', 't')"
+        )
+        conn.commit()
+        conn.close()
+
+        mem = Memory(storage_path=temp_dir, enable_db=True)
+        assert mem.list_keys(namespace="architect") == ["old_plan"]
+        [row] = mem.search("old_")
+        assert (row['namespace'], row['source_agent']) == ("architect", "A-1")
+        mem.close()
+
+    def test_queued_rows_kept_without_close(self, temp_dir):
+        """Rows queued by a process that exits without close() are indexed."""
+        import subprocess
+        import sys
+        script = (
+            "from core.memory import Memory\n"
+            f"mem = Memory(storage_path={temp_dir!r})\n"
+            "for i in range(5):\n"
+            "    mem.write(f'k{i}', {'i': i}, namespace='architect')\n"
+        )
+        root = str(Path(__file__).parent.parent)
+        subprocess.run([sys.executable, "-c", script], cwd=root, check=True)
+
+        mem = Memory(storage_path=temp_dir, enable_db=True)
+        assert sorted(mem.list_keys(namespace="architect")) == [f"k{i}" for i in range(5)]
+        mem.close()
+
+    def test_queued_rows_kept_when_collected(self, temp_dir):
+        """Dropping an unclosed Memory still writes its queued rows."""
+        import gc
+        mem = Memory(storage_path=temp_dir, enable_db=True)
+        mem.write("dropped", {"v": 1}, namespace="builder")
+        del mem
+        gc.collect()
+        reopened = Memory(storage_path=temp_dir, enable_db=True)
+        assert reopened.list_keys(namespace="builder") == ["dropped"]
+        reopened.close()
+
+    def test_failed_flush_rolls_back_and_requeues(self, memory):
+        """A flush that fails midway leaves nothing half-committed."""
+        for key in ("first", "second"):
+            memory._pending.append(
+                memory._index_row(key, 10, "ns", "tester", None, None, None)
+            )
+        memory._pending.append(memory._pending[-1][:3])  # malformed row
+        memory.flush()
+        assert memory._db.execute("SELECT COUNT(*) FROM memory_entries").fetchone()[0] == 0
+        assert len(memory._pending) == 3
+
+        memory._pending.pop()
+        memory.flush()
+        assert sorted(memory.list_keys(namespace="ns")) == ["first", "second"]
+
+    def test_queued_rows_flushed_on_close(self, temp_dir):
+        """Index rows queued by write() survive close() and reopen."""
+        mem = Memory(storage_path=temp_dir, enable_db=True)
+        mem.write("queued", {"v": 1}, namespace="persona")
+        mem.close()
+        reopened = Memory(storage_path=temp_dir, enable_db=True)
+        assert reopened.list_keys(namespace="persona") == ["queued"]
+        assert reopened._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        reopened.close()
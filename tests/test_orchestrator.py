@@ -112,6 +112,120 @@ class TestOrchestratorStages:
         assert 'warnings' in result
         assert '_stage' in result
 
+    def test_build_runs_tasks_concurrently(self, orch):
+        """Independent plan tasks should be built in parallel, results in order."""
+        import threading
+        barrier = threading.Barrier(3, timeout=5)
+        used = set()
+
+        class Builder:
+            def __init__(self, agent_id="builder_agent"):
+                self.agent_id = agent_id
+
+            def build(self, task_input):
+                used.add(self.agent_id)
+                barrier.wait()  # only returns once all three tasks are in flight
+                if task_input["description"] == "bad":
+                    raise RuntimeError("boom")
+                return {"files_changed": [task_input["description"]], "warnings": []}
+
+        orch._builder_factory = Builder
+        orch._agents['builder'] = Builder()
+        plan = {"tasks": [
+            {"id": "T1", "name": "a.py", "dependencies": []},
+            {"id": "T2", "name": "bad", "dependencies": []},
+            {"id": "T3", "name": "c.py", "dependencies": []},
+        ]}
+        result = orch.build(plan)
+        assert [r["task_id"] for r in result["task_results"]] == ["T1", "T2", "T3"]
+        assert result["files_changed"] == ["a.py", "c.py"]
+        assert result["warnings"] == ["Task T2 failed: boom"]
+        # Each worker has its own builder
+        assert len(used) == 3
+
+    def test_build_same_target_path_runs_in_order(self, orch):
+        """Tasks writing the same file must not run at the same time."""
+        import threading
+        import time
+        lock = threading.Lock()
+        active, calls = {}, []
+
+        class Builder:
+            def __init__(self, agent_id="builder_agent"):
+                self.agent_id = agent_id
+
+            def build(self, task_input):
+                path = task_input["target_path"]
+                with lock:
+                    assert not active.get(path)
+                    active[path] = True
+                    calls.append(task_input["description"])
+                time.sleep(0.05)
+                with lock:
+                    active[path] = False
+                return {"files_changed": [path], "warnings": []}
+
+        orch._builder_factory = Builder
+        orch._agents['builder'] = Builder()
+        plan = {"tasks": [
+            {"id": "T1", "name": "first", "target_path": "a.py", "dependencies": []},
+            {"id": "T2", "name": "other", "target_path": "b.py", "dependencies": []},
+            {"id": "T3", "name": "second", "target_path": "a.py", "dependencies": []},
+        ]}
+        result = orch.build(plan)
+        assert [r["status"] for r in result["task_results"]] == ["completed"] * 3
+        assert calls.index("first") < calls.index("second")
+
+    @pytest.mark.parametrize("graph", ["execution_order", "dependencies"])
+    def test_build_waits_for_earlier_levels(self, orch, graph):
+        """A later milestone's tasks start only after the earlier one finishes."""
+        import threading
+        barrier = threading.Barrier(2, timeout=5)
+        lock = threading.Lock()
+        events = []
+
+        class Builder:
+            def __init__(self, agent_id="builder_agent"):
+                self.agent_id = agent_id
+
+            def build(self, task_input):
+                name = task_input["description"]
+                with lock:
+                    events.append(("start", name))
+                if name != "c.py":
+                    barrier.wait()  # both first-level tasks run together
+                with lock:
+                    events.append(("end", name))
+                return {"files_changed": [name], "warnings": []}
+
+        orch._builder_factory = Builder
+        orch._agents['builder'] = Builder()
+        tasks = [
+            {"id": "T3", "name": "c.py", "milestone_id": "M2"},
+            {"id": "T1", "name": "a.py", "milestone_id": "M1"},
+            {"id": "T2", "name": "b.py", "milestone_id": "M1"},
+        ]
+        if graph == "execution_order":
+            plan = {"tasks": tasks, "task_graph": {"execution_order": [["T1", "T2"], ["T3"]]}}
+        else:
+            tasks[0]["dependencies"] = ["T1", "T2"]
+            plan = {"tasks": tasks}
+        result = orch.build(plan)
+
+        assert [r["task_id"] for r in result["task_results"]] == ["T3", "T1", "T2"]
+        assert [r["status"] for r in result["task_results"]] == ["completed"] * 3
+        assert events.index(("start", "c.py")) > events.index(("end", "a.py"))
+        assert events.index(("start", "c.py")) > events.index(("end", "b.py"))
+
+    def test_build_without_graph_runs_in_plan_order(self, orch):
+        """Tasks with no dependency information are built one at a time."""
+        calls = []
+        builder = MagicMock()
+        builder.build.side_effect = lambda t: calls.append(t["description"]) or {}
+        orch._agents['builder'] = builder
+        orch.build({"tasks": [{"id": "T1", "name": "a"}, {"id": "T2", "name": "b"}]})
+        assert calls == ["a", "b"]
+
     def test_validate_fallback(self, orch):
         """Validate should pass without System Designer."""
         result = orch.validate({}, {})
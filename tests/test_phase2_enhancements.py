@@ -197,6 +197,44 @@ class TestKnowledgeEngineSemanticSearch:
         assert not result["query_embedded"]
 
 
+class TestPackedEmbedding:
+    """Test quantized storage for the in-memory vector index."""
+
+    @pytest.mark.parametrize("precision", ["fp32", "fp16", "int8"])
+    def test_roundtrip_preserves_similarity(self, precision):
+        """Packed vectors should stay within ~1% cosine of the original."""
+        from agents.knowledge_engine.embedder import Embedder, PackedEmbedding
+        vector = [((i * 37) % 101 - 50) / 50.0 for i in range(768)]
+        packed = PackedEmbedding.pack(vector, precision)
+
+        assert packed.dimension == 768
+        assert Embedder().similarity(vector, packed.unpack()) > 0.99
+
+    def test_ingest_stores_packed_vector(self):
+        """The engine should keep ingested embeddings packed."""
+        from agents.knowledge_engine.embedder import PackedEmbedding
+        from agents.knowledge_engine.knowledge_engine import KnowledgeEngine
+        engine = KnowledgeEngine(agent_id="test_packed", log_level=50, embedding_precision="fp16")
+        engine.embedder.embed = MagicMock(return_value=[0.1, 0.2, 0.3])
+
+        result = engine.ingest_with_embedding({
+            "namespace": "test",
+            "key": "packed_1",
+            "content": "content",
+            "source_agent": "tester"
+        })
+
+        stored = engine._embedding_index[result["record_id"]]
+        assert isinstance(stored, PackedEmbedding)
+        assert stored.precision == "fp16"
+
+    def test_unknown_precision_rejected(self):
+        """An unsupported precision should fail at construction, not on ingest."""
+        from agents.knowledge_engine.knowledge_engine import KnowledgeEngine
+        with pytest.raises(ValueError, match="fp8"):
+            KnowledgeEngine(agent_id="test_packed", log_level=50, embedding_precision="fp8")
+
+
 class TestKnowledgeEngineCrossProjectLearn:
     """Test cross_project_learn pattern extraction."""
 